@@ -0,0 +1,174 @@
+"""
+Caseload trend analytics
+
+Loads every active objective's per-day independence percentages from
+objective_daily_rollup in one query, then computes with NumPy, for all
+objectives at once:
+
+    rolling_mean      mean of the last ROLLING_POINTS data days
+    slope_per_week    least-squares slope over the last FIT_POINTS data days,
+                      in percentage points per week
+    projected_mastery date the fitted line reaches target_percentage
+
+Every step works on whole arrays grouped by objective (np.bincount over a
+group index), so the cost is a handful of array passes regardless of how
+many objectives there are.
+
+Usage:
+    GET /api/analytics/trends[?student_id=3][&status=plateaued]
+"""
+
+from datetime import date
+
+import numpy as np
+
+# Data days used for the trend line and for the rolling mean
+FIT_POINTS = 10
+ROLLING_POINTS = 3
+# A trend needs at least this many data days
+MIN_POINTS = 3
+# |slope| below this (points per week) counts as a plateau
+PLATEAU_SLOPE = 0.5
+# Projections further out than this are reported as a plateau
+MAX_PROJECTION_DAYS = 730
+
+STATUSES = ('insufficient_data', 'mastered', 'improving', 'plateaued', 'declining')
+
+# julianday() of 0001-01-01 minus one, so ordinal = julian - offset
+_JULIAN_ORDINAL_OFFSET = 1721424.5
+
+
+def _scope(student_id):
+    where = 'o.active = 1 AND g.active = 1 AND st.active = 1'
+    if student_id:
+        return where + ' AND g.student_id = ?', (student_id,)
+    return where, ()
+
+
+def load_points(db, student_id=None):
+    """(objective_ids, julian days, percentages) arrays, sorted by objective then day."""
+    where, params = _scope(student_id)
+    cursor = db.execute(f'''
+        SELECT r.objective_id, julianday(r.session_date), r.independent,
+               r.independent + r.minimal_support + r.moderate_support +
+               r.maximal_support + r.incorrect
+        FROM goals g
+        JOIN students st ON g.student_id = st.id
+        JOIN objectives o ON o.goal_id = g.id
+        JOIN objective_daily_rollup r ON r.objective_id = o.id
+        WHERE {where}
+        ORDER BY r.objective_id, r.session_date
+    ''', params)
+    cursor.row_factory = None
+    data = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 4)
+    data = data[data[:, 3] > 0]  # days whose trials were all zero-count
+    return data[:, 0].astype(np.int64), data[:, 1], 100.0 * data[:, 2] / data[:, 3]
+
+
+def load_objectives(db, student_id=None):
+    """Metadata rows for the objectives in scope, keyed by id."""
+    where, params = _scope(student_id)
+    cursor = db.execute(f'''
+        SELECT o.id, o.description, o.target_percentage, o.goal_id, g.student_id,
+               st.first_name || ' ' || st.last_name AS student_name
+        FROM goals g
+        JOIN students st ON g.student_id = st.id
+        JOIN objectives o ON o.goal_id = g.id
+        WHERE {where}
+    ''', params)
+    return {row['id']: row for row in cursor}
+
+
+def compute_trends(objective_ids, days, percents, targets):
+    """Vectorised per-objective trend statistics.
+
+    objective_ids, days and percents are parallel arrays sorted by
+    objective then day; targets is an array of target percentages aligned
+    with the returned ids. Returns a dict of arrays, one entry per
+    objective that has data.
+    """
+    ids, starts, counts = np.unique(objective_ids, return_index=True, return_counts=True)
+    groups = len(ids)
+    group = np.repeat(np.arange(groups), counts)
+    # 1 for an objective's latest day, 2 for the one before, ...
+    from_end = counts[group] - (np.arange(len(objective_ids)) - starts[group])
+
+    fit = from_end <= FIT_POINTS
+    g, x, y = group[fit], days[fit], percents[fit]
+    n = np.bincount(g, minlength=groups)
+    mean_x = np.bincount(g, x, groups) / n
+    mean_y = np.bincount(g, y, groups) / n
+    # Centre on the group means before squaring; julian days are ~2.4M
+    dx, dy = x - mean_x[g], y - mean_y[g]
+    sxx = np.bincount(g, dx * dx, groups)
+    sxy = np.bincount(g, dx * dy, groups)
+    slope = np.divide(sxy, sxx, out=np.zeros(groups), where=sxx > 0)  # points per day
+
+    recent = from_end <= ROLLING_POINTS
+    rolling_mean = (np.bincount(group[recent], percents[recent], groups) /
+                    np.bincount(group[recent], minlength=groups))
+
+    last_day = days[starts + counts - 1]
+    fitted_now = mean_y + slope * (last_day - mean_x)
+    rising = slope > 0
+    days_to_target = np.divide(targets - fitted_now, slope,
+                               out=np.full(groups, np.inf), where=rising)
+    projected = last_day + np.maximum(days_to_target, 0)
+
+    weekly = slope * 7
+    status = np.select(
+        [counts < MIN_POINTS,
+         rolling_mean >= targets,
+         (weekly >= PLATEAU_SLOPE) & (days_to_target <= MAX_PROJECTION_DAYS),
+         weekly <= -PLATEAU_SLOPE],
+        ['insufficient_data', 'mastered', 'improving', 'declining'],
+        default='plateaued')
+
+    return {
+        'ids': ids,
+        'points': counts,
+        'latest': last_day,
+        'rolling_mean': rolling_mean,
+        'slope_per_week': weekly,
+        'projected': np.where(status == 'improving', projected, np.nan),
+        'status': status,
+    }
+
+
+def _julian_to_iso(julian):
+    return date.fromordinal(int(round(julian - _JULIAN_ORDINAL_OFFSET))).isoformat()
+
+
+def caseload_trends(db, student_id=None, status=None):
+    """Trend summary per active objective, optionally for one student or status."""
+    objectives = load_objectives(db, student_id)
+    objective_ids, days, percents = load_points(db, student_id)
+    if not len(objective_ids):
+        return []
+
+    unique_ids = np.unique(objective_ids)
+    targets = np.array([objectives[int(oid)]['target_percentage'] or 0 for oid in unique_ids],
+                       dtype=np.float64)
+    trends = compute_trends(objective_ids, days, percents, targets)
+
+    results = []
+    for i, oid in enumerate(trends['ids'].tolist()):
+        if status and trends['status'][i] != status:
+            continue
+        row = objectives[oid]
+        projected = trends['projected'][i]
+        results.append({
+            'objective_id': oid,
+            'description': row['description'],
+            'goal_id': row['goal_id'],
+            'student_id': row['student_id'],
+            'student_name': row['student_name'],
+            'target_percentage': row['target_percentage'],
+            'data_points': int(trends['points'][i]),
+            'last_session_date': _julian_to_iso(trends['latest'][i]),
+            'rolling_mean': round(float(trends['rolling_mean'][i]), 1),
+            'slope_per_week': round(float(trends['slope_per_week'][i]), 2),
+            'projected_mastery': None if np.isnan(projected) else _julian_to_iso(projected),
+            'status': str(trends['status'][i]),
+        })
+    return results
@@ -1,5 +1,9 @@
 from flask import Flask
-from database import init_db
+from database import init_app, init_db
+import assets
+import cache
+import jobs
+import template_cache
 from routes import (
     dashboard_bp,
     students_bp,
@@ -11,6 +15,26 @@ import os
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'local-dev-key'
+# Connection pool settings, see database.DEFAULT_PRAGMAS
+app.config['DATABASE_POOL_SIZE'] = 5
+app.config['DATABASE_PRAGMAS'] = {}
+
+# Response cache sizing, see cache.py
+app.config['CACHE_MAX_ENTRIES'] = 256
+app.config['CACHE_TTL'] = 300
+
+# Background job workers, see jobs.py
+app.config['JOBS_WORKERS'] = 2
+app.config['JOBS_POLL_INTERVAL'] = 2.0
+
+# Rebuild fingerprinted static bundles when sources change, see assets.py
+app.config['ASSETS_AUTO_BUILD'] = True
+
+init_app(app)
+cache.init_app(app)
+jobs.init_app(app)
+assets.init_app(app)
+template_cache.init_app(app)
 
 with app.app_context():
     init_db()
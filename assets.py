@@ -0,0 +1,167 @@
+"""
+Fingerprinted static assets
+
+Page CSS and JavaScript live in static/css and static/js. The build step
+copies each file to static/dist under a content-hash name, e.g.
+css/base.css -> dist/css/base.3f9c2a1b7e04.css. It also writes .gz
+(and .br, when the brotli package is installed) next to each copy and
+records the names in static/dist/manifest.json.
+
+Templates link assets with asset_url('css/base.css'). /assets/<name>
+serves the built files with Cache-Control: immutable, picking the
+precompressed variant that the browser accepts. A changed file gets a
+new name, so browsers never need to revalidate.
+
+The app builds on startup when a source is newer than the manifest, and
+on every template render in debug mode.
+
+Usage:
+    flask --app app admin build-assets
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional; without it only gzip is precompressed
+    brotli = None
+
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 12
+MAX_AGE = 365 * 24 * 60 * 60  # one year, the longest browsers honour
+
+# Content-Encoding -> file suffix, most preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _sources(static_folder):
+    for directory in SOURCE_DIRS:
+        root = os.path.join(static_folder, directory)
+        if not os.path.isdir(root):
+            continue
+        for name in sorted(os.listdir(root)):
+            if not name.startswith('.'):
+                yield f'{directory}/{name}'
+
+
+def _fingerprint(name, content):
+    stem, extension = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}'
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as output:
+        output.write(content)
+
+
+def build(static_folder):
+    """Write hashed and precompressed copies of every source; returns the manifest."""
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+    for name in _sources(static_folder):
+        with open(os.path.join(static_folder, name), 'rb') as source:
+            content = source.read()
+        built = _fingerprint(name, content)
+        manifest[name] = built
+        path = os.path.join(dist, built)
+        if os.path.exists(path):
+            continue  # same content, already built
+        _write(path, content)
+        # mtime=0 keeps the .gz byte-identical across builds
+        _write(path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(content))
+
+    # Drop builds of older versions
+    keep = set(manifest.values())
+    for directory in SOURCE_DIRS:
+        root = os.path.join(dist, directory)
+        if not os.path.isdir(root):
+            continue
+        for filename in os.listdir(root):
+            name = f'{directory}/{filename}'
+            for _, suffix in ENCODINGS:
+                name = name.removesuffix(suffix)
+            if name not in keep:
+                os.remove(os.path.join(root, filename))
+
+    _write(os.path.join(dist, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+def is_stale(static_folder):
+    """True if the manifest is missing or older than any source file."""
+    try:
+        built_at = os.path.getmtime(os.path.join(static_folder, DIST_DIR, MANIFEST))
+    except OSError:
+        return True
+    return any(os.path.getmtime(os.path.join(static_folder, name)) > built_at
+               for name in _sources(static_folder))
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+
+class Assets:
+    def __init__(self):
+        self.manifest = {}
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_AUTO_BUILD', True)
+        self.app = app
+        if app.config['ASSETS_AUTO_BUILD'] and is_stale(app.static_folder):
+            self.manifest = build(app.static_folder)
+        else:
+            self.manifest = load_manifest(app.static_folder)
+        app.add_url_rule('/assets/<path:filename>', 'assets', serve)
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def url(self, name):
+        """URL of the fingerprinted build of a static/css or static/js file."""
+        if self.app.debug and self.app.config['ASSETS_AUTO_BUILD'] and is_stale(self.app.static_folder):
+            self.manifest = build(self.app.static_folder)
+        built = self.manifest.get(name)
+        if built is None:
+            # Not built (e.g. a new file with auto-build off): serve it as is
+            return url_for('static', filename=name)
+        return url_for('assets', filename=built)
+
+
+assets = Assets()
+
+
+def init_app(app):
+    assets.init_app(app)
+
+
+def serve(filename):
+    """A built asset, precompressed if the browser accepts it, cached for good."""
+    dist = os.path.join(current_app.static_folder, DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for name, suffix in ENCODINGS:
+        if name in request.accept_encodings and os.path.isfile(os.path.join(dist, filename + suffix)):
+            encoding = name
+            filename += suffix
+            break
+    response = send_from_directory(dist, filename, mimetype=mimetype, max_age=MAX_AGE)
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
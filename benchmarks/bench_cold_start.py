@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark
+
+Time to first response after a process start, per route, with the Jinja
+bytecode cache empty (cold) and after `admin warm-templates` (warm).
+Every measurement is a fresh interpreter, so nothing but the on-disk
+cache carries over between runs.
+
+Usage:
+    python benchmarks/bench_cold_start.py [runs]
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROUTES = ['/', '/students', '/students/1', '/sessions', '/planner', '/sessions/track',
+          '/sessions/new', '/students/new']
+
+# Runs in a fresh interpreter inside the scratch directory
+CHILD = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from app import app
+imported = time.perf_counter()
+app.logger.disabled = True
+client = app.test_client()
+mode = sys.argv[1]
+if mode == 'seed':
+    client.get('/admin/add-sample-data')
+elif mode == 'warm':
+    import template_cache
+    template_cache.precompile(app)
+else:
+    status = client.get(mode).status_code
+    done = time.perf_counter()
+    print(json.dumps({{'import': imported - start, 'first': done - imported, 'status': status}}))
+'''
+
+
+def child(directory, mode):
+    result = subprocess.run([sys.executable, '-c', CHILD.format(root=ROOT), mode], cwd=directory,
+                            capture_output=True, text=True, check=True)
+    # The timing line is last; the app may print before it
+    lines = result.stdout.strip().splitlines()
+    return json.loads(lines[-1]) if mode.startswith('/') else None
+
+
+def first_response(directory, route, runs, cache_dir, warm):
+    """Best of ``runs`` fresh-process timings for one route."""
+    best = None
+    for _ in range(runs):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        if warm:
+            child(directory, 'warm')
+        timing = child(directory, route)
+        if best is None or timing['first'] < best['first']:
+            best = timing
+    return best
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    directory = tempfile.mkdtemp(prefix='bench-cold-start-')
+    cache_dir = os.path.join(directory, 'data', 'jinja-cache')
+    try:
+        child(directory, 'seed')
+        print(f"Time to first response in a fresh process (best of {runs})")
+        print(f"  {'route':<18} {'cold':>9} {'warm':>9} {'speedup':>8}")
+        cold_total = warm_total = 0
+        for route in ROUTES:
+            cold = first_response(directory, route, runs, cache_dir, warm=False)
+            warm = first_response(directory, route, runs, cache_dir, warm=True)
+            cold_total += cold['first']
+            warm_total += warm['first']
+            print(f"  {route:<18} {cold['first'] * 1000:7.1f}ms {warm['first'] * 1000:7.1f}ms "
+                  f"{cold['first'] / warm['first']:7.1f}x")
+        print(f"  {'total':<18} {cold_total * 1000:7.1f}ms {warm_total * 1000:7.1f}ms "
+              f"{cold_total / warm_total:7.1f}x")
+        print(f"  (app import, not included above: {warm['import'] * 1000:.0f} ms)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
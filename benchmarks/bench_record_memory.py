@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Record memory benchmark
+
+Measures memory held by TrialLog model instances versus the slotted
+TrialLogRecord rows returned by list queries, which also share repeated
+string values within a result set. The seeded rows all have the same
+note and timestamp, which is the best case for that sharing.
+
+Usage:
+    python benchmarks/bench_record_memory.py [rows]
+"""
+
+import os
+import sqlite3
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TrialLog, TrialLogRecord
+from bench_row_mapper import seed
+
+
+def measure(load):
+    tracemalloc.start()
+    objects = load()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, objects
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    seed(conn, rows)
+    # Warm the row mapper caches so they are not counted
+    TrialLog.from_rows(conn.execute('SELECT * FROM trial_logs LIMIT 1'))
+    TrialLogRecord.from_rows(conn.execute('SELECT * FROM trial_logs LIMIT 1'))
+
+    print(f"{rows} trial rows")
+    results = {}
+    for label, cls in [('TrialLog', TrialLog), ('TrialLogRecord', TrialLogRecord)]:
+        size, objects = measure(lambda: cls.from_rows(conn.execute('SELECT * FROM trial_logs')))
+        results[label] = size
+        print(f"  {label:<15} {size / 1024 / 1024:7.1f} MB   {size / rows:6.0f} bytes/row")
+        del objects
+    print(f"  saving          {1 - results['TrialLogRecord'] / results['TrialLog']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
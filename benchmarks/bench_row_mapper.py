@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Row materialization benchmark
+
+Compares the original per-row reflection in BaseModel.from_row with the
+cached row mappers when loading TrialLog rows.
+
+Usage:
+    python benchmarks/bench_row_mapper.py [rows]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import TrialLog
+
+
+def legacy_from_row(cls, row):
+    """BaseModel.from_row before row mappers were cached."""
+    data = dict(row)
+    allowed = cls._allowed_fields()
+    filtered = {k: v for k, v in data.items() if k in allowed}
+    inst = cls(**filtered)
+    for k, v in data.items():
+        if k not in allowed:
+            setattr(inst, k, v)
+    return inst
+
+
+def seed(conn, rows):
+    conn.execute('''
+        CREATE TABLE trial_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            objective_id INTEGER,
+            goal_id INTEGER,
+            independent INTEGER DEFAULT 0,
+            minimal_support INTEGER DEFAULT 0,
+            moderate_support INTEGER DEFAULT 0,
+            maximal_support INTEGER DEFAULT 0,
+            incorrect INTEGER DEFAULT 0,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.executemany('''
+        INSERT INTO trial_logs (session_id, objective_id, independent, minimal_support,
+                                moderate_support, maximal_support, incorrect, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(i // 4, i % 20, i % 7, i % 5, i % 3, i % 2, i % 4, 'note') for i in range(rows)])
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    seed(conn, rows)
+    query = 'SELECT tl.*, 1 AS extra_column FROM trial_logs tl'
+
+    fetch = best_of(lambda: conn.execute(query).fetchall())
+    legacy = best_of(lambda: [legacy_from_row(TrialLog, row)
+                              for row in conn.execute(query).fetchall()])
+    from_row = best_of(lambda: [TrialLog.from_row(row)
+                                for row in conn.execute(query).fetchall()])
+    from_rows = best_of(lambda: TrialLog.from_rows(conn.execute(query)))
+
+    print(f"{rows} TrialLog rows (best of 5)")
+    print(f"  fetch only          {fetch * 1000:8.1f} ms")
+    for label, seconds in [('legacy from_row', legacy), ('cached from_row', from_row),
+                           ('from_rows', from_rows)]:
+        print(f"  {label:<19} {seconds * 1000:8.1f} ms   "
+              f"materialize x{(legacy - fetch) / max(seconds - fetch, 1e-9):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+In-process response cache
+
+A TTL + LRU cache for rendered pages and query results. Every entry is
+stored with dependency tags, and write paths invalidate exactly the tags
+they affect:
+
+    student:<id>   anything shown for one student (detail page, objectives)
+    date:<iso>     sessions scheduled on one day (planner)
+    students       the active student list
+    dashboard      dashboard counters and recent activity
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 300  # seconds
+
+
+class TaggedCache:
+    """Thread-safe TTL + LRU cache with tag-based invalidation."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set of keys
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=(), ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_set(self, key, compute, tags=(), ttl=None):
+        """Return the cached value for key, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value, tags, ttl)
+        return value
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of the given tags."""
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _remove(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+cache = TaggedCache()
+
+
+def init_app(app):
+    """Size the shared cache from CACHE_MAX_ENTRIES / CACHE_TTL in app.config."""
+    app.config.setdefault('CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+    app.config.setdefault('CACHE_TTL', DEFAULT_TTL)
+    cache.max_entries = app.config['CACHE_MAX_ENTRIES']
+    cache.ttl = app.config['CACHE_TTL']
+
+
+def session_tags(db, session_ids, dates=True):
+    """Tags affected by a write to the given sessions (or their trials/notes).
+
+    Pass dates=False for writes the planner doesn't show, such as trials.
+    """
+    session_ids = list(session_ids)
+    if not session_ids:
+        return set()
+    placeholders = ', '.join('?' * len(session_ids))
+    tags = set()
+    for row in db.execute(f'''
+        SELECT DISTINCT student_id, session_date FROM sessions WHERE id IN ({placeholders})
+    ''', session_ids):
+        tags.add(f"student:{row['student_id']}")
+        if dates:
+            tags.add(f"date:{row['session_date']}")
+    return tags
+
+
+def goal_tags(db, goal_id):
+    """Tags affected by a write to a goal or one of its objectives."""
+    row = db.execute('SELECT student_id FROM goals WHERE id = ?', (goal_id,)).fetchone()
+    return {f"student:{row['student_id']}"} if row else set()
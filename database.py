@@ -1,147 +1,145 @@
 # database.py - Enhanced with Objectives
 import sqlite3
 import os
+import queue
 from contextlib import contextmanager
 
+from flask import current_app, g, has_app_context
+
+from migrations import fill_objective_rollup, fill_search_index, migrate
+
 DATABASE_PATH = os.path.join('data', 'students.db')
 
-def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
+# Defaults for app.config; override DATABASE_PRAGMAS per key.
+DEFAULT_POOL_SIZE = 5
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,       # negative = KiB, so ~16 MB of page cache
+    'mmap_size': 134217728,     # 128 MB
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,       # ms to wait on a locked database
+}
+
+
+def _connect(path=DATABASE_PATH, pragmas=None):
+    """Open a new connection and apply per-connection pragmas once."""
+    conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # Enable dict-like access
+    for name, value in (DEFAULT_PRAGMAS if pragmas is None else pragmas).items():
+        conn.execute(f'PRAGMA {name} = {value}')
     return conn
 
+
+class ConnectionPool:
+    """Small bounded pool of configured SQLite connections.
+
+    At most ``size`` idle connections are kept; if more are needed at once an
+    extra connection is opened and closed again when it is released.
+    """
+
+    def __init__(self, path=DATABASE_PATH, size=DEFAULT_POOL_SIZE, pragmas=None):
+        self.path = path
+        self.size = size
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return _connect(self.path, self.pragmas)
+
+    def release(self, conn):
+        # Never hand a half-finished transaction to the next request
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _get_pool(app):
+    pool = app.extensions.get('sqlite_pool')
+    if pool is None:
+        pool = ConnectionPool(app.config.get('DATABASE_PATH', DATABASE_PATH),
+                              app.config.get('DATABASE_POOL_SIZE', DEFAULT_POOL_SIZE),
+                              app.config.get('DATABASE_PRAGMAS'))
+        app.extensions['sqlite_pool'] = pool
+    return pool
+
+
+def get_db():
+    """Get the database connection for the current request.
+
+    Inside an app context the connection comes from the pool, is shared for
+    the rest of the request and is returned in teardown. Outside one a
+    standalone connection is returned and the caller must close it.
+    """
+    if not has_app_context():
+        return _connect()
+    if 'db' not in g:
+        g.db = _get_pool(current_app).acquire()
+    return g.db
+
+
+def close_db(exc=None):
+    """Return the request's connection to the pool."""
+    db = g.pop('db', None)
+    if db is not None:
+        _get_pool(current_app).release(db)
+
+
+def init_app(app):
+    """Register the connection pool and request teardown with the app."""
+    app.config.setdefault('DATABASE_PATH', DATABASE_PATH)
+    app.config.setdefault('DATABASE_POOL_SIZE', DEFAULT_POOL_SIZE)
+    app.config.setdefault('DATABASE_PRAGMAS', {})
+    os.makedirs(os.path.dirname(app.config['DATABASE_PATH']) or '.', exist_ok=True)
+    _get_pool(app)
+    app.teardown_appcontext(close_db)
+
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections."""
-    conn = get_db()
+    """Context manager for a standalone (unpooled) database connection."""
+    if has_app_context():
+        pool = _get_pool(current_app)
+        conn = _connect(pool.path, pool.pragmas)
+    else:
+        conn = _connect()
     try:
         yield conn
     finally:
         conn.close()
 
 def init_db():
-    """Initialize database with all tables."""
+    """Initialize database with all tables by applying pending migrations."""
     with get_db_connection() as conn:
-        # Students table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS students (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                preferred_name TEXT,
-                pronouns TEXT,
-                grade_level TEXT,
-                notes TEXT,
-                active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Goals table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS goals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                description TEXT NOT NULL,
-                target_accuracy INTEGER DEFAULT 80,
-                active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # NEW: Objectives table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS objectives (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal_id INTEGER NOT NULL,
-                description TEXT NOT NULL,
-                target_percentage INTEGER DEFAULT 80,
-                notes TEXT,
-                active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (goal_id) REFERENCES goals (id)
-            )
-        ''')
-        
-        # Sessions table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                student_id INTEGER NOT NULL,
-                session_date DATE NOT NULL,
-                start_time TIME,
-                end_time TIME,
-                session_type TEXT DEFAULT 'Individual',
-                location TEXT,
-                status TEXT DEFAULT 'Completed',
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (student_id) REFERENCES students (id)
-            )
-        ''')
-        
-        # Enhanced trial logs table - now links to objectives
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS trial_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                objective_id INTEGER,
-                goal_id INTEGER,
-                independent INTEGER DEFAULT 0,
-                minimal_support INTEGER DEFAULT 0,
-                moderate_support INTEGER DEFAULT 0,
-                maximal_support INTEGER DEFAULT 0,
-                incorrect INTEGER DEFAULT 0,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES sessions (id),
-                FOREIGN KEY (objective_id) REFERENCES objectives (id),
-                FOREIGN KEY (goal_id) REFERENCES goals (id)
-            )
-        ''')
-        
-        # SOAP notes table
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS soap_notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER NOT NULL,
-                subjective TEXT,
-                objective TEXT,
-                assessment TEXT,
-                plan TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (session_id) REFERENCES sessions (id)
-            )
-        ''')
-        
-        # Add new columns to students table if they don't exist
-        try:
-            conn.execute('ALTER TABLE students ADD COLUMN next_annual_review DATE')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        try:
-            conn.execute('ALTER TABLE students ADD COLUMN next_triennial_assessment DATE')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+        migrate(conn)
 
-        try:
-            conn.execute('ALTER TABLE students ADD COLUMN school TEXT')
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-        
-        # Create indexes for better performance
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_student ON goals(student_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_objectives_goal ON objectives(goal_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_student ON sessions(student_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_trials_session ON trial_logs(session_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_trials_objective ON trial_logs(objective_id)')
-        
+
+def rebuild_objective_rollup():
+    """Regenerate objective_daily_rollup from trial_logs. Returns the row count."""
+    with get_db_connection() as conn:
+        fill_objective_rollup(conn)
+        conn.commit()
+        return conn.execute('SELECT COUNT(*) FROM objective_daily_rollup').fetchone()[0]
+
+def rebuild_search_index():
+    """Regenerate search_index from the source tables. Returns the row count."""
+    with get_db_connection() as conn:
+        fill_search_index(conn)
         conn.commit()
+        return conn.execute('SELECT COUNT(*) FROM search_index').fetchone()[0]
 
 def add_sample_data():
     """Add some sample data for testing."""
@@ -0,0 +1,122 @@
+"""
+Streaming trial data export
+
+Walks one SQLite cursor over every matching trial log (joined with its
+session, student, goal and objective) and yields CSV or NDJSON text a
+batch at a time, so memory stays flat however many rows are exported.
+
+Usage:
+    GET /api/export/trials?format=csv&student_id=3&from=2024-01-01&to=2024-03-31
+    flask --app app admin export-trials --format ndjson --output trials.ndjson
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+COLUMNS = [
+    'trial_id', 'session_id', 'session_date', 'student_id', 'student_name',
+    'goal_id', 'goal', 'objective_id', 'objective', 'independent',
+    'minimal_support', 'moderate_support', 'maximal_support', 'incorrect',
+    'total_trials', 'notes',
+]
+
+# Rows pulled from the cursor per fetchmany() call
+BATCH_SIZE = 500
+
+
+def parse_filters(student_id=None, objective_id=None, date_from=None, date_to=None):
+    """Validate raw filter values. Raises ValueError on a bad id or date."""
+    return {
+        'student_id': int(student_id) if student_id else None,
+        'objective_id': int(objective_id) if objective_id else None,
+        'date_from': date.fromisoformat(date_from).isoformat() if date_from else None,
+        'date_to': date.fromisoformat(date_to).isoformat() if date_to else None,
+    }
+
+
+def iter_trial_rows(db, student_id=None, objective_id=None, date_from=None, date_to=None):
+    """Yield one tuple per trial log, in COLUMNS order, oldest session first."""
+    conditions, params = [], []
+    if student_id:
+        conditions.append('s.student_id = ?')
+        params.append(student_id)
+    if objective_id:
+        conditions.append('tl.objective_id = ?')
+        params.append(objective_id)
+    if date_from:
+        conditions.append('s.session_date >= ?')
+        params.append(date_from)
+    if date_to:
+        conditions.append('s.session_date <= ?')
+        params.append(date_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    cursor = db.execute(f'''
+        SELECT tl.id, s.id, s.session_date, st.id,
+               st.first_name || ' ' || st.last_name,
+               g.id, g.description, o.id, o.description,
+               COALESCE(tl.independent, 0), COALESCE(tl.minimal_support, 0),
+               COALESCE(tl.moderate_support, 0), COALESCE(tl.maximal_support, 0),
+               COALESCE(tl.incorrect, 0),
+               COALESCE(tl.independent, 0) + COALESCE(tl.minimal_support, 0) +
+               COALESCE(tl.moderate_support, 0) + COALESCE(tl.maximal_support, 0) +
+               COALESCE(tl.incorrect, 0),
+               tl.notes
+        FROM trial_logs tl
+        JOIN sessions s ON tl.session_id = s.id
+        JOIN students st ON s.student_id = st.id
+        LEFT JOIN objectives o ON tl.objective_id = o.id
+        LEFT JOIN goals g ON g.id = COALESCE(o.goal_id, tl.goal_id)
+        {where}
+        ORDER BY s.session_date, s.id, tl.id
+    ''', params)
+    # Plain tuples; sqlite3.Row would cost a dict-like wrapper per row
+    cursor.row_factory = None
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        yield from rows
+
+
+def iter_csv(rows, header=True):
+    """Encode rows as CSV, one chunk of text per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(COLUMNS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows):
+    """Encode rows as newline-delimited JSON objects, one chunk per batch."""
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(dict(zip(COLUMNS, row))))
+        if len(chunk) == BATCH_SIZE:
+            yield '\n'.join(chunk) + '\n'
+            chunk = []
+    if chunk:
+        yield '\n'.join(chunk) + '\n'
+
+
+def export_trials(db, fmt='csv', **filters):
+    """Text chunks for every trial matching the filters in the given format."""
+    rows = iter_trial_rows(db, **filters)
+    return iter_csv(rows) if fmt == 'csv' else iter_ndjson(rows)
@@ -0,0 +1,364 @@
+"""
+Batched trial data import
+
+Streams CSV or NDJSON rows (the same columns export.py writes) into
+sessions and trial_logs. Students, goals and objectives are matched by id
+or by name against lookup maps loaded once up front; a session is reused
+when the student already has one at that date and start time, otherwise
+it is created.
+
+Rows are written in transactions of ``batch_size``. Each commit also
+records how many input rows are done in import_progress, so re-running
+an interrupted import with the same key picks up after the last
+committed batch. The key defaults to a SHA-256 of the file contents, so
+the same file resumes and a different file under the same name does not.
+
+Rows without a status get IMPORTED_STATUS rather than 'Completed': they
+are past sessions, and 'Completed' would put every one of them in the
+pending SOAP note list.
+
+Usage:
+    flask --app app admin import-trials old-trials.csv --batch-size 2000
+    POST /admin/import  (multipart: file, [format], [batch_size], [key])
+
+Recognised columns (all but session_date and a student are optional):
+    session_date, student_id | student_name | first_name + last_name,
+    goal_id | goal, objective_id | objective, independent, minimal_support,
+    moderate_support, maximal_support, incorrect, notes, start_time,
+    end_time, session_type, location, status
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+from datetime import date
+
+from cache import cache
+from models import Session, TrialLog
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Session status for rows that don't name one
+IMPORTED_STATUS = 'Imported'
+
+# Error messages kept in the result; further errors are only counted
+MAX_ERRORS = 100
+
+COUNT_COLUMNS = TrialLog.SUPPORT_LEVELS + ['incorrect']
+
+# Placeholder for a name that matches more than one row
+_AMBIGUOUS = object()
+
+
+class ImportRowError(ValueError):
+    """An input row that can't be matched or parsed; it is skipped."""
+
+
+def detect_format(filename):
+    """'ndjson' for .ndjson/.jsonl files, otherwise 'csv'."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    return 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+
+
+def iter_records(stream, fmt='csv'):
+    """Yield one dict per input row from a text stream.
+
+    An NDJSON line that isn't valid JSON is yielded as an ImportRowError,
+    so the row is skipped like any other bad row instead of ending the
+    import.
+    """
+    if fmt == 'ndjson':
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield ImportRowError(f'invalid JSON: {e}')
+    else:
+        yield from csv.DictReader(stream)
+
+
+def _name_key(text):
+    return ' '.join(str(text).split()).casefold()
+
+
+def _add_name(index, key, value):
+    index[key] = _AMBIGUOUS if index.get(key, value) != value else value
+
+
+def _value(record, name):
+    value = record.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class Lookups:
+    """In-memory id/name maps, so resolving a row never queries the database."""
+
+    def __init__(self, db):
+        self.student_ids = set()
+        self.students_by_name = {}
+        for row in db.execute('SELECT id, first_name, last_name FROM students'):
+            self.student_ids.add(row['id'])
+            _add_name(self.students_by_name,
+                      _name_key(f"{row['first_name']} {row['last_name']}"), row['id'])
+
+        self.goal_students = {}
+        self.goals_by_name = {}
+        for row in db.execute('SELECT id, student_id, description FROM goals'):
+            self.goal_students[row['id']] = row['student_id']
+            _add_name(self.goals_by_name,
+                      (row['student_id'], _name_key(row['description'])), row['id'])
+
+        self.objective_goals = {}
+        self.objectives_by_goal = {}
+        self.objectives_by_student = {}
+        for row in db.execute('''
+            SELECT o.id, o.goal_id, o.description, g.student_id
+            FROM objectives o JOIN goals g ON o.goal_id = g.id
+        '''):
+            description = _name_key(row['description'])
+            self.objective_goals[row['id']] = row['goal_id']
+            _add_name(self.objectives_by_goal, (row['goal_id'], description), row['id'])
+            _add_name(self.objectives_by_student, (row['student_id'], description), row['id'])
+
+        # (student_id, session_date, start_time) -> session id, loaded per date
+        self.sessions = {}
+        self._session_dates = set()
+
+    def load_sessions(self, db, dates):
+        dates = sorted(set(dates) - self._session_dates)
+        if not dates:
+            return
+        placeholders = ', '.join('?' * len(dates))
+        for row in db.execute(f'''
+            SELECT id, student_id, session_date, start_time FROM sessions
+            WHERE session_date IN ({placeholders})
+        ''', dates):
+            self.sessions.setdefault(
+                (row['student_id'], row['session_date'], row['start_time']), row['id'])
+        self._session_dates.update(dates)
+
+    def _lookup(self, index, key, kind, name):
+        found = index.get(key)
+        if found is None:
+            raise ImportRowError(f"unknown {kind} '{name}'")
+        if found is _AMBIGUOUS:
+            raise ImportRowError(f"{kind} '{name}' matches more than one row; use its id")
+        return found
+
+    def student(self, record):
+        student_id = _value(record, 'student_id')
+        if student_id:
+            if int(student_id) not in self.student_ids:
+                raise ImportRowError(f"unknown student id {student_id}")
+            return int(student_id)
+        name = _value(record, 'student_name') or ' '.join(
+            filter(None, (_value(record, 'first_name'), _value(record, 'last_name'))))
+        if not name:
+            raise ImportRowError('no student_id or student name')
+        return self._lookup(self.students_by_name, _name_key(name), 'student', name)
+
+    def goal(self, record, student_id):
+        goal_id = _value(record, 'goal_id')
+        if goal_id:
+            if self.goal_students.get(int(goal_id)) != student_id:
+                raise ImportRowError(f"goal {goal_id} does not belong to student {student_id}")
+            return int(goal_id)
+        name = _value(record, 'goal')
+        if not name:
+            return None
+        return self._lookup(self.goals_by_name, (student_id, _name_key(name)), 'goal', name)
+
+    def objective(self, record, student_id, goal_id):
+        objective_id = _value(record, 'objective_id')
+        if objective_id:
+            owner = self.goal_students.get(self.objective_goals.get(int(objective_id)))
+            if owner != student_id:
+                raise ImportRowError(
+                    f"objective {objective_id} does not belong to student {student_id}")
+            return int(objective_id)
+        name = _value(record, 'objective')
+        if not name:
+            return None
+        if goal_id:
+            return self._lookup(self.objectives_by_goal, (goal_id, _name_key(name)),
+                                'objective', name)
+        return self._lookup(self.objectives_by_student, (student_id, _name_key(name)),
+                            'objective', name)
+
+
+def _parse(lookups, record):
+    """Return (session key, session data, trial data) for one input row."""
+    if isinstance(record, ImportRowError):
+        raise record
+    if not isinstance(record, dict):
+        raise ImportRowError(f'expected an object, got {type(record).__name__}')
+    try:
+        session_date = date.fromisoformat(_value(record, 'session_date') or '').isoformat()
+    except ValueError:
+        raise ImportRowError(f"bad session_date {record.get('session_date')!r}")
+    try:
+        student_id = lookups.student(record)
+        goal_id = lookups.goal(record, student_id)
+        objective_id = lookups.objective(record, student_id, goal_id)
+        counts = {column: int(_value(record, column) or 0) for column in COUNT_COLUMNS}
+    except ImportRowError:
+        raise
+    except ValueError as e:
+        raise ImportRowError(str(e))
+
+    start_time = _value(record, 'start_time')
+    session = {
+        'student_id': student_id,
+        'session_date': session_date,
+        'start_time': start_time,
+        'end_time': _value(record, 'end_time'),
+        'session_type': _value(record, 'session_type') or 'Individual',
+        'location': _value(record, 'location'),
+        'status': _value(record, 'status') or IMPORTED_STATUS,
+    }
+    # goal_id is only kept for legacy rows without an objective, as in TrialLog
+    trial = dict(counts, objective_id=objective_id,
+                 goal_id=None if objective_id else goal_id,
+                 notes=_value(record, 'notes') or '')
+    return (student_id, session_date, start_time), session, trial
+
+
+def _write_batch(db, lookups, batch, key, rows_done):
+    """Insert one batch and advance the progress row in the same transaction.
+
+    Returns the number of sessions created.
+    """
+    new_keys = []
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        lookups.load_sessions(db, {session_key[1] for session_key, _, _ in batch})
+        new_sessions = {}
+        for session_key, session, _ in batch:
+            if session_key not in lookups.sessions and session_key not in new_sessions:
+                new_sessions[session_key] = session
+        if new_sessions:
+            # AUTOINCREMENT ids are consecutive while we hold the write lock
+            db.executemany(Session.INSERT_SQL,
+                           [Session._insert_params(data) for data in new_sessions.values()])
+            last_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+            first_id = last_id - len(new_sessions) + 1
+            for session_id, session_key in enumerate(new_sessions, first_id):
+                lookups.sessions[session_key] = session_id
+                new_keys.append(session_key)
+
+        db.executemany(TrialLog.INSERT_SQL, [
+            TrialLog._insert_params(lookups.sessions[session_key], trial)
+            for session_key, _, trial in batch])
+        db.execute('''
+            INSERT INTO import_progress (key, rows_done) VALUES (?, ?)
+            ON CONFLICT (key) DO UPDATE SET rows_done = excluded.rows_done,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (key, rows_done))
+        db.commit()
+    except Exception:
+        db.rollback()
+        # The rolled-back sessions must not be matched by later batches
+        for session_key in new_keys:
+            del lookups.sessions[session_key]
+        raise
+
+    tags = {'dashboard'}
+    for (student_id, session_date, _), _, _ in batch:
+        tags.add(f'student:{student_id}')
+        tags.add(f'date:{session_date}')
+    cache.invalidate(*tags)
+    return len(new_sessions)
+
+
+def import_trials(db, records, key, batch_size=DEFAULT_BATCH_SIZE, progress=None,
+                  restart=False):
+    """Import trial rows in batched transactions, resuming under ``key``.
+
+    ``records`` is any iterable of dicts (see iter_records). ``progress`` is
+    called with the result dict after every committed batch. Rows that
+    can't be matched or parsed are skipped and reported in 'errors'.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    if restart:
+        db.execute('DELETE FROM import_progress WHERE key = ?', (key,))
+        db.commit()
+    row = db.execute('SELECT rows_done, finished FROM import_progress WHERE key = ?',
+                     (key,)).fetchone()
+    resume_from = row['rows_done'] if row else 0
+    result = {'key': key, 'rows': resume_from, 'resumed_from': resume_from,
+              'trials_imported': 0, 'sessions_created': 0, 'skipped': 0,
+              'errors': [], 'finished': bool(row and row['finished'])}
+    # Already fully imported under this key; restart=True imports it again
+    result['already_finished'] = result['finished']
+    if result['finished']:
+        return result
+
+    lookups = Lookups(db)
+    batch = []
+    line = resume_from
+    for line, record in enumerate(records, 1):
+        if line <= resume_from:
+            continue
+        try:
+            batch.append(_parse(lookups, record))
+        except ImportRowError as e:
+            result['skipped'] += 1
+            if len(result['errors']) < MAX_ERRORS:
+                result['errors'].append(f'row {line}: {e}')
+        # Every input row counts towards the batch so progress maps to rows read
+        if line % batch_size == 0:
+            result['sessions_created'] += _write_batch(db, lookups, batch, key, line)
+            result['trials_imported'] += len(batch)
+            result['rows'] = line
+            batch = []
+            if progress:
+                progress(result)
+
+    if line > result['rows']:
+        result['sessions_created'] += _write_batch(db, lookups, batch, key, line)
+        result['trials_imported'] += len(batch)
+        result['rows'] = line
+        if progress:
+            progress(result)
+
+    db.execute('''
+        INSERT INTO import_progress (key, rows_done, finished) VALUES (?, ?, 1)
+        ON CONFLICT (key) DO UPDATE SET finished = 1, updated_at = CURRENT_TIMESTAMP
+    ''', (key, result['rows']))
+    db.commit()
+    result['finished'] = True
+    return result
+
+
+def content_key(binary_stream):
+    """'sha256:<hex>' of a seekable binary stream's contents; rewinds it."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: binary_stream.read(1 << 16), b''):
+        digest.update(chunk)
+    binary_stream.seek(0)
+    return f'sha256:{digest.hexdigest()}'
+
+
+def import_file(db, path, fmt=None, key=None, **options):
+    """Import a CSV/NDJSON file; the key defaults to a hash of its contents."""
+    fmt = fmt or detect_format(path)
+    if not key:
+        with open(path, 'rb') as binary_stream:
+            key = content_key(binary_stream)
+    with open(path, newline='', encoding='utf-8') as stream:
+        return import_trials(db, iter_records(stream, fmt), key, **options)
+
+
+def import_stream(db, binary_stream, filename, fmt=None, key=None, **options):
+    """Import an uploaded file object; the key defaults to a hash of its contents."""
+    fmt = fmt or detect_format(filename)
+    key = key or content_key(binary_stream)
+    stream = io.TextIOWrapper(binary_stream, encoding='utf-8', newline='')
+    return import_trials(db, iter_records(stream, fmt), key, **options)
@@ -0,0 +1,409 @@
+"""
+Background jobs
+
+Heavy work (imports, exports, rebuilds, batch drafting) runs on a small
+pool of worker threads instead of a request thread. Jobs live in the
+``jobs`` table, so any process can queue one and its state survives a
+restart:
+
+    queued -> running -> succeeded | failed | cancelled
+
+Workers claim the oldest queued job with a single UPDATE ... RETURNING,
+so two processes never run the same job. When the app starts it recovers
+jobs left running by a process that is gone: resumable job types are
+queued again, the rest are marked failed.
+
+A job function takes a JobContext and the job's params and returns a
+JSON-serialisable result. It should call ctx.progress() now and then;
+that records progress and raises JobCancelled once cancellation has
+been requested.
+
+Usage:
+    POST /api/jobs {"kind": "rebuild-rollup", "params": {}}   -> 202 {"id": ...}
+    GET  /api/jobs/<id>
+    POST /api/jobs/<id>/cancel
+    flask --app app admin submit-job rebuild-rollup [--wait]
+    flask --app app admin run-jobs
+"""
+
+import json
+import os
+import threading
+import time
+
+from database import _get_pool
+
+DEFAULT_WORKERS = 2
+DEFAULT_POLL_INTERVAL = 2.0  # seconds between checks for jobs queued elsewhere
+
+STATUSES = ('queued', 'running', 'succeeded', 'failed', 'cancelled')
+FINISHED = ('succeeded', 'failed', 'cancelled')
+
+# kind -> JobType, filled by the @job decorator
+JOB_TYPES = {}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested."""
+
+
+class JobType:
+    def __init__(self, kind, func, resumable):
+        self.kind = kind
+        self.func = func
+        self.resumable = resumable
+
+
+def job(kind, resumable=False):
+    """Register a job function under ``kind``.
+
+    resumable=True means running it again after an interruption is safe,
+    so a restart re-queues it instead of failing it.
+    """
+    def register(func):
+        JOB_TYPES[kind] = JobType(kind, func, resumable)
+        return func
+    return register
+
+
+class JobContext:
+    """What a running job gets: a connection for its work and progress reporting."""
+
+    def __init__(self, app, job_id, params, db, status_db):
+        self.app = app
+        self.job_id = job_id
+        self.params = params
+        self.db = db
+        # Progress is committed on its own connection, never mid-way through
+        # the job's own transaction
+        self._status_db = status_db
+
+    def progress(self, done, total=None, message=None):
+        """Record progress, and stop the job if it has been cancelled."""
+        self._status_db.execute('''
+            UPDATE jobs SET progress_done = ?, progress_total = ?,
+                            message = COALESCE(?, message)
+            WHERE id = ?
+        ''', (done, total, message, self.job_id))
+        self._status_db.commit()
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        row = self._status_db.execute('SELECT cancel_requested FROM jobs WHERE id = ?',
+                                      (self.job_id,)).fetchone()
+        if row and row['cancel_requested']:
+            raise JobCancelled()
+
+
+def _row_to_dict(row):
+    data = dict(row)
+    for name in ('params', 'result'):
+        data[name] = json.loads(data[name]) if data[name] else None
+    data['cancel_requested'] = bool(data['cancel_requested'])
+    return data
+
+
+def get_job(db, job_id):
+    row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return _row_to_dict(row) if row else None
+
+
+def list_jobs(db, status=None, limit=50):
+    """Newest jobs first, optionally only those with one status."""
+    if status:
+        cursor = db.execute('SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?',
+                            (status, limit))
+    else:
+        cursor = db.execute('SELECT * FROM jobs ORDER BY id DESC LIMIT ?', (limit,))
+    return [_row_to_dict(row) for row in cursor]
+
+
+def submit(db, kind, params=None):
+    """Queue a job and return its id. Raises ValueError for an unknown kind."""
+    if kind not in JOB_TYPES:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    cursor = db.execute('INSERT INTO jobs (kind, params) VALUES (?, ?)',
+                        (kind, json.dumps(params or {})))
+    db.commit()
+    runner.wake()
+    return cursor.lastrowid
+
+
+def cancel(db, job_id):
+    """Cancel a queued job now, or ask a running one to stop. Returns the job."""
+    db.execute('''
+        UPDATE jobs SET status = 'cancelled', finished_at = CURRENT_TIMESTAMP
+        WHERE id = ? AND status = 'queued'
+    ''', (job_id,))
+    db.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'",
+               (job_id,))
+    db.commit()
+    return get_job(db, job_id)
+
+
+def _claim(db, job_id=None):
+    """Atomically mark the oldest queued job (or job_id) running and return it."""
+    target = '?' if job_id else "(SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1)"
+    row = db.execute(f'''
+        UPDATE jobs SET status = 'running', worker_pid = ?, attempts = attempts + 1,
+                        started_at = CURRENT_TIMESTAMP, cancel_requested = 0
+        WHERE id = {target} AND status = 'queued'
+        RETURNING id, kind, params
+    ''', (os.getpid(), job_id) if job_id else (os.getpid(),)).fetchone()
+    db.commit()
+    return row
+
+
+def _finish(db, job_id, status, result=None, error=None):
+    db.execute('''
+        UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''', (status, json.dumps(result) if result is not None else None, error, job_id))
+    db.commit()
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover(db):
+    """Requeue or fail jobs whose worker process is gone. Returns how many."""
+    recovered = 0
+    for row in db.execute("SELECT id, kind, worker_pid FROM jobs WHERE status = 'running'").fetchall():
+        if row['worker_pid'] != os.getpid() and _pid_alive(row['worker_pid']):
+            continue
+        job_type = JOB_TYPES.get(row['kind'])
+        if job_type and job_type.resumable:
+            db.execute('''
+                UPDATE jobs SET status = 'queued', worker_pid = NULL,
+                                message = 'Requeued after a restart'
+                WHERE id = ?
+            ''', (row['id'],))
+        else:
+            _finish(db, row['id'], 'failed', error='Interrupted by a restart')
+        recovered += 1
+    db.commit()
+    return recovered
+
+
+def run_job(app, db, row):
+    """Run one claimed job to completion on the calling thread."""
+    job_type = JOB_TYPES.get(row['kind'])
+    if job_type is None:
+        _finish(db, row['id'], 'failed', error=f"Unknown job kind '{row['kind']}'")
+        return
+    pool = _get_pool(app)
+    work_db = pool.acquire()
+    params = json.loads(row['params'] or '{}')
+    ctx = JobContext(app, row['id'], params, work_db, db)
+    try:
+        with app.app_context():
+            result = job_type.func(ctx, **params)
+    except JobCancelled:
+        _finish(db, row['id'], 'cancelled')
+    except Exception as e:
+        app.logger.exception('Job %s (%s) failed', row['id'], row['kind'])
+        _finish(db, row['id'], 'failed', error=f'{type(e).__name__}: {e}')
+    else:
+        _finish(db, row['id'], 'succeeded', result=result)
+    finally:
+        pool.release(work_db)
+
+
+class JobRunner:
+    """Bounded pool of worker threads pulling from the jobs table."""
+
+    def __init__(self):
+        self.app = None
+        self.workers = DEFAULT_WORKERS
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self._threads = []
+        self._wake = threading.Condition()
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_WORKERS', DEFAULT_WORKERS)
+        app.config.setdefault('JOBS_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+        self.app = app
+        self.workers = app.config['JOBS_WORKERS']
+        self.poll_interval = app.config['JOBS_POLL_INTERVAL']
+        # Started by the first request, so CLI commands don't spawn workers
+        app.before_request(self.start)
+
+    @property
+    def running(self):
+        return bool(self._threads)
+
+    def start(self):
+        if self._threads or not self.workers:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            db = _get_pool(self.app).acquire()
+            try:
+                recover(db)
+            finally:
+                _get_pool(self.app).release(db)
+            self._stopping = False
+            for n in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'job-worker-{n}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        with self._wake:
+            self._stopping = True
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        with self._wake:
+            self._wake.notify()
+
+    def _work(self):
+        pool = _get_pool(self.app)
+        db = pool.acquire()
+        try:
+            while not self._stopping:
+                row = _claim(db)
+                if row is not None:
+                    run_job(self.app, db, row)
+                    continue
+                with self._wake:
+                    if not self._stopping:
+                        self._wake.wait(self.poll_interval)
+        finally:
+            pool.release(db)
+
+    def run_pending(self, db, job_id=None):
+        """Run queued jobs (or one job) on this thread until none are left.
+
+        Used by the CLI, where no worker threads are running.
+        """
+        ran = 0
+        while True:
+            row = _claim(db, job_id)
+            if row is None:
+                return ran
+            run_job(self.app, db, row)
+            ran += 1
+            if job_id:
+                return ran
+
+
+runner = JobRunner()
+
+
+def init_app(app):
+    runner.init_app(app)
+
+
+# Built-in job types. Params may arrive as strings from the CLI (-p name=value).
+
+def _flag(value):
+    return value in (True, 1, 'true', '1', 'yes')
+
+
+@job('rebuild-rollup', resumable=True)
+def _rebuild_rollup_job(ctx):
+    from migrations import fill_objective_rollup
+    fill_objective_rollup(ctx.db)
+    ctx.db.commit()
+    return {'rows': ctx.db.execute('SELECT COUNT(*) FROM objective_daily_rollup').fetchone()[0]}
+
+
+@job('rebuild-search', resumable=True)
+def _rebuild_search_job(ctx):
+    from migrations import fill_search_index
+    fill_search_index(ctx.db)
+    ctx.db.commit()
+    return {'rows': ctx.db.execute('SELECT COUNT(*) FROM search_index').fetchone()[0]}
+
+
+@job('generate-soap-drafts', resumable=True)
+def _soap_drafts_job(ctx, date_from=None, date_to=None, overwrite=False):
+    from models import SOAPDraft
+    return SOAPDraft.generate(ctx.db, date_from=date_from, date_to=date_to,
+                             overwrite=_flag(overwrite))
+
+
+def imports_dir(app):
+    """Where uploads for import-trials jobs are saved (data/imports)."""
+    return os.path.join(os.path.dirname(os.path.abspath(app.config['DATABASE_PATH'])), 'imports')
+
+
+def import_path(app, path):
+    """Resolve an import-trials path; ValueError unless it is inside imports_dir."""
+    directory = os.path.realpath(imports_dir(app))
+    resolved = os.path.realpath(path) if isinstance(path, str) and path else directory
+    if os.path.commonpath([directory, resolved]) != directory or not os.path.isfile(resolved):
+        raise ValueError('path must be a file uploaded to the imports directory')
+    return resolved
+
+
+@job('import-trials', resumable=True)
+def _import_job(ctx, path, fmt=None, key=None, batch_size=None, restart=False):
+    # Resuming is safe: the importer continues after its last committed batch
+    import importer
+    # Jobs can be queued through the API, so only files under data/imports are read
+    path = import_path(ctx.app, path)
+
+    def report(result):
+        ctx.progress(result['rows'], message=f"{result['trials_imported']} trials imported")
+
+    result = importer.import_file(ctx.db, path, fmt=fmt, key=key, progress=report,
+                                  batch_size=int(batch_size or importer.DEFAULT_BATCH_SIZE),
+                                  restart=_flag(restart))
+    if result['already_finished']:
+        raise ValueError(f"Already imported under key '{result['key']}'; "
+                         "submit with restart=true to import it again")
+    # Keep the stored result small; the first errors are enough to act on
+    result['errors'] = result['errors'][:10]
+    return result
+
+
+@job('export-trials', resumable=True)
+def _export_job(ctx, fmt='csv', **filters):
+    import export
+    if fmt not in export.FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'")
+    directory = os.path.join(os.path.dirname(ctx.app.config['DATABASE_PATH']), 'exports')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.abspath(os.path.join(directory, f'trials-job{ctx.job_id}.{fmt}'))
+    started = time.monotonic()
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        for n, chunk in enumerate(export.export_trials(
+                ctx.db, fmt, **export.parse_filters(**filters)), 1):
+            output.write(chunk)
+            if n % 20 == 0:
+                ctx.progress(n * export.BATCH_SIZE, message='Exporting')
+    return {'file': path, 'seconds': round(time.monotonic() - started, 2)}
+
+
+@job('progress-reports', resumable=True)
+def _progress_reports_job(ctx, date_from=None, date_to=None, student_ids=None, workers=None):
+    import reports
+    directory = os.path.join(os.path.dirname(ctx.app.config['DATABASE_PATH']), 'reports')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.abspath(os.path.join(directory, f'progress-reports-job{ctx.job_id}.zip'))
+    if isinstance(student_ids, str):
+        student_ids = student_ids.split(',')
+    result = reports.generate_reports(
+        ctx.app.config['DATABASE_PATH'], path,
+        reports.caseload_student_ids(ctx.db, student_ids),
+        date_from=date_from, date_to=date_to, workers=int(workers) if workers else None,
+        progress=lambda done, total: ctx.progress(done, total, 'Rendering reports'))
+    result['file'] = result.pop('output')
+    return result
@@ -0,0 +1,534 @@
+"""
+Versioned schema migrations
+
+Each migration runs once, in order, inside its own transaction, and the
+schema version is recorded in PRAGMA user_version. A database that is
+already current costs a single PRAGMA read at startup.
+
+Add a migration by appending a (version, description, function) entry to
+MIGRATIONS; never edit one that has shipped.
+"""
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _add_column(conn, table, column, definition):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists."""
+    if column not in _columns(conn, table):
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+def _base_schema(conn):
+    """Core tables. Uses IF NOT EXISTS so pre-migration databases adopt it."""
+    # Students table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            preferred_name TEXT,
+            pronouns TEXT,
+            grade_level TEXT,
+            notes TEXT,
+            active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Goals table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            target_accuracy INTEGER DEFAULT 80,
+            active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id)
+        )
+    ''')
+
+    # Objectives table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS objectives (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal_id INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            target_percentage INTEGER DEFAULT 80,
+            notes TEXT,
+            active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (goal_id) REFERENCES goals (id)
+        )
+    ''')
+
+    # Sessions table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            session_date DATE NOT NULL,
+            start_time TIME,
+            end_time TIME,
+            session_type TEXT DEFAULT 'Individual',
+            location TEXT,
+            status TEXT DEFAULT 'Completed',
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students (id)
+        )
+    ''')
+
+    # Enhanced trial logs table - now links to objectives
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS trial_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            objective_id INTEGER,
+            goal_id INTEGER,
+            independent INTEGER DEFAULT 0,
+            minimal_support INTEGER DEFAULT 0,
+            moderate_support INTEGER DEFAULT 0,
+            maximal_support INTEGER DEFAULT 0,
+            incorrect INTEGER DEFAULT 0,
+            notes TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES sessions (id),
+            FOREIGN KEY (objective_id) REFERENCES objectives (id),
+            FOREIGN KEY (goal_id) REFERENCES goals (id)
+        )
+    ''')
+
+    # SOAP notes table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS soap_notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL,
+            subjective TEXT,
+            objective TEXT,
+            assessment TEXT,
+            plan TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES sessions (id)
+        )
+    ''')
+
+    # Columns added after the first release
+    _add_column(conn, 'students', 'next_annual_review', 'DATE')
+    _add_column(conn, 'students', 'next_triennial_assessment', 'DATE')
+    _add_column(conn, 'students', 'school', 'TEXT')
+    _add_column(conn, 'trial_logs', 'objective_id', 'INTEGER')
+
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_student ON goals(student_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_objectives_goal ON objectives(goal_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_student ON sessions(student_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trials_session ON trial_logs(session_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_trials_objective ON trial_logs(objective_id)')
+
+
+# Sum columns shared by trial_logs and objective_daily_rollup
+ROLLUP_COLUMNS = ['independent', 'minimal_support', 'moderate_support',
+                  'maximal_support', 'incorrect']
+
+
+def _rollup_add(sign, ref):
+    """UPSERT adding (sign=+) or removing (sign=-) one trial row's counts."""
+    sums = ', '.join(f'{sign}COALESCE({ref}.{col}, 0)' for col in ROLLUP_COLUMNS)
+    updates = ', '.join(f'{col} = {col} + excluded.{col}' for col in ROLLUP_COLUMNS)
+    cleanup = ''
+    if sign == '-':
+        # Drop the objective-day once its last trial row is gone
+        cleanup = f'''
+        DELETE FROM objective_daily_rollup
+        WHERE objective_id = {ref}.objective_id AND trial_count <= 0
+          AND session_date = (SELECT session_date FROM sessions WHERE id = {ref}.session_id);'''
+    return f'''
+        INSERT INTO objective_daily_rollup (objective_id, session_date, trial_count, {', '.join(ROLLUP_COLUMNS)})
+        SELECT {ref}.objective_id, s.session_date, {sign}1, {sums}
+        FROM sessions s WHERE s.id = {ref}.session_id AND {ref}.objective_id IS NOT NULL
+        ON CONFLICT (objective_id, session_date) DO UPDATE SET
+            trial_count = trial_count + excluded.trial_count, {updates};{cleanup}'''
+
+
+def _rollup_refresh(date_refs, session_ref):
+    """Recompute the rollup rows a session's trials contribute to."""
+    dates = ', '.join(date_refs)
+    objectives = f'SELECT objective_id FROM trial_logs WHERE session_id = {session_ref}'
+    sums = ', '.join(f'COALESCE(SUM(tl.{col}), 0)' for col in ROLLUP_COLUMNS)
+    return f'''
+        DELETE FROM objective_daily_rollup
+        WHERE session_date IN ({dates}) AND objective_id IN ({objectives});
+        INSERT INTO objective_daily_rollup (objective_id, session_date, trial_count, {', '.join(ROLLUP_COLUMNS)})
+        SELECT tl.objective_id, s.session_date, COUNT(*), {sums}
+        FROM trial_logs tl JOIN sessions s ON tl.session_id = s.id
+        WHERE s.session_date IN ({dates}) AND tl.objective_id IN ({objectives})
+        GROUP BY tl.objective_id, s.session_date;'''
+
+
+ROLLUP_SCHEMA = [
+    f'''
+    CREATE TABLE IF NOT EXISTS objective_daily_rollup (
+        objective_id INTEGER NOT NULL,
+        session_date DATE NOT NULL,
+        trial_count INTEGER NOT NULL DEFAULT 0,
+        {', '.join(f'{col} INTEGER NOT NULL DEFAULT 0' for col in ROLLUP_COLUMNS)},
+        PRIMARY KEY (objective_id, session_date)
+    ) WITHOUT ROWID
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_trial_insert AFTER INSERT ON trial_logs
+    BEGIN {_rollup_add('+', 'NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_trial_delete AFTER DELETE ON trial_logs
+    BEGIN {_rollup_add('-', 'OLD')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_trial_update
+    AFTER UPDATE OF session_id, objective_id, {', '.join(ROLLUP_COLUMNS)} ON trial_logs
+    BEGIN {_rollup_add('-', 'OLD')} {_rollup_add('+', 'NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_session_date AFTER UPDATE OF session_date ON sessions
+    WHEN OLD.session_date IS NOT NEW.session_date
+    BEGIN {_rollup_refresh(['OLD.session_date', 'NEW.session_date'], 'NEW.id')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_session_delete AFTER DELETE ON sessions
+    BEGIN {_rollup_refresh(['OLD.session_date'], 'OLD.id')}
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_rollup_objective_delete AFTER DELETE ON objectives
+    BEGIN
+        DELETE FROM objective_daily_rollup WHERE objective_id = OLD.id;
+    END
+    ''',
+]
+
+
+def fill_objective_rollup(conn):
+    """Regenerate objective_daily_rollup from trial_logs."""
+    sums = ', '.join(f'COALESCE(SUM(tl.{col}), 0)' for col in ROLLUP_COLUMNS)
+    conn.execute('DELETE FROM objective_daily_rollup')
+    conn.execute(f'''
+        INSERT INTO objective_daily_rollup (objective_id, session_date, trial_count, {', '.join(ROLLUP_COLUMNS)})
+        SELECT tl.objective_id, s.session_date, COUNT(*), {sums}
+        FROM trial_logs tl JOIN sessions s ON tl.session_id = s.id
+        WHERE tl.objective_id IS NOT NULL
+        GROUP BY tl.objective_id, s.session_date
+    ''')
+
+
+def _objective_rollup(conn):
+    """Per objective-day trial sums, kept current by triggers."""
+    for statement in ROLLUP_SCHEMA:
+        conn.execute(statement)
+    fill_objective_rollup(conn)
+
+
+def _query_indexes(conn):
+    """Composite and covering indexes for the hot model queries."""
+    # Sessions: by day in time order, per-student history, recent lists,
+    # pending SOAP notes. (student_id, session_date) supersedes student_id.
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_date_start ON sessions(session_date, start_time)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_date_created ON sessions(session_date, created_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_student_date ON sessions(student_id, session_date)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_status_date ON sessions(status, session_date)')
+    conn.execute('DROP INDEX IF EXISTS idx_sessions_student')
+
+    # Active student list in name order
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_students_active_name ON students(active, last_name, first_name)')
+
+    # One SOAP note per session. If duplicates slipped in, the newest stays
+    # and the older ones move to soap_notes_duplicates, never deleted outright.
+    duplicates = 'id NOT IN (SELECT MAX(id) FROM soap_notes GROUP BY session_id)'
+    if conn.execute(f'SELECT 1 FROM soap_notes WHERE {duplicates} LIMIT 1').fetchone():
+        conn.execute('CREATE TABLE IF NOT EXISTS soap_notes_duplicates AS SELECT * FROM soap_notes WHERE 0')
+        conn.execute(f'INSERT INTO soap_notes_duplicates SELECT * FROM soap_notes WHERE {duplicates}')
+        conn.execute(f'DELETE FROM soap_notes WHERE {duplicates}')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_soap_notes_session ON soap_notes(session_id)')
+
+    # Covering index for trial sums per objective, supersedes objective_id
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_trials_objective_counts
+        ON trial_logs(objective_id, session_id, {', '.join(ROLLUP_COLUMNS)})
+    ''')
+    conn.execute('DROP INDEX IF EXISTS idx_trials_objective')
+
+
+def _session_keyset_index(conn):
+    """Per-student history index matching the (session_date, created_at, id) keyset."""
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sessions_student_date_created
+        ON sessions(student_id, session_date, created_at)
+    ''')
+    conn.execute('DROP INDEX IF EXISTS idx_sessions_student_date')
+
+
+def _import_progress(conn):
+    """Rows committed per import key, so an interrupted import can resume."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS import_progress (
+            key TEXT PRIMARY KEY,
+            rows_done INTEGER NOT NULL DEFAULT 0,
+            finished BOOLEAN NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+# Everything searchable, one row per source row. rowid = source id * 8 +
+# kind code, so triggers can find a row without scanning the index.
+SEARCH_SOURCES = {
+    # kind: (code, table, columns, other tables, condition); {r} is the source row
+    'soap': (1, 'soap_notes',
+             "COALESCE({r}.subjective, '') || char(10) || COALESCE({r}.objective, '') || char(10) || "
+             "COALESCE({r}.assessment, '') || char(10) || COALESCE({r}.plan, ''), "
+             "s.student_id, s.id, s.session_date",
+             'sessions s', 's.id = {r}.session_id'),
+    'session': (2, 'sessions', '{r}.notes, {r}.student_id, {r}.id, {r}.session_date',
+                None, "COALESCE({r}.notes, '') != ''"),
+    'trial': (3, 'trial_logs', '{r}.notes, s.student_id, s.id, s.session_date',
+              'sessions s', "s.id = {r}.session_id AND COALESCE({r}.notes, '') != ''"),
+    'objective': (4, 'objectives',
+                  "{r}.description || char(10) || COALESCE({r}.notes, ''), g.student_id, NULL, NULL",
+                  'goals g', 'g.id = {r}.goal_id'),
+    'goal': (5, 'goals', '{r}.description, {r}.student_id, NULL, NULL', None, '1'),
+}
+
+# Columns whose change means re-indexing the row
+SEARCH_UPDATE_COLUMNS = {
+    'soap': 'subjective, objective, assessment, plan, session_id',
+    'session': 'notes, student_id, session_date',
+    'trial': 'notes, session_id',
+    'objective': 'description, notes, goal_id',
+    'goal': 'description, student_id',
+}
+
+
+def _search_insert(kind, ref=None):
+    """INSERT one kind into search_index, for row ref (e.g. NEW) or the whole table."""
+    code, table, columns, join, condition = SEARCH_SOURCES[kind]
+    r = ref or 'src'
+    tables = ([] if ref else [f'{table} src']) + ([join] if join else [])
+    source = f"FROM {', '.join(tables)}" if tables else ''
+    return f'''
+        INSERT INTO search_index (rowid, kind, ref_id, body, student_id, session_id, session_date)
+        SELECT {r}.id * 8 + {code}, '{kind}', {r}.id, {columns.format(r=r)}
+        {source} WHERE {condition.format(r=r)};'''
+
+
+def _search_delete(kind, ref='OLD'):
+    return f'''
+        DELETE FROM search_index WHERE rowid = {ref}.id * 8 + {SEARCH_SOURCES[kind][0]};'''
+
+
+def _search_triggers():
+    statements = []
+    for kind, (_, table, _, _, _) in SEARCH_SOURCES.items():
+        statements += [
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_{table}_insert AFTER INSERT ON {table}
+            BEGIN {_search_insert(kind, 'NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_{table}_update
+            AFTER UPDATE OF {SEARCH_UPDATE_COLUMNS[kind]} ON {table}
+            BEGIN {_search_delete(kind)} {_search_insert(kind, 'NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_{table}_delete AFTER DELETE ON {table}
+            BEGIN {_search_delete(kind)}
+            END
+            ''',
+        ]
+    # Rows that copy their student/date from a parent follow it when it moves
+    statements += [
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_search_sessions_move
+        AFTER UPDATE OF student_id, session_date ON sessions
+        BEGIN
+            UPDATE search_index SET student_id = NEW.student_id, session_date = NEW.session_date
+            WHERE rowid IN (
+                SELECT id * 8 + {SEARCH_SOURCES['soap'][0]} FROM soap_notes WHERE session_id = NEW.id
+                UNION ALL
+                SELECT id * 8 + {SEARCH_SOURCES['trial'][0]} FROM trial_logs WHERE session_id = NEW.id);
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS trg_search_goals_move AFTER UPDATE OF student_id ON goals
+        BEGIN
+            UPDATE search_index SET student_id = NEW.student_id
+            WHERE rowid IN (
+                SELECT id * 8 + {SEARCH_SOURCES['objective'][0]} FROM objectives WHERE goal_id = NEW.id);
+        END
+        ''',
+    ]
+    return statements
+
+
+def fill_search_index(conn):
+    """Regenerate search_index from the source tables."""
+    conn.execute('DELETE FROM search_index')
+    for kind in SEARCH_SOURCES:
+        conn.execute(_search_insert(kind))
+
+
+def _search_index(conn):
+    """FTS5 index over notes and descriptions, kept current by triggers."""
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            body, kind UNINDEXED, ref_id UNINDEXED, student_id UNINDEXED,
+            session_id UNINDEXED, session_date UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+    ''')
+    for statement in _search_triggers():
+        conn.execute(statement)
+    fill_search_index(conn)
+
+
+def _soap_drafts(conn):
+    """Generated SOAP notes awaiting review, at most one per session."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS soap_drafts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id INTEGER NOT NULL UNIQUE,
+            subjective TEXT,
+            objective TEXT,
+            assessment TEXT,
+            plan TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES sessions (id)
+        )
+    ''')
+
+
+def _jobs(conn):
+    """Background job queue and history, see jobs.py."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            params TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            progress_done INTEGER,
+            progress_total INTEGER,
+            message TEXT,
+            result TEXT,
+            error TEXT,
+            cancel_requested BOOLEAN NOT NULL DEFAULT 0,
+            worker_pid INTEGER,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)')
+
+
+# Tables whose writes bump data_versions, see versions.py
+VERSIONED_TABLES = ('students', 'goals', 'objectives', 'sessions', 'trial_logs',
+                    'soap_notes', 'soap_drafts')
+
+
+def _data_versions(conn):
+    """Per-table version counters for ETags, bumped by write triggers."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for table in VERSIONED_TABLES:
+        conn.execute('INSERT OR IGNORE INTO data_versions (table_name, version) VALUES (?, 1)',
+                     (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_versions
+                    SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE table_name = '{table}';
+                END
+            ''')
+
+
+def _soap_draft_invalidation(conn):
+    """Drop a session's SOAP draft whenever its trial logs change."""
+    # Drafts already older than a trial of their session are stale now
+    conn.execute('''
+        DELETE FROM soap_drafts WHERE EXISTS (
+            SELECT 1 FROM trial_logs t
+            WHERE t.session_id = soap_drafts.session_id AND t.created_at > soap_drafts.created_at)
+    ''')
+    for event, sessions in (('INSERT', ('NEW',)), ('UPDATE', ('OLD', 'NEW')), ('DELETE', ('OLD',))):
+        deletes = ''.join(f'DELETE FROM soap_drafts WHERE session_id = {row}.session_id;\n'
+                          for row in sessions)
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_soap_draft_trial_{event.lower()}
+            AFTER {event} ON trial_logs
+            BEGIN
+                {deletes}
+            END
+        ''')
+
+
+MIGRATIONS = [
+    (1, 'base schema', _base_schema),
+    (2, 'objective daily rollup', _objective_rollup),
+    (3, 'query indexes', _query_indexes),
+    (4, 'session keyset index', _session_keyset_index),
+    (5, 'import progress', _import_progress),
+    (6, 'full-text search index', _search_index),
+    (7, 'soap drafts', _soap_drafts),
+    (8, 'background jobs', _jobs),
+    (9, 'data versions', _data_versions),
+    (10, 'soap draft invalidation', _soap_draft_invalidation),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, log=None):
+    """Bring the schema up to LATEST_VERSION. Returns the final version."""
+    version = schema_version(conn)
+    if version >= LATEST_VERSION:
+        return version
+
+    for number, description, apply in MIGRATIONS:
+        if number <= version:
+            continue
+        # IMMEDIATE so a second process waits instead of migrating twice
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if schema_version(conn) >= number:
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if log:
+            log(f'Applied migration {number}: {description}')
+    return schema_version(conn)
@@ -1,15 +1,33 @@
-from .base import BaseModel
+from .base import BaseModel, Record
+from .pagination import Page, InvalidCursor
 from .student import Student
 from .goal import Goal, Objective
-from .session import Session, TrialLog
-from .soap import SOAPNote
+from .session import Session, TrialLog, SessionRecord, TrialLogRecord
+from .soap import SOAPNote, SOAPNoteRecord, SOAPDraft, SOAPDraftRecord
+from .progress import ProgressEngine, ProgressSeries
+from .stats import DashboardStats
+from .search import SearchIndex
+from .tracking import TrackingBootstrap
 
 __all__ = [
     'BaseModel',
+    'Record',
+    'Page',
+    'InvalidCursor',
     'Student',
     'Goal',
     'Objective',
     'Session',
     'TrialLog',
+    'SessionRecord',
+    'TrialLogRecord',
     'SOAPNote',
+    'SOAPNoteRecord',
+    'SOAPDraft',
+    'SOAPDraftRecord',
+    'ProgressEngine',
+    'ProgressSeries',
+    'DashboardStats',
+    'SearchIndex',
+    'TrackingBootstrap',
 ]
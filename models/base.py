@@ -1,14 +1,15 @@
 import inspect
+from operator import itemgetter
 
 
-class BaseModel:
-    """Base model with common functionality."""
+class RowMapping:
+    """Cached per-query-shape row mappers shared by models and records.
 
-    @classmethod
-    def get_by_id(cls, db, id):
-        cursor = db.execute(f"SELECT * FROM {cls.table_name} WHERE id = ?", (id,))
-        row = cursor.fetchone()
-        return cls.from_row(row) if row else None
+    Subclasses define _compile_row_mapper(columns), returning the
+    row -> instance function for one column layout.
+    """
+
+    __slots__ = ()
 
     @classmethod
     def from_row(cls, row):
@@ -18,15 +19,81 @@ class BaseModel:
         """
         if not row:
             return None
-        data = dict(row)
+        return cls._row_mapper(tuple(row.keys()))(row)
+
+    @classmethod
+    def from_rows(cls, cursor):
+        """Create instances for every remaining row of a cursor."""
+        mapper = cls._row_mapper(tuple(col[0] for col in cursor.description))
+        return [mapper(row) for row in cursor]
+
+    @classmethod
+    def _row_mapper(cls, columns):
+        """Return the cached row -> instance function for a column layout."""
+        # Look in the class's own __dict__ so subclasses never share a cache
+        mappers = cls.__dict__.get('_row_mappers')
+        if mappers is None:
+            mappers = {}
+            cls._row_mappers = mappers
+        mapper = mappers.get(columns)
+        if mapper is None:
+            mapper = mappers[columns] = cls._compile_row_mapper(columns)
+        return mapper
+
+
+class BaseModel(RowMapping):
+    """Base model with common functionality."""
+
+    @classmethod
+    def get_by_id(cls, db, id):
+        cursor = db.execute(f"SELECT * FROM {cls.table_name} WHERE id = ?", (id,))
+        row = cursor.fetchone()
+        return cls.from_row(row) if row else None
+
+    @classmethod
+    def get_many(cls, db, ids):
+        """Load rows by id in one query. Returns {id: instance}."""
+        ids = list(dict.fromkeys(id for id in ids if id is not None))
+        if not ids:
+            return {}
+        placeholders = ', '.join('?' * len(ids))
+        cursor = db.execute(f"SELECT * FROM {cls.table_name} WHERE id IN ({placeholders})", ids)
+        return {inst.id: inst for inst in cls.from_rows(cursor)}
+
+    @classmethod
+    def _compile_row_mapper(cls, columns):
+        """Build a row mapper once per query shape instead of per row."""
         allowed = cls._allowed_fields()
-        filtered = {k: v for k, v in data.items() if k in allowed}
-        inst = cls(**filtered)
-        # Attach any extra columns so callers can still access them if needed
-        for k, v in data.items():
-            if k not in allowed:
-                setattr(inst, k, v)
-        return inst
+        field_names, field_indexes, extras = [], [], []
+        seen = set()
+        for index, name in enumerate(columns):
+            # Like dict(row): when a JOIN repeats a column name the first wins
+            if name in seen:
+                continue
+            seen.add(name)
+            if name in allowed:
+                field_names.append(name)
+                field_indexes.append(index)
+            else:
+                extras.append((name, index))
+
+        field_names = tuple(field_names)
+        if len(field_indexes) == 1:
+            index = field_indexes[0]
+            get_fields = lambda row: (row[index],)
+        elif field_indexes:
+            get_fields = itemgetter(*field_indexes)
+        else:
+            get_fields = lambda row: ()
+
+        def mapper(row):
+            inst = cls(**dict(zip(field_names, get_fields(row))))
+            # Attach any extra columns so callers can still access them if needed
+            for name, index in extras:
+                setattr(inst, name, row[index])
+            return inst
+
+        return mapper
 
     @classmethod
     def _allowed_fields(cls):
@@ -40,3 +107,110 @@ class BaseModel:
         """Convert to dictionary."""
         return {k: v for k, v in self.__dict__.items()
                 if not k.startswith('_')}
+
+
+class Record(RowMapping):
+    """Slotted, read-only row returned by list queries.
+
+    Subclasses are built with record_type(). Only the names in ``_extras``
+    can be assigned after a record is loaded, for values callers attach
+    such as student_name.
+
+    from_rows() stores equal strings once per result set: dates,
+    timestamps, statuses and notes repeat across rows, and sqlite3 returns
+    a new string object for every row.
+    """
+
+    __slots__ = ()
+    _fields = ()
+    _extras = ()
+    _field_defaults = {}
+    _null_defaults = {}
+
+    def __setattr__(self, name, value):
+        if name not in self._extras:
+            raise AttributeError(
+                f"{type(self).__name__} is read-only; '{name}' is not a declared extra")
+        object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} id={getattr(self, 'id', None)}>"
+
+    @classmethod
+    def from_rows(cls, cursor):
+        """Create records for every remaining row, sharing repeated strings."""
+        mapper = cls._row_mapper(tuple(col[0] for col in cursor.description))
+        shared = {}
+        return [mapper(row, shared) for row in cursor]
+
+    @classmethod
+    def _compile_row_mapper(cls, columns):
+        """Build a mapper filling the record's slots straight from the row."""
+        names = set(cls._fields + cls._extras)
+        assigns = []
+        for index, name in enumerate(columns):
+            # First column wins on duplicate names; undeclared columns are dropped
+            if name in names:
+                names.discard(name)
+                assigns.append((index, cls.__dict__[name].__set__,
+                                cls._null_defaults.get(name)))
+        # Fields the query didn't select keep their constructor default
+        constants = [(cls.__dict__[name].__set__, cls._field_defaults[name])
+                     for name in cls._fields if name in names]
+        new = object.__new__
+
+        def mapper(row, shared=None):
+            rec = new(cls)
+            for index, set_value, null_default in assigns:
+                value = row[index]
+                if value is None:
+                    value = null_default
+                elif shared is not None and value.__class__ is str:
+                    value = shared.setdefault(value, value)
+                set_value(rec, value)
+            for set_value, value in constants:
+                set_value(rec, value)
+            return rec
+
+        return mapper
+
+    def to_dict(self):
+        """Convert to dictionary, including any extras that were set."""
+        data = {}
+        for name in self._fields + self._extras:
+            try:
+                data[name] = getattr(self, name)
+            except AttributeError:
+                pass  # Extra never attached
+        return data
+
+
+def record_type(model, extras=(), null_defaults=None):
+    """Build a slotted, read-only record class for a model.
+
+    Fields come from the model constructor. Properties, plain methods and
+    constants are copied over, so a record can stand in for a model
+    instance anywhere it is only read.
+    """
+    params = inspect.signature(model.__init__).parameters
+    fields = tuple(name for name in params if name != 'self')
+    extras = tuple(extras)
+    namespace = {
+        '__slots__': fields + extras,
+        '__module__': model.__module__,
+        '__doc__': f"Read-only {model.__name__} row.",
+        '_fields': fields,
+        '_extras': extras,
+        '_field_defaults': {name: params[name].default for name in fields},
+        '_null_defaults': dict(null_defaults or {}),
+    }
+    for klass in reversed(model.__mro__):
+        if klass in (object, RowMapping, BaseModel):
+            continue
+        for name, attr in vars(klass).items():
+            if name.startswith('_') or name in namespace['__slots__']:
+                continue
+            if isinstance(attr, (classmethod, staticmethod)):
+                continue
+            namespace[name] = attr
+    return type(f"{model.__name__}Record", (Record,), namespace)
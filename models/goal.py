@@ -1,4 +1,7 @@
+from cache import cache, goal_tags
+
 from .base import BaseModel
+from .progress import ProgressEngine
 
 
 class Goal(BaseModel):
@@ -16,7 +19,7 @@ class Goal(BaseModel):
     @classmethod
     def get_by_student(cls, db, student_id):
         cursor = db.execute("SELECT * FROM goals WHERE student_id = ? AND active = 1", (student_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls.from_rows(cursor)
 
     def get_objectives(self, db):
         """Get all objectives for this goal."""
@@ -24,12 +27,7 @@ class Goal(BaseModel):
 
     def get_current_progress(self, db):
         """Calculate current progress for this goal based on all objectives."""
-        objectives = self.get_objectives(db)
-        if not objectives:
-            return 0
-
-        total_progress = sum(obj.get_current_progress(db) for obj in objectives)
-        return round(total_progress / len(objectives), 1)
+        return ProgressEngine.for_goals(db, [self.id]).goal(self.id)
 
     def save(self, db):
         """Save goal to database."""
@@ -45,6 +43,7 @@ class Goal(BaseModel):
             ''', (self.student_id, self.description, self.target_accuracy))
             self.id = cursor.lastrowid
         db.commit()
+        cache.invalidate(f'student:{self.student_id}')
 
     @classmethod
     def create(cls, db, data):
@@ -55,6 +54,7 @@ class Goal(BaseModel):
 
         goal_id = cursor.lastrowid
         db.commit()
+        cache.invalidate(f"student:{data['student_id']}")
         return cls.get_by_id(db, goal_id)
 
 
@@ -76,7 +76,7 @@ class Objective(BaseModel):
     def get_by_goal(cls, db, goal_id):
         """Get all objectives for a specific goal."""
         cursor = db.execute("SELECT * FROM objectives WHERE goal_id = ? AND active = 1", (goal_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls.from_rows(cursor)
 
     @classmethod
     def get_by_student(cls, db, student_id):
@@ -87,7 +87,7 @@ class Objective(BaseModel):
             WHERE g.student_id = ? AND o.active = 1 AND g.active = 1
             ORDER BY g.id, o.id
         ''', (student_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls.from_rows(cursor)
 
     def get_goal(self, db):
         """Get the goal this objective belongs to."""
@@ -95,33 +95,11 @@ class Objective(BaseModel):
 
     def get_current_progress(self, db):
         """Calculate current progress percentage based on recent trial logs."""
-        cursor = db.execute('''
-            SELECT independent, minimal_support, moderate_support, maximal_support, incorrect
-            FROM trial_logs tl
-            JOIN sessions s ON tl.session_id = s.id
-            WHERE tl.objective_id = ? AND s.session_date >= date('now', '-30 days')
-        ''', (self.id,))
-
-        trials = cursor.fetchall()
-        if not trials:
-            return 0
-
-        total_trials = 0
-        total_independent = 0
-
-        for trial in trials:
-            trial_total = sum(trial)
-            total_trials += trial_total
-            total_independent += trial[0]  # independent is first column
-
-        if total_trials == 0:
-            return 0
-
-        return round((total_independent / total_trials) * 100, 1)
+        return ProgressEngine.for_objectives(db, [self.id]).objective(self.id)
 
     def get_trial_logs(self, db, limit=None):
         """Get recent trial logs for this objective."""
-        from .session import TrialLog
+        from .session import TrialLogRecord
 
         query = '''
             SELECT tl.* FROM trial_logs tl
@@ -136,7 +114,7 @@ class Objective(BaseModel):
             params.append(limit)
 
         cursor = db.execute(query, params)
-        return [TrialLog.from_row(row) for row in cursor.fetchall()]
+        return TrialLogRecord.from_rows(cursor)
 
     def save(self, db):
         """Save objective to database."""
@@ -152,6 +130,7 @@ class Objective(BaseModel):
             ''', (self.goal_id, self.description, self.target_percentage, self.notes))
             self.id = cursor.lastrowid
         db.commit()
+        cache.invalidate(*goal_tags(db, self.goal_id))
 
     @classmethod
     def create(cls, db, data):
@@ -163,4 +142,5 @@ class Objective(BaseModel):
 
         objective_id = cursor.lastrowid
         db.commit()
+        cache.invalidate(*goal_tags(db, data['goal_id']))
         return cls.get_by_id(db, objective_id)
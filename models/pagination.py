@@ -0,0 +1,91 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that could not be decoded."""
+
+
+class Page(list):
+    """One page of rows, plus opaque cursors for the neighbouring pages.
+
+    A Page is a plain list, so existing callers that iterate or slice the
+    result keep working. next_cursor/prev_cursor are None at either end.
+    """
+
+    def __init__(self, items=(), next_cursor=None, prev_cursor=None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(direction, key):
+    """Pack a direction ('next' or 'prev') and a row key into a URL-safe token."""
+    raw = json.dumps([direction[0], list(key)], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(token):
+    """Return (direction, key) for a token made by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, key = json.loads(raw)
+        direction = {'n': 'next', 'p': 'prev'}[direction]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
+    if not isinstance(key, list):
+        raise InvalidCursor(f"Invalid cursor: {token!r}")
+    return direction, tuple(key)
+
+
+def keyset_page(db, record, select, order, where='', params=(), limit=20, cursor=None):
+    """Run a keyset-paginated query, newest first.
+
+    ``order`` names the sort columns (e.g. ``('s.session_date', 's.created_at',
+    's.id')``); the last must be unique so every row has a distinct key. The
+    row key is read back from the record attributes of the same names, so
+    the select has to include them. Seeking with a row-value comparison
+    means page 100 costs the same as page 1.
+
+    With limit=None every matching row is returned in one page.
+    """
+    direction, key = decode_cursor(cursor) if cursor else ('next', None)
+    if key is not None and len(key) != len(order):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+    conditions = [where] if where else []
+    params = list(params)
+    if key is not None:
+        columns = ', '.join(order)
+        placeholders = ', '.join('?' * len(order))
+        op = '<' if direction == 'next' else '>'
+        conditions.append(f'({columns}) {op} ({placeholders})')
+        params.extend(key)
+
+    # Walking backwards reads in ascending order and flips the page afterwards
+    sort = 'DESC' if direction == 'next' else 'ASC'
+    query = f"{select} {'WHERE ' + ' AND '.join(conditions) if conditions else ''} " \
+            f"ORDER BY {', '.join(f'{column} {sort}' for column in order)}"
+    if limit is not None:
+        # One extra row tells us whether there is another page this way
+        query += ' LIMIT ?'
+        params.append(limit + 1)
+
+    rows = record.from_rows(db.execute(query, params))
+    more = limit is not None and len(rows) > limit
+    if more:
+        del rows[limit:]
+    if direction == 'prev':
+        rows.reverse()
+    if not rows:
+        return Page()
+
+    names = [column.rsplit('.', 1)[-1] for column in order]
+    first = tuple(getattr(rows[0], name) for name in names)
+    last = tuple(getattr(rows[-1], name) for name in names)
+    # Having come from a cursor, there is always a page back the way we came
+    has_next = more if direction == 'next' else True
+    has_prev = key is not None if direction == 'next' else more
+    return Page(rows,
+                next_cursor=encode_cursor('next', last) if has_next else None,
+                prev_cursor=encode_cursor('prev', first) if has_prev else None)
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+
+class ProgressEngine:
+    """Batch progress calculation for objectives and goals.
+
+    Independence percentages for every objective in scope come from a single
+    grouped query over objective_daily_rollup (one row per objective-day)
+    instead of one query per objective over raw trial logs. Goal progress is the
+    average of its objectives' progress, the same as Goal.get_current_progress.
+    """
+
+    # Trials from sessions in this window count towards current progress
+    WINDOW = '-30 days'
+
+    def __init__(self, rows):
+        self._objectives = {}
+        self._goal_objectives = {}
+        for row in rows:
+            total = row['total_trials'] or 0
+            independent = row['independent'] or 0
+            progress = round((independent / total) * 100, 1) if total else 0
+            self._objectives[row['objective_id']] = progress
+            self._goal_objectives.setdefault(row['goal_id'], []).append(row['objective_id'])
+
+    @classmethod
+    def _query(cls, db, where, params, join=''):
+        cursor = db.execute(f'''
+            SELECT o.id AS objective_id, o.goal_id,
+                   SUM(r.independent) AS independent,
+                   SUM(r.independent + r.minimal_support + r.moderate_support +
+                       r.maximal_support + r.incorrect) AS total_trials
+            FROM objectives o {join}
+            LEFT JOIN objective_daily_rollup r
+                ON r.objective_id = o.id AND r.session_date >= date('now', ?)
+            WHERE {where}
+            GROUP BY o.id
+            ORDER BY o.goal_id, o.id
+        ''', (cls.WINDOW, *params))
+        return cls(cursor.fetchall())
+
+    @classmethod
+    def for_student(cls, db, student_id):
+        """Progress for all active objectives on a student's active goals."""
+        return cls._query(db, 'g.student_id = ? AND g.active = 1 AND o.active = 1', (student_id,),
+                          join='JOIN goals g ON o.goal_id = g.id')
+
+    @classmethod
+    def for_goals(cls, db, goal_ids):
+        """Progress for the active objectives of the given goals."""
+        goal_ids = list(goal_ids)
+        if not goal_ids:
+            return cls([])
+        placeholders = ', '.join('?' * len(goal_ids))
+        return cls._query(db, f'o.active = 1 AND o.goal_id IN ({placeholders})', goal_ids)
+
+    @classmethod
+    def for_objectives(cls, db, objective_ids):
+        """Progress for specific objectives, active or not."""
+        objective_ids = list(objective_ids)
+        if not objective_ids:
+            return cls([])
+        placeholders = ', '.join('?' * len(objective_ids))
+        return cls._query(db, f'o.id IN ({placeholders})', objective_ids)
+
+    def objective(self, objective_id):
+        """Independence percentage for an objective (0 without recent trials)."""
+        return self._objectives.get(objective_id, 0)
+
+    def goal(self, goal_id):
+        """Average progress across the goal's objectives (0 without objectives)."""
+        objective_ids = self._goal_objectives.get(goal_id)
+        if not objective_ids:
+            return 0
+        total_progress = sum(self._objectives[oid] for oid in objective_ids)
+        return round(total_progress / len(objective_ids), 1)
+
+
+class ProgressSeries:
+    """Per-period trial counts and support-level percentages for charts.
+
+    Reads objective_daily_rollup, so a year of weekly points for an
+    objective is one indexed GROUP BY over at most 365 rows per objective.
+    Percentages are cumulative, like TrialLog.percent_correct_up_to: the
+    share of trials correct at or below each support level.
+    """
+
+    # Period start for each bucket; weeks start on Monday
+    BUCKETS = {
+        'day': "r.session_date",
+        'week': "date(r.session_date, '-6 days', 'weekday 1')",
+        'month': "strftime('%Y-%m-01', r.session_date)",
+    }
+
+    LEVELS = ['independent', 'minimal_support', 'moderate_support', 'maximal_support']
+
+    @staticmethod
+    def period_start(bucket, day):
+        """The first day of the period containing day (a date)."""
+        if bucket == 'week':
+            return day - timedelta(days=day.weekday())
+        if bucket == 'month':
+            return day.replace(day=1)
+        return day
+
+    @classmethod
+    def _query(cls, db, bucket, date_from, date_to, where, params, join=''):
+        columns = cls.LEVELS + ['incorrect']
+        total = ' + '.join(f'r.{column}' for column in columns)
+        # Running sums give the cumulative "correct at or below level" counts
+        percents = []
+        for n, level in enumerate(cls.LEVELS, 1):
+            correct = ' + '.join(f'r.{name}' for name in cls.LEVELS[:n])
+            percents.append(f'ROUND(100.0 * SUM({correct}) / NULLIF(SUM({total}), 0), 1) '
+                            f'AS pct_{level}')
+        cursor = db.execute(f'''
+            SELECT r.objective_id, {cls.BUCKETS[bucket]} AS period,
+                   SUM(r.trial_count) AS trial_logs, SUM({total}) AS total_trials,
+                   {', '.join(f'SUM(r.{column}) AS {column}' for column in columns)},
+                   {', '.join(percents)}
+            FROM objective_daily_rollup r {join}
+            WHERE {where} AND r.session_date BETWEEN ? AND ?
+            GROUP BY r.objective_id, period
+            ORDER BY r.objective_id, period
+        ''', (*params, date_from.isoformat(), date_to.isoformat()))
+        return [cls._point(row) for row in cursor]
+
+    @classmethod
+    def _point(cls, row):
+        return {
+            'objective_id': row['objective_id'],
+            'period': row['period'],
+            'trial_logs': row['trial_logs'],
+            'total_trials': row['total_trials'],
+            'counts': {name: row[name] for name in cls.LEVELS + ['incorrect']},
+            'percent_correct_up_to': {level: row[f'pct_{level}'] or 0 for level in cls.LEVELS},
+        }
+
+    @classmethod
+    def for_objective(cls, db, objective_id, bucket, date_from, date_to):
+        """Points for one objective between two dates (inclusive)."""
+        return cls._query(db, bucket, date_from, date_to, 'r.objective_id = ?', (objective_id,))
+
+    @classmethod
+    def for_student(cls, db, student_id, bucket, date_from, date_to):
+        """Points for every active objective on a student's active goals."""
+        return cls._query(db, bucket, date_from, date_to,
+                          'g.student_id = ? AND g.active = 1 AND o.active = 1', (student_id,),
+                          join='JOIN objectives o ON r.objective_id = o.id '
+                               'JOIN goals g ON o.goal_id = g.id')
@@ -0,0 +1,69 @@
+import re
+from html import escape
+
+
+class SearchIndex:
+    """Ranked full-text search over notes and descriptions (search_index, FTS5).
+
+    Indexed: all four SOAP note sections, session notes, trial notes, and
+    objective and goal descriptions. Rows are kept in sync by triggers, see
+    migrations.SEARCH_SOURCES.
+    """
+
+    SNIPPET_TOKENS = 12
+    # Control characters mark hits so the note text can be escaped first
+    _OPEN, _CLOSE = '\x02', '\x03'
+
+    @staticmethod
+    def match_query(text):
+        """Turn free text into an FTS5 query: every word must match, the last as a prefix.
+
+        Words are quoted, so user input can never be parsed as FTS5 syntax.
+        """
+        words = re.findall(r'\w+', text or '')
+        if not words:
+            return None
+        return ' '.join(f'"{word}"' for word in words) + '*'
+
+    @classmethod
+    def search(cls, db, text, student_id=None, date_from=None, date_to=None, kinds=None,
+               limit=20):
+        """Best matches first, each with a highlighted snippet.
+
+        Date filters apply to session dates, so they leave out objectives
+        and goals, which have none.
+        """
+        match = cls.match_query(text)
+        if not match:
+            return []
+        conditions, params = ['search_index MATCH ?'], [match]
+        if student_id:
+            conditions.append('si.student_id = ?')
+            params.append(student_id)
+        if date_from:
+            conditions.append('si.session_date >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append('si.session_date <= ?')
+            params.append(date_to)
+        if kinds:
+            conditions.append(f"si.kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+
+        cursor = db.execute(f'''
+            SELECT si.kind, si.ref_id, si.student_id, si.session_id, si.session_date,
+                   snippet(search_index, 0, char(2), char(3), '…', {cls.SNIPPET_TOKENS}) AS snippet,
+                   st.first_name || ' ' || st.last_name AS student_name
+            FROM search_index si
+            LEFT JOIN students st ON st.id = si.student_id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY si.rank
+            LIMIT ?
+        ''', (*params, limit))
+        hits = []
+        for row in cursor:
+            hit = dict(row)
+            hit['snippet'] = (escape((hit['snippet'] or '').strip())
+                              .replace(cls._OPEN, '<mark>').replace(cls._CLOSE, '</mark>'))
+            hits.append(hit)
+        return hits
@@ -1,11 +1,20 @@
 from datetime import datetime, date, timedelta
 
-from .base import BaseModel
+from cache import cache, session_tags
+
+from .base import BaseModel, record_type
+from .pagination import keyset_page
+
+# Marks a relation that was not eager-loaded (None means "loaded, no row")
+_NOT_LOADED = object()
 
 
 class Session(BaseModel):
     table_name = 'sessions'
 
+    # Keyset for paginated lists; id breaks ties between identical timestamps
+    PAGE_ORDER = ('s.session_date', 's.created_at', 's.id')
+
     def __init__(self, id=None, student_id=None, session_date=None, start_time=None,
                  end_time=None, session_type='Individual', location='', status=None,
                  notes='', created_at=None):
@@ -72,7 +81,7 @@ class Session(BaseModel):
     def get_recent(cls, db, limit=10):
         cursor = db.execute(
             "SELECT * FROM sessions ORDER BY session_date DESC, created_at DESC LIMIT ?", (limit,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return SessionRecord.from_rows(cursor)
 
     @classmethod
     def get_upcoming(cls, db, days=7):
@@ -81,13 +90,18 @@ class Session(BaseModel):
             WHERE session_date BETWEEN date('now') AND date('now', '+{} days')
             ORDER BY session_date ASC
         '''.format(days))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return SessionRecord.from_rows(cursor)
 
     @classmethod
-    def get_by_student(cls, db, student_id):
-        cursor = db.execute(
-            "SELECT * FROM sessions WHERE student_id = ? ORDER BY session_date DESC", (student_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+    def get_by_student(cls, db, student_id, limit=None, cursor=None):
+        """A student's sessions, newest first, as a Page.
+
+        Pass limit to page through the history with next/prev cursors;
+        without one every session is returned.
+        """
+        return keyset_page(db, SessionRecord, 'SELECT s.* FROM sessions s', cls.PAGE_ORDER,
+                           where='s.student_id = ?', params=(student_id,),
+                           limit=limit, cursor=cursor)
 
     @classmethod
     def get_by_date(cls, db, date_obj):
@@ -98,32 +112,98 @@ class Session(BaseModel):
             date_str = str(date_obj)
         cursor = db.execute(
             "SELECT * FROM sessions WHERE session_date = ? ORDER BY start_time", (date_str,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return SessionRecord.from_rows(cursor)
 
     @classmethod
-    def get_pending_soap_notes(cls, db):
-        cursor = db.execute('''
+    def get_pending_soap_notes(cls, db, limit=None, date_from=None, date_to=None):
+        """Completed sessions without a SOAP note, newest first."""
+        query = '''
             SELECT * FROM sessions s
             LEFT JOIN soap_notes sn ON s.id = sn.session_id
             WHERE sn.id IS NULL AND s.status = 'Completed'
-            ORDER BY s.session_date DESC
-        ''')
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        '''
+        params = []
+
+        if date_from:
+            query += " AND s.session_date >= ?"
+            params.append(str(date_from))
+        if date_to:
+            query += " AND s.session_date <= ?"
+            params.append(str(date_to))
+        query += " ORDER BY s.session_date DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        cursor = db.execute(query, params)
+        return SessionRecord.from_rows(cursor)
+
+    INSERT_SQL = '''
+        INSERT INTO sessions (student_id, session_date, start_time, end_time,
+                            session_type, location, notes, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _insert_params(data):
+        return (data['student_id'], data['session_date'], data.get('start_time'),
+                data.get('end_time'), data.get('session_type', 'Individual'),
+                data.get('location'), data.get('notes'), data.get('status'))
 
     @classmethod
     def create(cls, db, data):
-        cursor = db.execute('''
-            INSERT INTO sessions (student_id, session_date, start_time, end_time,
-                                session_type, location, notes, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (data['student_id'], data['session_date'], data.get('start_time'),
-              data.get('end_time'), data.get('session_type', 'Individual'),
-              data.get('location'), data.get('notes'), data.get('status')))
+        cursor = db.execute(cls.INSERT_SQL, cls._insert_params(data))
 
         session_id = cursor.lastrowid
         db.commit()
+        cache.invalidate('dashboard', f"student:{data['student_id']}", f"date:{data['session_date']}")
         return cls.get_by_id(db, session_id)
 
+    @classmethod
+    def bulk_create(cls, db, sessions):
+        """Create many sessions in one transaction.
+
+        A session is skipped when the student already has a session (or an
+        earlier one in the same batch) on that date at that start time.
+        Returns {'created': n, 'skipped': n, 'ids': [...]}.
+        """
+        sessions = [dict(data, student_id=int(data['student_id'])) for data in sessions]
+        if not sessions:
+            return {'created': 0, 'skipped': 0, 'ids': []}
+
+        # IMMEDIATE so the duplicate check and the inserts see the same data
+        # and the AUTOINCREMENT ids are consecutive
+        if not db.in_transaction:
+            db.execute('BEGIN IMMEDIATE')
+        try:
+            dates = sorted({data['session_date'] for data in sessions})
+            placeholders = ', '.join('?' * len(dates))
+            taken = {tuple(row) for row in db.execute(f'''
+                SELECT student_id, session_date, start_time FROM sessions
+                WHERE session_date IN ({placeholders})
+            ''', dates)}
+
+            params = []
+            for data in sessions:
+                slot = (data['student_id'], data['session_date'], data.get('start_time'))
+                if slot in taken:
+                    continue
+                taken.add(slot)
+                params.append(cls._insert_params(data))
+
+            ids = []
+            if params:
+                db.executemany(cls.INSERT_SQL, params)
+                last_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+                ids = list(range(last_id - len(params) + 1, last_id + 1))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        if ids:
+            cache.invalidate('dashboard', *session_tags(db, ids))
+        return {'created': len(ids), 'skipped': len(sessions) - len(ids), 'ids': ids}
+
 
     @classmethod
     def get_by_date_with_student_info(cls, db, date_str):
@@ -138,34 +218,31 @@ class Session(BaseModel):
             ORDER BY s.start_time, s.created_at
         ''', (date_str,))
 
-        sessions = []
-        for row in cursor.fetchall():
-            session = cls.from_row(row)
-            session.student_name = f"{row['first_name']} {row['last_name']}"
-            session.has_soap_note = bool(row['has_soap_note'])
-            sessions.append(session)
+        sessions = SessionRecord.from_rows(cursor)
+        for session in sessions:
+            session.student_name = f"{session.first_name} {session.last_name}"
+            session.has_soap_note = bool(session.has_soap_note)
         return sessions
 
 
     @classmethod
-    def get_recent_with_student_info(cls, db, limit=20):
-        """Get recent sessions with student names and SOAP note status."""
-        cursor = db.execute('''
+    def get_recent_with_student_info(cls, db, limit=20, cursor=None, student_id=None):
+        """Get recent sessions with student names and SOAP note status.
+
+        Returns a Page; pass its next_cursor/prev_cursor back to move through
+        older or newer sessions. student_id narrows the list to one student.
+        """
+        where, params = ('s.student_id = ?', (student_id,)) if student_id else ('', ())
+        sessions = keyset_page(db, SessionRecord, '''
             SELECT s.*, st.first_name, st.last_name,
                 CASE WHEN sn.id IS NOT NULL THEN 1 ELSE 0 END as has_soap_note
             FROM sessions s 
             JOIN students st ON s.student_id = st.id 
             LEFT JOIN soap_notes sn ON s.id = sn.session_id
-            ORDER BY s.session_date DESC, s.created_at DESC 
-            LIMIT ?
-        ''', (limit,))
-
-        sessions = []
-        for row in cursor.fetchall():
-            session = cls.from_row(row)
-            session.student_name = f"{row['first_name']} {row['last_name']}"
-            session.has_soap_note = bool(row['has_soap_note'])
-            sessions.append(session)
+        ''', cls.PAGE_ORDER, where=where, params=params, limit=limit, cursor=cursor)
+        for session in sessions:
+            session.student_name = f"{session.first_name} {session.last_name}"
+            session.has_soap_note = bool(session.has_soap_note)
         return sessions
 
 
@@ -224,12 +301,18 @@ class TrialLog(BaseModel):
     def get_objective(self, db):
         """Get the objective this trial log is for."""
         if self.objective_id:
+            objective = getattr(self, 'objective', _NOT_LOADED)
+            if objective is not _NOT_LOADED:
+                return objective
             from .goal import Objective
             return Objective.get_by_id(db, self.objective_id)
         return None
 
     def get_goal(self, db):
         """Get the goal (either directly or through objective)."""
+        goal = getattr(self, 'goal', _NOT_LOADED)
+        if goal is not _NOT_LOADED:
+            return goal
         if self.objective_id:
             objective = self.get_objective(db)
             return objective.get_goal(db) if objective else None
@@ -242,14 +325,52 @@ class TrialLog(BaseModel):
         """Get the session this trial log belongs to."""
         return Session.get_by_id(db, self.session_id)
 
+    # Relations list queries can load up front with with_=(...)
+    RELATIONS = ('objective', 'goal')
+
     @classmethod
-    def get_by_session(cls, db, session_id):
+    def _load_related(cls, db, trials, with_):
+        """Attach objectives and/or goals to trials, one IN (...) query each.
+
+        Sets trial.objective, trial.goal and trial.objective_description;
+        get_objective()/get_goal() then return the loaded rows without
+        querying again.
+        """
+        with_ = set(with_)
+        unknown = with_ - set(cls.RELATIONS)
+        if unknown:
+            raise ValueError(f"Unknown trial log relation(s): {', '.join(sorted(unknown))}")
+        if not with_ or not trials:
+            return trials
+
+        from .goal import Goal, Objective
+        objectives = Objective.get_many(db, (trial.objective_id for trial in trials))
+        goals = {}
+        if 'goal' in with_:
+            # Same rule as get_goal(): through the objective, else the legacy goal_id
+            goals = Goal.get_many(db, [objective.goal_id for objective in objectives.values()] +
+                                  [trial.goal_id for trial in trials if not trial.objective_id])
+
+        for trial in trials:
+            objective = objectives.get(trial.objective_id) if trial.objective_id else None
+            trial.objective_description = objective.description if objective else None
+            if 'objective' in with_:
+                trial.objective = objective
+            if 'goal' in with_:
+                if trial.objective_id:
+                    trial.goal = goals.get(objective.goal_id) if objective else None
+                else:
+                    trial.goal = goals.get(trial.goal_id)
+        return trials
+
+    @classmethod
+    def get_by_session(cls, db, session_id, with_=()):
         cursor = db.execute(
             "SELECT * FROM trial_logs WHERE session_id = ?", (session_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls._load_related(db, TrialLogRecord.from_rows(cursor), with_)
 
     @classmethod
-    def get_recent_by_student(cls, db, student_id, limit=10):
+    def get_recent_by_student(cls, db, student_id, limit=10, with_=()):
         cursor = db.execute('''
             SELECT tl.* FROM trial_logs tl
             JOIN sessions s ON tl.session_id = s.id
@@ -257,10 +378,10 @@ class TrialLog(BaseModel):
             ORDER BY s.session_date DESC, tl.created_at DESC
             LIMIT ?
         ''', (student_id, limit))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls._load_related(db, TrialLogRecord.from_rows(cursor), with_)
 
     @classmethod
-    def get_by_objective(cls, db, objective_id, limit=None):
+    def get_by_objective(cls, db, objective_id, limit=None, with_=()):
         """Get trial logs for a specific objective."""
         query = '''
             SELECT tl.* FROM trial_logs tl
@@ -275,21 +396,58 @@ class TrialLog(BaseModel):
             params.append(limit)
 
         cursor = db.execute(query, params)
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls._load_related(db, TrialLogRecord.from_rows(cursor), with_)
+
+    @staticmethod
+    def _insert_params(session_id, data):
+        return (session_id, data.get('objective_id'), data.get('goal_id'),
+                data.get('independent', 0), data.get('minimal_support', 0),
+                data.get('moderate_support', 0), data.get('maximal_support', 0),
+                data.get('incorrect', 0), data.get('notes', ''))
+
+    INSERT_SQL = '''
+        INSERT INTO trial_logs (session_id, objective_id, goal_id, independent,
+                              minimal_support, moderate_support, maximal_support,
+                              incorrect, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
 
     @classmethod
     def create(cls, db, data):
-        cursor = db.execute('''
-            INSERT INTO trial_logs (session_id, objective_id, goal_id, independent,
-                                  minimal_support, moderate_support, maximal_support,
-                                  incorrect, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (data['session_id'], data.get('objective_id'), data.get('goal_id'),
-              data.get('independent', 0), data.get('minimal_support', 0),
-              data.get('moderate_support', 0), data.get('maximal_support', 0),
-              data.get('incorrect', 0), data.get('notes', '')))
+        cursor = db.execute(cls.INSERT_SQL, cls._insert_params(data['session_id'], data))
 
         trial_id = cursor.lastrowid
         db.commit()
+        cache.invalidate(*session_tags(db, [data['session_id']], dates=False))
         return cls.get_by_id(db, trial_id)
 
+    @classmethod
+    def bulk_create(cls, db, session_id, trials):
+        """Insert all trials for a session in one transaction.
+
+        Either every trial is written or none are. Returns the new ids.
+        """
+        params = [cls._insert_params(session_id, trial) for trial in trials]
+        if not params:
+            return []
+        # IMMEDIATE takes the write lock up front, so the AUTOINCREMENT ids
+        # handed out by executemany are consecutive
+        if not db.in_transaction:
+            db.execute('BEGIN IMMEDIATE')
+        try:
+            db.executemany(cls.INSERT_SQL, params)
+            last_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        cache.invalidate(*session_tags(db, [session_id], dates=False))
+        return list(range(last_id - len(params) + 1, last_id + 1))
+
+
+# Read-only rows for list queries; extras are the attributes callers attach
+SessionRecord = record_type(
+    Session, extras=('student_name', 'has_soap_note', 'first_name', 'last_name'))
+TrialLogRecord = record_type(
+    TrialLog, extras=('objective_description', 'objective', 'goal'),
+    null_defaults={level: 0 for level in TrialLog.SUPPORT_LEVELS + ['incorrect']})
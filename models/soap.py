@@ -1,9 +1,14 @@
-from .base import BaseModel
+from cache import cache, session_tags
+
+from .base import BaseModel, record_type
 
 
 class SOAPNote(BaseModel):
     table_name = 'soap_notes'
 
+    # Sessions per IN (...) list when drafting in bulk
+    DRAFT_CHUNK = 500
+
     def __init__(self, id=None, session_id=None, subjective='', objective='',
                  assessment='', plan='', created_at=None, updated_at=None):
         self.id = id
@@ -16,6 +21,9 @@ class SOAPNote(BaseModel):
         self.updated_at = updated_at
 
     def get_session(self, db):
+        session = getattr(self, 'session', None)
+        if session is not None:
+            return session
         from .session import Session
         return Session.get_by_id(db, self.session_id)
 
@@ -26,30 +34,70 @@ class SOAPNote(BaseModel):
         return cls.from_row(row) if row else None
 
     @classmethod
-    def get_by_student(cls, db, student_id):
+    def get_by_student(cls, db, student_id, with_session=False):
+        """A student's SOAP notes, newest session first.
+
+        with_session=True also attaches each note's session (and
+        session_date) from a single batched lookup.
+        """
         cursor = db.execute('''
             SELECT sn.* FROM soap_notes sn
             JOIN sessions s ON sn.session_id = s.id
             WHERE s.student_id = ?
             ORDER BY s.session_date DESC
         ''', (student_id,))
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        notes = SOAPNoteRecord.from_rows(cursor)
+        if with_session and notes:
+            from .session import Session
+            sessions = Session.get_many(db, (note.session_id for note in notes))
+            for note in notes:
+                note.session = sessions.get(note.session_id)
+                note.session_date = note.session.session_date if note.session else None
+        return notes
 
     @classmethod
     def generate_from_session(cls, db, session):
         """Auto-generate basic SOAP note from session data."""
         from .session import TrialLog
 
-        trials = TrialLog.get_by_session(db, session.id)
+        trials = TrialLog.get_by_session(db, session.id, with_=('objective',))
+        return cls._draft(session, trials)
+
+    @classmethod
+    def generate_for_sessions(cls, db, sessions):
+        """Draft notes for many sessions from one trial query per chunk.
+
+        Returns unsaved SOAPNote instances in the order of ``sessions``.
+        """
+        from .session import TrialLogRecord
+
+        sessions = list(sessions)
+        trials_by_session = {session.id: [] for session in sessions}
+        ids = list(trials_by_session)
+        for start in range(0, len(ids), cls.DRAFT_CHUNK):
+            chunk = ids[start:start + cls.DRAFT_CHUNK]
+            cursor = db.execute(f'''
+                SELECT tl.*, o.description AS objective_description
+                FROM trial_logs tl
+                LEFT JOIN objectives o ON o.id = tl.objective_id
+                WHERE tl.session_id IN ({', '.join('?' * len(chunk))})
+                ORDER BY tl.session_id, tl.id
+            ''', chunk)
+            for trial in TrialLogRecord.from_rows(cursor):
+                trials_by_session[trial.session_id].append(trial)
+        return [cls._draft(session, trials_by_session[session.id]) for session in sessions]
 
-        subjective = f"Student participated in {session.session_type.lower()} therapy session."
+    @classmethod
+    def _draft(cls, session, trials):
+        """Render a draft note; trials need objective_description loaded."""
+        session_type = (session.session_type or 'Individual').lower()
+        subjective = f"Student participated in {session_type} therapy session."
 
         objective = "Trial data collected:\n"
         for trial in trials:
             if trial.objective_id:
-                objective_obj = trial.get_objective(db)
-                if objective_obj:
-                    objective += f"- {objective_obj.description}: {trial.independence_percentage}% independent\n"
+                if trial.objective_description is not None:
+                    objective += f"- {trial.objective_description}: {trial.independence_percentage}% independent\n"
             else:
                 objective += f"- {trial.total_trials} trials, {trial.independence_percentage}% independence\n"
 
@@ -67,9 +115,16 @@ class SOAPNote(BaseModel):
             plan=plan
         )
 
+    @staticmethod
+    def _invalidate_cache(db, session_id):
+        # Pending-note counts, the student's notes and the planner all change
+        cache.invalidate('dashboard', *session_tags(db, [session_id]))
+
     @classmethod
     def create_or_update(cls, db, data):
         existing = cls.get_by_session(db, data['session_id'])
+        # A saved note supersedes any stored draft; committed together below
+        db.execute('DELETE FROM soap_drafts WHERE session_id = ?', (data['session_id'],))
 
         if existing:
             db.execute('''
@@ -79,6 +134,7 @@ class SOAPNote(BaseModel):
             ''', (data['subjective'], data['objective'], data['assessment'],
                   data['plan'], data['session_id']))
             db.commit()
+            cls._invalidate_cache(db, data['session_id'])
             return cls.get_by_session(db, data['session_id'])
         else:
             cursor = db.execute('''
@@ -89,4 +145,91 @@ class SOAPNote(BaseModel):
 
             soap_id = cursor.lastrowid
             db.commit()
+            cls._invalidate_cache(db, data['session_id'])
             return cls.get_by_id(db, soap_id)
+
+
+class SOAPDraft(BaseModel):
+    """An unsaved, generated SOAP note waiting for review (one per session).
+
+    Triggers on trial_logs delete a session's draft when its trials change,
+    so a draft never shows trial data older than the session's.
+    """
+    table_name = 'soap_drafts'
+
+    def __init__(self, id=None, session_id=None, subjective='', objective='',
+                 assessment='', plan='', created_at=None):
+        self.id = id
+        self.session_id = session_id
+        self.subjective = subjective
+        self.objective = objective
+        self.assessment = assessment
+        self.plan = plan
+        self.created_at = created_at
+
+    @classmethod
+    def get_by_session(cls, db, session_id):
+        cursor = db.execute("SELECT * FROM soap_drafts WHERE session_id = ?", (session_id,))
+        row = cursor.fetchone()
+        return cls.from_row(row) if row else None
+
+    @classmethod
+    def get_all(cls, db):
+        """Drafts awaiting review, newest session first, with student names."""
+        cursor = db.execute('''
+            SELECT d.*, s.session_date, st.first_name || ' ' || st.last_name AS student_name
+            FROM soap_drafts d
+            JOIN sessions s ON d.session_id = s.id
+            JOIN students st ON s.student_id = st.id
+            ORDER BY s.session_date DESC, d.session_id DESC
+        ''')
+        return SOAPDraftRecord.from_rows(cursor)
+
+    @classmethod
+    def generate(cls, db, date_from=None, date_to=None, overwrite=False):
+        """Draft notes for every completed session without one, in one pass.
+
+        Sessions that already have a draft are left alone unless overwrite
+        is set. Returns {'created': n, 'skipped': n, 'session_ids': [...]}.
+        """
+        from .session import Session
+
+        sessions = Session.get_pending_soap_notes(db, date_from=date_from, date_to=date_to)
+        if not overwrite and sessions:
+            drafted = cls._drafted_sessions(db, [session.id for session in sessions])
+            pending = [session for session in sessions if session.id not in drafted]
+        else:
+            pending = sessions
+        drafts = SOAPNote.generate_for_sessions(db, pending)
+        if drafts:
+            db.executemany('''
+                INSERT INTO soap_drafts (session_id, subjective, objective, assessment, plan)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (session_id) DO UPDATE SET
+                    subjective = excluded.subjective, objective = excluded.objective,
+                    assessment = excluded.assessment, plan = excluded.plan,
+                    created_at = CURRENT_TIMESTAMP
+            ''', [(d.session_id, d.subjective, d.objective, d.assessment, d.plan) for d in drafts])
+            db.commit()
+        return {'created': len(drafts), 'skipped': len(sessions) - len(drafts),
+                'session_ids': [d.session_id for d in drafts]}
+
+    @staticmethod
+    def _drafted_sessions(db, session_ids):
+        drafted = set()
+        for start in range(0, len(session_ids), SOAPNote.DRAFT_CHUNK):
+            chunk = session_ids[start:start + SOAPNote.DRAFT_CHUNK]
+            drafted.update(row[0] for row in db.execute(
+                f"SELECT session_id FROM soap_drafts WHERE session_id IN ({', '.join('?' * len(chunk))})",
+                chunk))
+        return drafted
+
+    @classmethod
+    def discard(cls, db, session_id):
+        db.execute("DELETE FROM soap_drafts WHERE session_id = ?", (session_id,))
+        db.commit()
+
+
+# Read-only rows for list queries; extras are the attributes callers attach
+SOAPNoteRecord = record_type(SOAPNote, extras=('session_date', 'session'))
+SOAPDraftRecord = record_type(SOAPDraft, extras=('session_date', 'student_name'))
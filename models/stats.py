@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+
+class DashboardStats:
+    """Dashboard counters computed by one aggregate SQL statement.
+
+    Every counter is an indexed COUNT, so the cost stays flat as sessions
+    accumulate across school years.
+    """
+
+    def __init__(self, total_students=0, sessions_this_week=0, pending_soap_notes=0,
+                 upcoming_sessions=0):
+        self.total_students = total_students
+        self.sessions_this_week = sessions_this_week
+        self.pending_soap_notes = pending_soap_notes
+        self.upcoming_sessions = upcoming_sessions
+
+    @classmethod
+    def load(cls, db, today=None, upcoming_days=7):
+        today = today or date.today()
+        week_start = today - timedelta(days=today.weekday())
+        week_end = week_start + timedelta(days=6)
+        upcoming_end = today + timedelta(days=upcoming_days)
+
+        row = db.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM students WHERE active = 1) AS total_students,
+                (SELECT COUNT(*) FROM sessions
+                 WHERE session_date BETWEEN :week_start AND :week_end) AS sessions_this_week,
+                (SELECT COUNT(*) FROM sessions s
+                 WHERE s.status = 'Completed'
+                   AND NOT EXISTS (SELECT 1 FROM soap_notes sn WHERE sn.session_id = s.id)
+                ) AS pending_soap_notes,
+                (SELECT COUNT(*) FROM sessions
+                 WHERE session_date BETWEEN :today AND :upcoming_end) AS upcoming_sessions
+        ''', {'week_start': week_start.isoformat(), 'week_end': week_end.isoformat(),
+              'today': today.isoformat(), 'upcoming_end': upcoming_end.isoformat()}).fetchone()
+        return cls(**dict(row))
+
+    def to_dict(self):
+        return dict(self.__dict__)
@@ -1,3 +1,5 @@
+from cache import cache
+
 from .base import BaseModel
 
 
@@ -36,7 +38,7 @@ class Student(BaseModel):
     @classmethod
     def get_all(cls, db):
         cursor = db.execute("SELECT * FROM students WHERE active = 1 ORDER BY last_name, first_name")
-        return [cls.from_row(row) for row in cursor.fetchall()]
+        return cls.from_rows(cursor)
 
     @classmethod
     def get_active(cls, db):
@@ -53,4 +55,5 @@ class Student(BaseModel):
 
         student_id = cursor.lastrowid
         db.commit()
+        cache.invalidate('students', 'dashboard', f'student:{student_id}')
         return cls.get_by_id(db, student_id)
@@ -0,0 +1,72 @@
+from .goal import Goal
+from .progress import ProgressEngine
+from .student import Student
+
+
+class TrackingBootstrap:
+    """Everything the live tracking page needs for a set of students.
+
+    Three set-based queries regardless of how many students, goals and
+    objectives there are: the students, their active goals, and their
+    active objectives with current progress (same window as
+    ProgressEngine).
+    """
+
+    @staticmethod
+    def _placeholders(ids):
+        return ', '.join('?' * len(ids))
+
+    @classmethod
+    def load(cls, db, student_ids):
+        """Students in the order given, each with goals and their objectives."""
+        student_ids = list(dict.fromkeys(student_ids))
+        if not student_ids:
+            return {'students': []}
+        placeholders = cls._placeholders(student_ids)
+
+        students = {student.id: student for student in Student.from_rows(db.execute(
+            f'SELECT * FROM students WHERE id IN ({placeholders})', student_ids))}
+        goals = Goal.from_rows(db.execute(f'''
+            SELECT * FROM goals WHERE student_id IN ({placeholders}) AND active = 1
+            ORDER BY student_id, id
+        ''', student_ids))
+        objective_rows = db.execute(f'''
+            SELECT o.id AS objective_id, o.goal_id, o.description, o.target_percentage,
+                   SUM(r.independent) AS independent,
+                   SUM(r.independent + r.minimal_support + r.moderate_support +
+                       r.maximal_support + r.incorrect) AS total_trials
+            FROM goals g
+            JOIN objectives o ON o.goal_id = g.id
+            LEFT JOIN objective_daily_rollup r
+                ON r.objective_id = o.id AND r.session_date >= date('now', ?)
+            WHERE g.student_id IN ({placeholders}) AND g.active = 1 AND o.active = 1
+            GROUP BY o.id
+            ORDER BY o.goal_id, o.id
+        ''', (ProgressEngine.WINDOW, *student_ids)).fetchall()
+        progress = ProgressEngine(objective_rows)
+
+        objectives_by_goal = {}
+        for row in objective_rows:
+            objectives_by_goal.setdefault(row['goal_id'], []).append({
+                'id': row['objective_id'],
+                'goal_id': row['goal_id'],
+                'description': row['description'],
+                'target_percentage': row['target_percentage'],
+                'current_progress': progress.objective(row['objective_id']),
+            })
+        goals_by_student = {}
+        for goal in goals:
+            goals_by_student.setdefault(goal.student_id, []).append({
+                'id': goal.id,
+                'student_id': goal.student_id,
+                'description': goal.description,
+                'target_accuracy': goal.target_accuracy,
+                'current_progress': progress.goal(goal.id),
+                'objectives': objectives_by_goal.get(goal.id, []),
+            })
+
+        return {'students': [{
+            'id': student_id,
+            'name': students[student_id].display_name,
+            'goals': goals_by_student.get(student_id, []),
+        } for student_id in student_ids if student_id in students]}
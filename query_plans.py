@@ -0,0 +1,164 @@
+"""
+Query plan regression check
+
+Runs every model read query against a seeded in-memory database, captures
+the SQL actually executed, and inspects EXPLAIN QUERY PLAN for each
+statement. A plan step that scans a whole table without an index is
+reported as a failure.
+
+Usage:
+    flask --app app admin check-query-plans
+"""
+
+from datetime import date, timedelta
+
+from database import _connect
+from export import iter_trial_rows
+from migrations import migrate
+from models import (Student, Goal, Objective, Session, TrialLog, SOAPNote, SOAPDraft,
+                    ProgressEngine, ProgressSeries, DashboardStats, SearchIndex,
+                    TrackingBootstrap)
+
+
+def seed(db, students=20, sessions_per_student=15):
+    """Fill an empty database with a small but realistic caseload."""
+    start = date.today() - timedelta(days=sessions_per_student * 7)
+    for s in range(students):
+        student_id = db.execute(
+            'INSERT INTO students (first_name, last_name) VALUES (?, ?)',
+            (f'First{s}', f'Last{s}')).lastrowid
+        objective_ids = []
+        for g in range(3):
+            goal_id = db.execute(
+                'INSERT INTO goals (student_id, description) VALUES (?, ?)',
+                (student_id, f'Goal {g}')).lastrowid
+            for o in range(3):
+                objective_ids.append(db.execute(
+                    'INSERT INTO objectives (goal_id, description) VALUES (?, ?)',
+                    (goal_id, f'Objective {o}')).lastrowid)
+        for n in range(sessions_per_student):
+            session_id = db.execute('''
+                INSERT INTO sessions (student_id, session_date, start_time, end_time, status)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (student_id, (start + timedelta(days=n * 7)).isoformat(),
+                  f'{8 + s % 8:02d}:00', f'{8 + s % 8:02d}:30', 'Completed')).lastrowid
+            for objective_id in objective_ids[n % 3::3]:
+                db.execute('''
+                    INSERT INTO trial_logs (session_id, objective_id, independent,
+                                            minimal_support, incorrect)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (session_id, objective_id, n % 5, n % 3, 1))
+            if n % 2:
+                db.execute('INSERT INTO soap_notes (session_id, subjective) VALUES (?, ?)',
+                           (session_id, 'Seeded'))
+    db.commit()
+
+
+def exercise_models(db):
+    """Call every model read query once."""
+    today = date.today()
+    session = Session.get_recent(db, limit=1)[0]
+    objective = Objective.get_by_student(db, session.student_id)[0]
+    goal = Goal.get_by_id(db, objective.goal_id)
+    trial = TrialLog.get_by_session(db, session.id)[0]
+
+    Student.get_all(db)
+    Student.get_by_id(db, session.student_id)
+    Goal.get_by_student(db, session.student_id)
+    goal.get_objectives(db)
+    goal.get_current_progress(db)
+    Objective.get_by_goal(db, goal.id)
+    objective.get_goal(db)
+    objective.get_current_progress(db)
+    objective.get_trial_logs(db, limit=10)
+    ProgressEngine.for_student(db, session.student_id)
+    ProgressEngine.for_goals(db, [goal.id])
+    ProgressEngine.for_objectives(db, [objective.id])
+    Session.get_by_id(db, session.id)
+    Session.get_upcoming(db, days=7)
+    Session.get_by_student(db, session.student_id)
+    Session.get_by_date(db, today)
+    Session.get_pending_soap_notes(db)
+    Session.get_by_date_with_student_info(db, session.session_date)
+    Session.get_recent_with_student_info(db, limit=20)
+    session.get_student(db)
+    session.get_trial_logs(db)
+    TrialLog.get_by_id(db, trial.id)
+    TrialLog.get_recent_by_student(db, session.student_id, limit=10)
+    TrialLog.get_by_objective(db, objective.id, limit=10)
+    trial.get_objective(db)
+    trial.get_goal(db)
+    trial.get_session(db)
+    SOAPNote.get_by_session(db, session.id)
+    SOAPNote.get_by_student(db, session.student_id)
+    SOAPNote.get_by_student(db, session.student_id, with_session=True)
+    TrialLog.get_by_session(db, session.id, with_=TrialLog.RELATIONS)
+    TrialLog.get_recent_by_student(db, session.student_id, limit=10, with_=TrialLog.RELATIONS)
+    TrialLog.get_by_objective(db, objective.id, limit=10, with_=TrialLog.RELATIONS)
+    DashboardStats.load(db)
+    Session.get_pending_soap_notes(db, limit=5)
+
+    year_ago = today - timedelta(days=365)
+    for bucket in ProgressSeries.BUCKETS:
+        ProgressSeries.for_objective(db, objective.id, bucket, year_ago, today)
+        ProgressSeries.for_student(db, session.student_id, bucket, year_ago, today)
+
+    Session.get_pending_soap_notes(db, date_from=session.session_date, date_to=today)
+    SOAPDraft.generate(db)
+    SOAPDraft.get_all(db)
+    SOAPDraft.get_by_session(db, session.id)
+
+    SearchIndex.search(db, 'objective', student_id=session.student_id)
+    SearchIndex.search(db, 'seeded', date_from=session.session_date, kinds=['soap'])
+    TrackingBootstrap.load(db, [session.student_id, session.student_id + 1])
+
+    # Streaming export with each filter
+    for filters in ({'student_id': session.student_id}, {'objective_id': objective.id},
+                    {'date_from': session.session_date, 'date_to': today.isoformat()}):
+        for _ in iter_trial_rows(db, **filters):
+            break
+
+    # Keyset pages in both directions
+    page = Session.get_recent_with_student_info(db, limit=5)
+    page = Session.get_recent_with_student_info(db, limit=5, cursor=page.next_cursor)
+    Session.get_recent_with_student_info(db, limit=5, cursor=page.prev_cursor)
+    page = Session.get_recent_with_student_info(db, limit=5, student_id=session.student_id)
+    Session.get_recent_with_student_info(db, limit=5, cursor=page.next_cursor,
+                                         student_id=session.student_id)
+    page = Session.get_by_student(db, session.student_id, limit=5)
+    page = Session.get_by_student(db, session.student_id, limit=5, cursor=page.next_cursor)
+    Session.get_by_student(db, session.student_id, limit=5, cursor=page.prev_cursor)
+
+
+def _full_scans(db, sql):
+    """Plan steps that read an entire table without an index."""
+    return [row[3] for row in db.execute(f'EXPLAIN QUERY PLAN {sql}')
+            if row[3].startswith('SCAN ') and 'USING' not in row[3]
+            and row[3] != 'SCAN CONSTANT ROW' and not _fts_match(row[3])]
+
+
+def _fts_match(step):
+    # FTS5 reports a MATCH lookup as "SCAN x VIRTUAL TABLE INDEX n:M..."
+    return 'VIRTUAL TABLE INDEX' in step and ':M' in step
+
+
+def check_query_plans():
+    """Return [(sql, [plan steps])] for every model query that full-scans."""
+    db = _connect(':memory:')
+    migrate(db)
+    seed(db)
+
+    statements = []
+    db.set_trace_callback(statements.append)
+    exercise_models(db)
+    db.set_trace_callback(None)
+
+    failures = []
+    for sql in dict.fromkeys(statements):
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        scans = _full_scans(db, sql)
+        if scans:
+            failures.append((sql, scans))
+    db.close()
+    return failures
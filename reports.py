@@ -0,0 +1,288 @@
+"""
+Caseload progress reports
+
+Builds one self-contained, printable HTML report per student: goals and
+objectives with independence percentages for the reporting period next
+to the previous period of the same length, a month-by-month breakdown,
+attendance, and excerpts from recent SOAP notes.
+
+Students are fanned out across a ProcessPoolExecutor. Each worker
+process opens its own read-only connection (``mode=ro``) and renders
+whole reports, so the parent only writes finished files and the work
+scales with the number of cores.
+
+Usage:
+    flask --app app admin progress-reports --from 2025-01-01 --to 2025-03-31 --output q3.zip
+    POST /api/jobs {"kind": "progress-reports", "params": {"date_from": "2025-01-01"}}
+"""
+
+import multiprocessing
+import os
+import re
+import sqlite3
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from importer import IMPORTED_STATUS
+from models import Goal, Objective, ProgressSeries, Student
+
+# Reporting period when no start date is given
+DEFAULT_PERIOD_DAYS = 90
+SOAP_EXCERPTS = 3
+EXCERPT_CHARS = 300
+TEMPLATE = 'progress_report.html'
+
+# Session statuses that count as attended; imported sessions carry trial data
+COMPLETED_STATUSES = ('Completed', 'Completed Makeup Session', IMPORTED_STATUS)
+# 'Missed - No Makeup Required', 'Missed - Makeup Required'
+MISSED_PREFIX = 'Missed'
+
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+# Per-process state, set up by _init_worker
+_db = None
+_env = None
+
+
+def report_period(date_from=None, date_to=None):
+    """(date_from, date_to, previous_from, previous_to) as dates.
+
+    The previous period is the same number of days ending the day before
+    date_from.
+    """
+    date_to = date.fromisoformat(str(date_to)) if date_to else date.today()
+    date_from = (date.fromisoformat(str(date_from)) if date_from
+                 else date_to - timedelta(days=DEFAULT_PERIOD_DAYS - 1))
+    if date_from > date_to:
+        raise ValueError('date_from is after date_to')
+    previous_to = date_from - timedelta(days=1)
+    return date_from, date_to, previous_to - (date_to - date_from), previous_to
+
+
+def connect_readonly(path):
+    conn = sqlite3.connect(f'file:{os.path.abspath(path)}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _environment():
+    return Environment(loader=FileSystemLoader(_TEMPLATE_DIR), autoescape=select_autoescape())
+
+
+def _init_worker(db_path):
+    global _db, _env
+    _db = connect_readonly(db_path)
+    _env = _environment()
+
+
+def _objective_periods(db, student_id, period):
+    """objective_id -> {'current': (independent, total), 'previous': (...)}."""
+    date_from, date_to, previous_from, _ = period
+    cursor = db.execute('''
+        SELECT r.objective_id, r.session_date >= ? AS current,
+               SUM(r.independent) AS independent,
+               SUM(r.independent + r.minimal_support + r.moderate_support +
+                   r.maximal_support + r.incorrect) AS total
+        FROM goals g
+        JOIN objectives o ON o.goal_id = g.id
+        JOIN objective_daily_rollup r ON r.objective_id = o.id
+        WHERE g.student_id = ? AND g.active = 1 AND o.active = 1
+              AND r.session_date BETWEEN ? AND ?
+        GROUP BY r.objective_id, current
+    ''', (date_from.isoformat(), student_id, previous_from.isoformat(), date_to.isoformat()))
+    periods = {}
+    for row in cursor:
+        key = 'current' if row['current'] else 'previous'
+        periods.setdefault(row['objective_id'], {})[key] = (row['independent'], row['total'])
+    return periods
+
+
+def _percent(counts):
+    if not counts or not counts[1]:
+        return None
+    return round(100.0 * counts[0] / counts[1], 1)
+
+
+def _attendance(db, student_id, date_from, date_to):
+    # Planned sessions without a status haven't happened yet
+    counts = dict(db.execute('''
+        SELECT status, COUNT(*) FROM sessions
+        WHERE student_id = ? AND session_date BETWEEN ? AND ? AND status IS NOT NULL
+        GROUP BY 1
+    ''', (student_id, date_from.isoformat(), date_to.isoformat())).fetchall())
+    completed = sum(counts.get(status, 0) for status in COMPLETED_STATUSES)
+    missed = {status: count for status, count in counts.items()
+              if status.startswith(MISSED_PREFIX)}
+    held_or_missed = completed + sum(missed.values())
+    return {
+        'by_status': counts,
+        'completed': completed,
+        'missed': missed,
+        'rate': round(100.0 * completed / held_or_missed, 1) if held_or_missed else None,
+    }
+
+
+def _excerpt(text):
+    text = ' '.join((text or '').split())
+    if len(text) <= EXCERPT_CHARS:
+        return text
+    return text[:EXCERPT_CHARS].rsplit(' ', 1)[0] + '…'
+
+
+def _soap_excerpts(db, student_id, date_from, date_to):
+    cursor = db.execute('''
+        SELECT s.session_date, sn.assessment, sn.plan
+        FROM sessions s JOIN soap_notes sn ON sn.session_id = s.id
+        WHERE s.student_id = ? AND s.session_date BETWEEN ? AND ?
+        ORDER BY s.session_date DESC
+        LIMIT ?
+    ''', (student_id, date_from.isoformat(), date_to.isoformat(), SOAP_EXCERPTS))
+    return [{'session_date': row['session_date'], 'assessment': _excerpt(row['assessment']),
+             'plan': _excerpt(row['plan'])} for row in cursor]
+
+
+def build_report(db, student_id, period):
+    """Template context for one student's report, or None if there is no such student."""
+    student = Student.get_by_id(db, student_id)
+    if student is None:
+        return None
+    date_from, date_to, previous_from, previous_to = period
+    periods = _objective_periods(db, student_id, period)
+
+    months = {}
+    for point in ProgressSeries.for_student(db, student_id, 'month', date_from, date_to):
+        months.setdefault(point['objective_id'], {})[point['period']] = \
+            point['percent_correct_up_to']['independent']
+    month_columns = sorted({month for values in months.values() for month in values})
+
+    objectives_by_goal = {}
+    for objective in Objective.get_by_student(db, student_id):
+        counts = periods.get(objective.id, {})
+        current, previous = _percent(counts.get('current')), _percent(counts.get('previous'))
+        objectives_by_goal.setdefault(objective.goal_id, []).append({
+            'objective': objective,
+            'current': current,
+            'previous': previous,
+            'change': round(current - previous, 1) if None not in (current, previous) else None,
+            'trials': counts.get('current', (0, 0))[1] or 0,
+            'months': [months.get(objective.id, {}).get(month) for month in month_columns],
+        })
+
+    goals = []
+    for goal in Goal.get_by_student(db, student_id):
+        objectives = objectives_by_goal.get(goal.id, [])
+        measured = [o['current'] for o in objectives if o['current'] is not None]
+        goals.append({'goal': goal, 'objectives': objectives,
+                      'average': round(sum(measured) / len(measured), 1) if measured else None})
+
+    return {
+        'student': student,
+        'goals': goals,
+        'month_columns': month_columns,
+        'date_from': date_from, 'date_to': date_to,
+        'previous_from': previous_from, 'previous_to': previous_to,
+        'attendance': _attendance(db, student_id, date_from, date_to),
+        'soap_excerpts': _soap_excerpts(db, student_id, date_from, date_to),
+        'generated_on': date.today(),
+    }
+
+
+def report_filename(student):
+    name = re.sub(r'[^A-Za-z0-9]+', '-', f'{student.last_name}-{student.first_name}').strip('-')
+    return f'{name or "student"}-{student.id}.html'
+
+
+def render_report(db, env, student_id, period):
+    """(filename, html) for one student, or None if there is no such student."""
+    context = build_report(db, student_id, period)
+    if context is None:
+        return None
+    return report_filename(context['student']), env.get_template(TEMPLATE).render(**context)
+
+
+def _render_in_worker(student_id, period):
+    return render_report(_db, _env, student_id, period)
+
+
+class _DirectoryWriter:
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+
+    def write(self, filename, html):
+        with open(os.path.join(self.path, filename), 'w', encoding='utf-8') as output:
+            output.write(html)
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+
+    def write(self, filename, html):
+        self.zip.writestr(filename, html)
+
+    def close(self):
+        self.zip.close()
+
+
+def generate_reports(db_path, output, student_ids, date_from=None, date_to=None, workers=None,
+                     progress=None):
+    """Write one report per student to ``output`` (a .zip file or a directory).
+
+    ``progress`` is called with (done, total) as reports finish; it may
+    raise to stop early, e.g. jobs.JobCancelled. workers=1 renders in this
+    process. Returns a summary dict.
+    """
+    period = report_period(date_from, date_to)
+    student_ids = list(student_ids)
+    writer = _ZipWriter(output) if output.endswith('.zip') else _DirectoryWriter(output)
+    written = []
+    try:
+        if workers == 1 or len(student_ids) <= 1:
+            db, env = connect_readonly(db_path), _environment()
+            try:
+                for student_id in student_ids:
+                    _write(writer, written, render_report(db, env, student_id, period))
+                    if progress:
+                        progress(len(written), len(student_ids))
+            finally:
+                db.close()
+        else:
+            # spawn, not fork: the web process has worker threads and pooled connections
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(db_path,),
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = [pool.submit(_render_in_worker, student_id, period)
+                           for student_id in student_ids]
+                try:
+                    for future in as_completed(futures):
+                        _write(writer, written, future.result())
+                        if progress:
+                            progress(len(written), len(student_ids))
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+    finally:
+        writer.close()
+    return {'output': os.path.abspath(output), 'reports': len(written),
+            'date_from': period[0].isoformat(), 'date_to': period[1].isoformat()}
+
+
+def _write(writer, written, report):
+    if report is not None:
+        writer.write(*report)
+        written.append(report[0])
+
+
+def caseload_student_ids(db, student_ids=None):
+    """Active students by name, or the given ids."""
+    if student_ids:
+        return [int(student_id) for student_id in student_ids]
+    return [student.id for student in Student.get_active(db)]
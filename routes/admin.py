@@ -1,5 +1,11 @@
-from flask import Blueprint, jsonify
-from database import add_sample_data
+import os
+import uuid
+
+import click
+from flask import Blueprint, current_app, jsonify, request, url_for
+from werkzeug.utils import secure_filename
+from database import add_sample_data, get_db, rebuild_objective_rollup, rebuild_search_index
+from cache import cache
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -11,3 +17,212 @@ def admin_add_sample_data():
         return jsonify({'success': True, 'message': 'Sample data added successfully!'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@admin_bp.route('/import', methods=['POST'])
+def admin_import():
+    """Import an uploaded CSV/NDJSON file of historical trials."""
+    import importer
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'success': False, 'error': 'No file uploaded'}), 400
+    if request.form.get('background') == 'true':
+        return _queue_import(upload)
+    try:
+        result = importer.import_stream(
+            get_db(), upload.stream, upload.filename,
+            fmt=request.form.get('format'), key=request.form.get('key'),
+            batch_size=request.form.get('batch_size', importer.DEFAULT_BATCH_SIZE, type=int),
+            restart=request.form.get('restart') == 'true')
+    except Exception as e:
+        # Batches committed so far are kept; posting again resumes after them
+        return jsonify({'success': False, 'error': str(e)}), 500
+    if result['already_finished']:
+        return jsonify(dict(result, success=False, error=(
+            f"Already imported under key '{result['key']}'; "
+            "nothing was imported. Post with restart=true to import it again."))), 409
+    return jsonify(dict(result, success=True))
+
+def _queue_import(upload):
+    """Save the upload under data/imports and import it as a background job."""
+    import importer
+    import jobs
+    directory = jobs.imports_dir(current_app)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.abspath(os.path.join(
+        directory, f'{uuid.uuid4().hex}-{secure_filename(upload.filename) or "upload"}'))
+    upload.save(path)
+    params = {'path': path, 'fmt': request.form.get('format') or importer.detect_format(upload.filename),
+              'key': request.form.get('key'),
+              'batch_size': request.form.get('batch_size', importer.DEFAULT_BATCH_SIZE, type=int),
+              'restart': request.form.get('restart') == 'true'}
+    job_id = jobs.submit(get_db(), 'import-trials', params)
+    return jsonify({'success': True, 'job_id': job_id,
+                    'url': url_for('api.api_job', job_id=job_id)}), 202
+
+@admin_bp.route('/cache-stats')
+def admin_cache_stats():
+    """Response cache hit/miss counters."""
+    return jsonify(cache.stats())
+
+@admin_bp.cli.command('rebuild-rollup')
+def rebuild_rollup_command():
+    """Regenerate objective_daily_rollup from trial_logs."""
+    rows = rebuild_objective_rollup()
+    click.echo(f'Rebuilt objective_daily_rollup ({rows} objective-days).')
+
+@admin_bp.cli.command('rebuild-search')
+def rebuild_search_command():
+    """Regenerate the full-text search index."""
+    rows = rebuild_search_index()
+    click.echo(f'Rebuilt search_index ({rows} rows).')
+
+@admin_bp.cli.command('build-assets')
+def build_assets_command():
+    """Fingerprint and precompress static/css and static/js into static/dist."""
+    import assets
+    manifest = assets.build(current_app.static_folder)
+    encodings = 'gzip and brotli' if assets.brotli else 'gzip'
+    click.echo(f'Built {len(manifest)} assets ({encodings}).')
+
+@admin_bp.cli.command('warm-templates')
+@click.option('--clear', is_flag=True, help='Empty the bytecode cache first.')
+def warm_templates_command(clear):
+    """Compile every template into the Jinja bytecode cache."""
+    import template_cache
+    if current_app.jinja_env.bytecode_cache is None:
+        raise click.ClickException('TEMPLATE_CACHE_DIR is not set; there is no cache to warm.')
+    if clear:
+        template_cache.clear(current_app)
+    timings = template_cache.precompile(current_app)
+    click.echo(f'Compiled {len(timings)} templates in {sum(timings.values()) * 1000:.0f} ms '
+               f"into {current_app.config['TEMPLATE_CACHE_DIR']}.")
+
+@admin_bp.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Fail if any model query does a full table scan."""
+    from query_plans import check_query_plans
+    failures = check_query_plans()
+    for sql, scans in failures:
+        click.echo(f"FULL SCAN ({', '.join(scans)}):\n    {' '.join(sql.split())}")
+    if failures:
+        raise SystemExit(1)
+    click.echo('All model queries use indexes.')
+
+@admin_bp.cli.command('export-trials')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default='csv')
+@click.option('--student-id', type=int)
+@click.option('--objective-id', type=int)
+@click.option('--from', 'date_from', help='First session date (YYYY-MM-DD).')
+@click.option('--to', 'date_to', help='Last session date (YYYY-MM-DD).')
+@click.option('--output', type=click.File('w', encoding='utf-8'), default='-',
+              help='File to write, default stdout.')
+def export_trials_command(fmt, student_id, objective_id, date_from, date_to, output):
+    """Stream trial logs with session, student, goal and objective."""
+    import export
+    try:
+        filters = export.parse_filters(student_id, objective_id, date_from, date_to)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    for chunk in export.export_trials(get_db(), fmt, **filters):
+        output.write(chunk)
+
+@admin_bp.cli.command('import-trials')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']),
+              help='Input format, default from the file extension.')
+@click.option('--batch-size', type=int, default=None, help='Rows per transaction.')
+@click.option('--key', help='Resume key, default a hash of the file contents.')
+@click.option('--restart', is_flag=True, help='Ignore saved progress and start over.')
+def import_trials_command(path, fmt, batch_size, key, restart):
+    """Import historical sessions and trials from CSV or NDJSON."""
+    import importer
+
+    def report(result):
+        click.echo(f"{result['rows']} rows read, {result['trials_imported']} trials, "
+                   f"{result['sessions_created']} sessions, {result['skipped']} skipped")
+
+    result = importer.import_file(get_db(), path, fmt=fmt, key=key, progress=report,
+                                  batch_size=batch_size or importer.DEFAULT_BATCH_SIZE,
+                                  restart=restart)
+    if result['already_finished']:
+        click.echo(f"Already imported under key '{result['key']}'; use --restart to import again.")
+        return
+    if result['resumed_from']:
+        click.echo(f"Resumed after row {result['resumed_from']}.")
+    for error in result['errors']:
+        click.echo(f'  skipped {error}', err=True)
+    click.echo(f"Done: {result['trials_imported']} trials imported, "
+               f"{result['sessions_created']} sessions created, {result['skipped']} rows skipped.")
+
+@admin_bp.cli.command('generate-soap-drafts')
+@click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']), help='First session date.')
+@click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']), help='Last session date.')
+@click.option('--overwrite', is_flag=True, help='Regenerate drafts that already exist.')
+def generate_soap_drafts_command(date_from, date_to, overwrite):
+    """Draft SOAP notes for all completed sessions that have none."""
+    from models import SOAPDraft
+    result = SOAPDraft.generate(get_db(), date_from=date_from and date_from.date(),
+                                date_to=date_to and date_to.date(), overwrite=overwrite)
+    click.echo(f"Drafted {result['created']} SOAP notes ({result['skipped']} already drafted).")
+
+@admin_bp.cli.command('progress-reports')
+@click.option('--from', 'date_from', type=click.DateTime(['%Y-%m-%d']),
+              help='First day of the reporting period, default 90 days before --to.')
+@click.option('--to', 'date_to', type=click.DateTime(['%Y-%m-%d']), help='Last day, default today.')
+@click.option('--student-id', 'student_ids', type=int, multiple=True,
+              help='Only this student; repeatable. Default every active student.')
+@click.option('--output', default='progress-reports.zip', show_default=True,
+              help='A .zip file, or a directory for loose HTML files.')
+@click.option('--workers', type=int, help='Worker processes, default one per core.')
+def progress_reports_command(date_from, date_to, student_ids, output, workers):
+    """Write a printable HTML progress report for each student."""
+    import reports
+    try:
+        result = reports.generate_reports(
+            current_app.config['DATABASE_PATH'], output,
+            reports.caseload_student_ids(get_db(), student_ids),
+            date_from=date_from and date_from.date(), date_to=date_to and date_to.date(),
+            workers=workers)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    click.echo(f"Wrote {result['reports']} reports for {result['date_from']} to "
+               f"{result['date_to']} to {result['output']}.")
+
+@admin_bp.cli.command('submit-job')
+@click.argument('kind')
+@click.option('--param', '-p', 'params', multiple=True, metavar='NAME=VALUE',
+              help='Job parameter; repeatable.')
+@click.option('--wait', is_flag=True, help='Run the job here instead of leaving it queued.')
+def submit_job_command(kind, params, wait):
+    """Queue a background job for the app's workers (or run it with --wait)."""
+    import jobs
+    try:
+        values = dict(param.split('=', 1) for param in params)
+        job_id = jobs.submit(get_db(), kind, values)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    click.echo(f'Queued job {job_id} ({kind}).')
+    if wait:
+        jobs.runner.run_pending(get_db(), job_id)
+        job = jobs.get_job(get_db(), job_id)
+        click.echo(f"Job {job_id} {job['status']}: {job['error'] or job['result']}")
+        if job['status'] != 'succeeded':
+            raise SystemExit(1)
+
+@admin_bp.cli.command('run-jobs')
+def run_jobs_command():
+    """Recover interrupted jobs, then run every queued job and exit."""
+    import jobs
+    recovered = jobs.recover(get_db())
+    ran = jobs.runner.run_pending(get_db())
+    click.echo(f'Ran {ran} jobs ({recovered} recovered after an interruption).')
+
+@admin_bp.cli.command('list-jobs')
+@click.option('--status', type=click.Choice(['queued', 'running', 'succeeded', 'failed', 'cancelled']))
+@click.option('--limit', type=int, default=20)
+def list_jobs_command(status, limit):
+    """Show recent background jobs."""
+    import jobs
+    for job in jobs.list_jobs(get_db(), status, limit):
+        progress = f" {job['progress_done']}/{job['progress_total'] or '?'}" if job['progress_done'] else ''
+        click.echo(f"{job['id']:>5}  {job['kind']:<22} {job['status']:<10}{progress}  {job['created_at']}")
@@ -1,27 +1,52 @@
-from flask import Blueprint, jsonify
-from datetime import date
+from flask import (Blueprint, Response, abort, current_app, jsonify, request, send_file,
+                   stream_with_context, url_for)
+from datetime import date, timedelta
 from database import get_db
-from models import Student, Session, Goal, Objective
+from cache import cache, goal_tags
+import export
+import jobs
+from versions import conditional
+from models import Student, Session, Goal, Objective, ProgressEngine, ProgressSeries, SearchIndex
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Default chart range when ?from= is omitted
+SERIES_DEFAULT_DAYS = 365
+# Closed periods only change on a backdated write, which invalidates the
+# student tag, so they can outlive the default TTL
+CLOSED_SERIES_TTL = 24 * 60 * 60
+
 @api_bp.route('/students/<int:student_id>/objectives')
+@conditional('goals', 'objectives', 'sessions', 'trial_logs', daily=True)
 def api_student_objectives(student_id):
+    today = date.today().isoformat()
+    return jsonify(cache.get_or_set(('student_objectives', student_id, today),
+                                    lambda: _student_objectives(student_id),
+                                    tags=[f'student:{student_id}']))
+
+
+def _student_objectives(student_id):
     db = get_db()
     objectives = Objective.get_by_student(db, student_id)
+    goals = {goal.id: goal for goal in Goal.get_by_student(db, student_id)}
+    progress = ProgressEngine.for_student(db, student_id)
     objectives_data = []
     for obj in objectives:
-        goal = obj.get_goal(db)
+        goal = goals.get(obj.goal_id)
         objectives_data.append({
             'id': obj.id,
             'description': obj.description,
             'target_percentage': obj.target_percentage,
             'goal_description': goal.description if goal else '',
-            'current_progress': obj.get_current_progress(db)
+            'current_progress': progress.objective(obj.id)
         })
-    return jsonify(objectives_data)
+    return objectives_data
 
 @api_bp.route('/objectives/<int:objective_id>/progress')
+@conditional('objectives', 'sessions', 'trial_logs', daily=True)
 def api_objective_progress(objective_id):
     db = get_db()
     objective = Objective.get_by_id(db, objective_id)
@@ -35,12 +60,14 @@ def api_objective_progress(objective_id):
     })
 
 @api_bp.route('/students')
+@conditional('students')
 def api_students():
     db = get_db()
     students = Student.get_all(db)
     return jsonify([s.to_dict() for s in students])
 
 @api_bp.route('/sessions/today')
+@conditional('sessions', daily=True)
 def api_todays_sessions():
     db = get_db()
     today = date.today()
@@ -48,7 +75,211 @@ def api_todays_sessions():
     return jsonify([s.to_dict() for s in sessions])
 
 @api_bp.route('/goals/<int:student_id>')
+@conditional('goals')
 def api_student_goals(student_id):
     db = get_db()
     goals = Goal.get_by_student(db, student_id)
     return jsonify([g.to_dict() for g in goals])
+
+@api_bp.route('/export/trials')
+def api_export_trials():
+    """Stream every matching trial log as CSV (default) or NDJSON."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in export.FORMATS:
+        return jsonify({'error': f"Unknown format '{fmt}'"}), 400
+    try:
+        filters = export.parse_filters(request.args.get('student_id'),
+                                       request.args.get('objective_id'),
+                                       request.args.get('from'), request.args.get('to'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    db = get_db()
+    filename = f"trials-{date.today().isoformat()}.{fmt}"
+    # stream_with_context keeps the pooled connection until the last chunk
+    return Response(stream_with_context(export.export_trials(db, fmt, **filters)),
+                    mimetype=export.FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+def _series_range():
+    """(bucket, from, to) from the query string. Raises ValueError when invalid."""
+    bucket = request.args.get('bucket', 'week')
+    if bucket not in ProgressSeries.BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'")
+    date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else date.today()
+    date_from = (date.fromisoformat(request.args['from']) if request.args.get('from')
+                 else date_to - timedelta(days=SERIES_DEFAULT_DAYS))
+    if date_from > date_to:
+        raise ValueError("'from' is after 'to'")
+    # Start on a period boundary so the first point covers a whole period
+    return bucket, ProgressSeries.period_start(bucket, date_from), date_to
+
+
+def _cached_series(scope, tags, load, bucket, date_from, date_to):
+    """Points from load(from, to), caching the part before the current period."""
+    current = ProgressSeries.period_start(bucket, date.today())
+    points = []
+    closed_to = min(date_to, current - timedelta(days=1))
+    if date_from <= closed_to:
+        points += cache.get_or_set(
+            ('series', *scope, bucket, date_from.isoformat(), closed_to.isoformat()),
+            lambda: load(date_from, closed_to), tags=tags, ttl=CLOSED_SERIES_TTL)
+    if date_to >= current:
+        points += load(max(date_from, current), date_to)
+    return points
+
+
+def _without_objective(point):
+    # Copy rather than pop: cached points are shared between requests
+    return {key: value for key, value in point.items() if key != 'objective_id'}
+
+
+@api_bp.route('/objectives/<int:objective_id>/series')
+@conditional('goals', 'objectives', 'sessions', 'trial_logs', daily=True)
+def api_objective_series(objective_id):
+    """Bucketed trial counts and support-level percentages for one objective."""
+    try:
+        bucket, date_from, date_to = _series_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    db = get_db()
+    objective = Objective.get_by_id(db, objective_id)
+    if not objective:
+        return jsonify({'error': 'Objective not found'}), 404
+
+    points = _cached_series(
+        ('objective', objective_id), goal_tags(db, objective.goal_id),
+        lambda start, end: ProgressSeries.for_objective(db, objective_id, bucket, start, end),
+        bucket, date_from, date_to)
+    return jsonify({'objective_id': objective_id, 'bucket': bucket,
+                    'from': date_from.isoformat(), 'to': date_to.isoformat(),
+                    'series': [_without_objective(point) for point in points]})
+
+
+@api_bp.route('/students/<int:student_id>/series')
+@conditional('goals', 'objectives', 'sessions', 'trial_logs', daily=True)
+def api_student_series(student_id):
+    """Per-objective series for every active objective of a student."""
+    try:
+        bucket, date_from, date_to = _series_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    db = get_db()
+    if not Student.get_by_id(db, student_id):
+        return jsonify({'error': 'Student not found'}), 404
+
+    points = _cached_series(
+        ('student', student_id), [f'student:{student_id}'],
+        lambda start, end: ProgressSeries.for_student(db, student_id, bucket, start, end),
+        bucket, date_from, date_to)
+    series = {}
+    for point in points:
+        series.setdefault(point['objective_id'], []).append(_without_objective(point))
+
+    objectives = []
+    for objective in Objective.get_by_student(db, student_id):
+        objectives.append({'id': objective.id, 'goal_id': objective.goal_id,
+                           'description': objective.description,
+                           'series': series.get(objective.id, [])})
+    return jsonify({'student_id': student_id, 'bucket': bucket,
+                    'from': date_from.isoformat(), 'to': date_to.isoformat(),
+                    'objectives': objectives})
+
+
+@api_bp.route('/analytics/trends')
+@conditional('students', 'goals', 'objectives', 'sessions', 'trial_logs')
+def api_analytics_trends():
+    """Trend, plateau and projected mastery for every active objective."""
+    import analytics
+    status = request.args.get('status')
+    if status and status not in analytics.STATUSES:
+        return jsonify({'error': f"Unknown status '{status}'"}), 400
+    db = get_db()
+    return jsonify(analytics.caseload_trends(db, request.args.get('student_id', type=int), status))
+
+
+def _search_url(hit):
+    if hit['kind'] == 'soap':
+        return url_for('sessions.soap_note', session_id=hit['session_id'])
+    if hit['session_id']:
+        return url_for('sessions.session_detail', session_id=hit['session_id'])
+    return url_for('students.student_detail', student_id=hit['student_id'])
+
+
+@api_bp.route('/search')
+@conditional('students', 'goals', 'objectives', 'sessions', 'trial_logs', 'soap_notes')
+def api_search():
+    """Ranked full-text hits with highlighted snippets.
+
+    ?q= is required; student_id, from, to, kind (repeatable) and limit narrow it.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'q is required'}), 400
+    try:
+        date_from = date.fromisoformat(request.args['from']).isoformat() if request.args.get('from') else None
+        date_to = date.fromisoformat(request.args['to']).isoformat() if request.args.get('to') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    limit = min(request.args.get('limit', SEARCH_DEFAULT_LIMIT, type=int), SEARCH_MAX_LIMIT)
+
+    hits = SearchIndex.search(get_db(), query, student_id=request.args.get('student_id', type=int),
+                              date_from=date_from, date_to=date_to,
+                              kinds=request.args.getlist('kind'), limit=max(limit, 1))
+    for hit in hits:
+        hit['url'] = _search_url(hit)
+    return jsonify({'query': query, 'results': hits})
+
+
+@api_bp.route('/jobs', methods=['POST'])
+def api_submit_job():
+    """Queue a background job: {"kind": "...", "params": {...}}. Returns 202 and its id."""
+    data = request.get_json(silent=True) or {}
+    params = data.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params must be an object'}), 400
+    if data.get('kind') == 'import-trials':
+        try:
+            jobs.import_path(current_app, params.get('path'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    try:
+        job_id = jobs.submit(get_db(), data.get('kind'), params)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'kinds': sorted(jobs.JOB_TYPES)}), 400
+    return jsonify({'id': job_id, 'url': url_for('api.api_job', job_id=job_id)}), 202
+
+
+@api_bp.route('/jobs')
+def api_jobs():
+    """Recent jobs, newest first; ?status= filters."""
+    status = request.args.get('status')
+    if status and status not in jobs.STATUSES:
+        return jsonify({'error': f"Unknown status '{status}'"}), 400
+    return jsonify(jobs.list_jobs(get_db(), status, min(request.args.get('limit', 50, type=int), 500)))
+
+
+@api_bp.route('/jobs/<int:job_id>')
+def api_job(job_id):
+    job = jobs.get_job(get_db(), job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job)
+
+
+@api_bp.route('/jobs/<int:job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    """Cancel a queued job, or ask a running one to stop at its next progress report."""
+    job = jobs.cancel(get_db(), job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job)
+
+
+@api_bp.route('/jobs/<int:job_id>/file')
+def api_job_file(job_id):
+    """Download the file a finished job wrote (e.g. export-trials)."""
+    job = jobs.get_job(get_db(), job_id)
+    if job is None or job['status'] != 'succeeded' or not (job['result'] or {}).get('file'):
+        abort(404)
+    return send_file(job['result']['file'], as_attachment=True)
@@ -1,42 +1,42 @@
 from flask import Blueprint, render_template, request, jsonify, redirect, url_for
 from database import get_db
-from models import Student, Session
+from cache import cache
+from models import Student, Session, DashboardStats
 from datetime import date, datetime, timedelta
 
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
+# Pending SOAP note sessions loaded for display; the total comes from stats
+PENDING_SOAP_DISPLAY = 5
+
 
 @dashboard_bp.route('/')
 def dashboard():
     """Main dashboard - overview of everything."""
+    today = date.today().isoformat()
+    return cache.get_or_set(('page', 'dashboard', today), lambda: _render_dashboard(today),
+                            tags=['dashboard'])
+
+
+def _render_dashboard(today):
     db = get_db()
 
     # Get recent activity
     recent_sessions = Session.get_recent_with_student_info(db, limit=5)
-    active_students = Student.get_active(db)
-    pending_soap_notes = Session.get_pending_soap_notes(db)
-    upcoming_sessions = Session.get_upcoming(db, days=7)
+    pending_soap_notes = Session.get_pending_soap_notes(db, limit=PENDING_SOAP_DISPLAY)
 
     # School functionality removed for simplification
     total_schools = 0
     recent_schools = []
 
-    stats = {
-        'total_students': len(active_students),
-        'total_schools': total_schools,
-        'sessions_this_week': len([s for s in recent_sessions if s.this_week()]),
-        'pending_soap_notes': len(pending_soap_notes),
-        'upcoming_sessions': len(upcoming_sessions)
-    }
-
-    today = date.today().isoformat()
+    stats = DashboardStats.load(db).to_dict()
+    stats['total_schools'] = total_schools
 
     return render_template('dashboard.html',
                          stats=stats,
                          recent_sessions=recent_sessions,
                          pending_soap_notes=pending_soap_notes,
-                         upcoming_sessions=upcoming_sessions,
                          recent_schools=recent_schools,
                          today=today)
 
@@ -52,12 +52,12 @@ def daily_planner():
     if request.method == 'POST':
         # Handle bulk session creation
         sessions_data = request.get_json()
-        created_sessions = []
+        planned = []
         
         for session_info in sessions_data['sessions']:
             # Create session for each student
             for student_id in session_info['student_ids']:
-                session_data = {
+                planned.append({
                     'student_id': student_id,
                     'session_date': session_info['date'],
                     'start_time': session_info['start_time'],
@@ -66,12 +66,20 @@ def daily_planner():
                     'location': session_info.get('location', ''),
                     'notes': session_info.get('notes', ''),
                     'status': None
-                }
-                session = Session.create(db, session_data)
-                created_sessions.append(session.to_dict())
+                })
         
-        return jsonify({'success': True, 'sessions_created': len(created_sessions)})
+        result = Session.bulk_create(db, planned)
+        return jsonify({'success': True, 'sessions_created': result['created'],
+                        'sessions_skipped': result['skipped'], 'session_ids': result['ids']})
     
+    return cache.get_or_set(('page', 'planner', selected_date),
+                            lambda: _render_planner(selected_date),
+                            tags=[f'date:{selected_date}', 'students'])
+
+
+def _render_planner(selected_date):
+    db = get_db()
+
     # Get existing sessions for the selected date
     existing_sessions = Session.get_by_date_with_student_info(db, selected_date)
     
@@ -1,10 +1,19 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, abort
 from datetime import date
 from database import get_db
-from models import Student, Session, Goal, Objective, TrialLog, SOAPNote
+from cache import cache, session_tags
+from versions import conditional
+from models import (Student, Session, Goal, Objective, TrialLog, SOAPNote, SOAPDraft, InvalidCursor,
+                    TrackingBootstrap)
 
 sessions_bp = Blueprint('sessions', __name__)
 
+SESSIONS_PAGE_SIZE = 20
+TRACKING_PAGE_SIZE = 50
+# Students per /api/tracking/bootstrap request
+MAX_BOOTSTRAP_STUDENTS = 50
+MAX_PAGE_SIZE = 100
+
 @sessions_bp.route('/sessions')
 def sessions():
     db = get_db()
@@ -12,7 +21,12 @@ def sessions():
     if date_filter:
         sessions = Session.get_by_date_with_student_info(db, date_filter)
     else:
-        sessions = Session.get_recent_with_student_info(db, limit=20)
+        try:
+            sessions = Session.get_recent_with_student_info(
+                db, limit=SESSIONS_PAGE_SIZE, cursor=request.args.get('cursor'),
+                student_id=request.args.get('student', type=int))
+        except InvalidCursor:
+            abort(400)
     from datetime import date
     today = date.today().isoformat()
     return render_template('sessions.html', sessions=sessions, today=today)
@@ -52,11 +66,7 @@ def session_detail(session_id):
         objectives = goal.get_objectives(db)
         goals_with_objectives.append({'goal': goal, 'objectives': objectives})
         all_objectives.extend(objectives)
-    trial_logs = TrialLog.get_by_session(db, session_id)
-    for trial in trial_logs:
-        if trial.objective_id:
-            objective = trial.get_objective(db)
-            trial.objective_description = objective.description if objective else None
+    trial_logs = TrialLog.get_by_session(db, session_id, with_=('objective',))
     soap_note = SOAPNote.get_by_session(db, session_id)
     return render_template('session_detail.html', session=session, student=student, goals=goals,
                            goals_with_objectives=goals_with_objectives, all_objectives=all_objectives,
@@ -100,6 +110,7 @@ def edit_trial(trial_id):
         trial_id
     ))
     db.commit()
+    cache.invalidate(*session_tags(db, [trial.session_id], dates=False))
     updated_trial = TrialLog.get_by_id(db, trial_id)
     return jsonify(updated_trial.to_dict())
 
@@ -108,7 +119,7 @@ def soap_note(session_id):
     db = get_db()
     session = Session.get_by_id(db, session_id)
     soap_note = SOAPNote.get_by_session(db, session_id)
-    trial_logs = TrialLog.get_by_session(db, session_id)
+    trial_logs = TrialLog.get_by_session(db, session_id, with_=('objective',))
     
     # Check if edit mode is requested
     edit_mode = request.args.get('edit', '').lower() == 'true'
@@ -120,13 +131,13 @@ def soap_note(session_id):
     # Enhance trial logs with objective information
     for trial in trial_logs:
         if trial.objective_id:
-            objective = trial.get_objective(db)
-            trial.objective_description = objective.description if objective else 'Unknown Objective'
+            trial.objective_description = trial.objective_description or 'Unknown Objective'
         else:
             trial.objective_description = 'General Trial'
     
     if not soap_note:
-        soap_note = SOAPNote.generate_from_session(db, session)
+        # A batch-generated draft if there is one, otherwise draft it now
+        soap_note = SOAPDraft.get_by_session(db, session_id) or SOAPNote.generate_from_session(db, session)
     return render_template('soap_note.html', session=session, soap_note=soap_note, trial_logs=trial_logs, edit_mode=edit_mode)
 
 @sessions_bp.route('/soap/save', methods=['POST'])
@@ -142,6 +153,34 @@ def save_soap_note():
     soap_note = SOAPNote.create_or_update(db, soap_data)
     return jsonify({'success': True, 'id': soap_note.id})
 
+@sessions_bp.route('/api/soap/drafts', methods=['GET'])
+@conditional('soap_drafts', 'sessions', 'students')
+def list_soap_drafts():
+    """Stored SOAP drafts awaiting review."""
+    db = get_db()
+    return jsonify([dict(draft.to_dict(), url=url_for('sessions.soap_note', session_id=draft.session_id))
+                    for draft in SOAPDraft.get_all(db)])
+
+@sessions_bp.route('/api/soap/drafts', methods=['POST'])
+def generate_soap_drafts():
+    """Draft SOAP notes for every pending session, optionally within a date range."""
+    db = get_db()
+    data = request.get_json(silent=True) or request.form
+    try:
+        date_from = date.fromisoformat(data['from']) if data.get('from') else None
+        date_to = date.fromisoformat(data['to']) if data.get('to') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    result = SOAPDraft.generate(db, date_from=date_from, date_to=date_to,
+                                overwrite=data.get('overwrite') in (True, 'true', '1'))
+    return jsonify(dict(result, success=True))
+
+@sessions_bp.route('/api/soap/drafts/<int:session_id>', methods=['DELETE'])
+def discard_soap_draft(session_id):
+    db = get_db()
+    SOAPDraft.discard(db, session_id)
+    return jsonify({'success': True})
+
 @sessions_bp.route('/sessions/track')
 def session_tracking():
     """Live session tracking interface for multiple students."""
@@ -152,6 +191,7 @@ def session_tracking():
     linked_session_id = request.args.get('linked_session')
     linked_session = None
     pre_loaded_students = []
+    bootstrap = None
     
     if linked_session_id:
         # Get the linked session information
@@ -165,12 +205,14 @@ def session_tracking():
                 WHERE s.session_date = ? AND s.start_time = ? AND s.session_type = ?
                 ORDER BY st.first_name, st.last_name
             ''', (linked_session.session_date, linked_session.start_time, linked_session.session_type)).fetchall()
-            
+
+            # Goals and objectives for the whole group go inline with the page
+            bootstrap = TrackingBootstrap.load(db, [row['student_id'] for row in group_sessions])
+            names = {student['id']: student['name'] for student in bootstrap['students']}
             for session_row in group_sessions:
-                student = Student.get_by_id(db, session_row['student_id'])
                 pre_loaded_students.append({
-                    'id': student.id,
-                    'name': student.display_name,
+                    'id': session_row['student_id'],
+                    'name': names[session_row['student_id']],
                     'session_id': session_row['id']
                 })
     
@@ -199,9 +241,29 @@ def session_tracking():
                          students=students, 
                          recent_sessions=recent_sessions,
                          linked_session=linked_session,
-                         pre_loaded_students=pre_loaded_students)
+                         pre_loaded_students=pre_loaded_students,
+                         bootstrap=bootstrap)
+
+@sessions_bp.route('/api/tracking/bootstrap')
+@conditional('students', 'goals', 'objectives', 'sessions', 'trial_logs', daily=True)
+def tracking_bootstrap():
+    """Students with their goals, objectives and current progress in one payload.
+
+    ?student_ids=1,2,3 (comma-separated, or repeated).
+    """
+    raw = ','.join(request.args.getlist('student_ids'))
+    try:
+        student_ids = [int(part) for part in raw.split(',') if part.strip()]
+    except ValueError:
+        return jsonify({'error': 'student_ids must be comma-separated integers'}), 400
+    if not student_ids:
+        return jsonify({'error': 'student_ids is required'}), 400
+    if len(student_ids) > MAX_BOOTSTRAP_STUDENTS:
+        return jsonify({'error': f'At most {MAX_BOOTSTRAP_STUDENTS} students per request'}), 400
+    return jsonify(TrackingBootstrap.load(get_db(), student_ids))
 
 @sessions_bp.route('/api/students/<int:student_id>/goals')
+@conditional('goals')
 def get_student_goals(student_id):
     """API endpoint to get goals for a specific student."""
     db = get_db()
@@ -213,6 +275,7 @@ def get_student_goals(student_id):
     } for goal in goals])
 
 @sessions_bp.route('/api/goals/<int:goal_id>/objectives')
+@conditional('goals', 'objectives')
 def get_goal_objectives(goal_id):
     """API endpoint to get objectives for a specific goal."""
     db = get_db()
@@ -246,27 +309,14 @@ def save_session_trials():
     
     session = Session.create(db, session_data)
     
-    # Save all trial data
-    saved_trials = []
-    for trial_data in data['trials']:
-        trial_log_data = {
-            'session_id': session.id,
-            'objective_id': trial_data.get('objective_id'),
-            'goal_id': trial_data.get('goal_id'),
-            'independent': trial_data.get('independent', 0),
-            'minimal_support': trial_data.get('minimal_support', 0),
-            'moderate_support': trial_data.get('moderate_support', 0),
-            'maximal_support': trial_data.get('maximal_support', 0),
-            'incorrect': trial_data.get('incorrect', 0),
-            'notes': trial_data.get('notes', '')
-        }
-        trial = TrialLog.create(db, trial_log_data)
-        saved_trials.append(trial.to_dict())
+    # Save all trial data in one transaction
+    trial_ids = TrialLog.bulk_create(db, session.id, data['trials'])
     
     return jsonify({
         'success': True,
         'session_id': session.id,
-        'trials_saved': len(saved_trials)
+        'trials_saved': len(trial_ids),
+        'trial_ids': trial_ids
     })
 
 @sessions_bp.route('/api/sessions/update-trials', methods=['POST'])
@@ -284,30 +334,18 @@ def update_session_trials():
     if not session:
         return jsonify({'error': 'Session not found'}), 404
     
-    # Save all trial data to the existing session
-    saved_trials = []
-    for trial_data in data['trials']:
-        trial_log_data = {
-            'session_id': session_id,
-            'objective_id': trial_data.get('objective_id'),
-            'goal_id': trial_data.get('goal_id'),
-            'independent': trial_data.get('independent', 0),
-            'minimal_support': trial_data.get('minimal_support', 0),
-            'moderate_support': trial_data.get('moderate_support', 0),
-            'maximal_support': trial_data.get('maximal_support', 0),
-            'incorrect': trial_data.get('incorrect', 0),
-            'notes': trial_data.get('notes', '')
-        }
-        trial = TrialLog.create(db, trial_log_data)
-        saved_trials.append(trial.to_dict())
+    # Save all trial data to the existing session in one transaction
+    trial_ids = TrialLog.bulk_create(db, session_id, data['trials'])
     
     return jsonify({
         'success': True,
         'session_id': session_id,
-        'trials_saved': len(saved_trials)
+        'trials_saved': len(trial_ids),
+        'trial_ids': trial_ids
     })
 
 @sessions_bp.route('/api/sessions/<int:session_id>/info')
+@conditional('sessions')
 def get_session_info(session_id):
     """API endpoint to get session information for prefilling."""
     db = get_db()
@@ -326,20 +364,23 @@ def get_session_info(session_id):
     })
 
 @sessions_bp.route('/api/sessions/all-for-tracking')
+@conditional('sessions', 'students', 'soap_notes')
 def get_all_sessions_for_tracking():
-    """API endpoint to get all sessions with detailed info for filtering."""
+    """API endpoint to get sessions with detailed info for filtering.
+
+    Returns one page, newest first. Pass next_cursor/prev_cursor back as
+    ?cursor= to fetch older or newer sessions; ?limit= sets the page size.
+    """
     db = get_db()
-    cursor = db.execute('''
-        SELECT s.*, st.first_name, st.last_name
-        FROM sessions s 
-        JOIN students st ON s.student_id = st.id 
-        ORDER BY s.session_date DESC, s.created_at DESC 
-        LIMIT 50
-    ''')
-    
+    limit = min(request.args.get('limit', TRACKING_PAGE_SIZE, type=int), MAX_PAGE_SIZE)
+    try:
+        page = Session.get_recent_with_student_info(
+            db, limit=max(limit, 1), cursor=request.args.get('cursor'))
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
     sessions = []
-    for row in cursor.fetchall():
-        session = Session.from_row(row)
+    for session in page:
         sessions.append({
             'id': session.id,
             'student_id': session.student_id,
@@ -351,10 +392,11 @@ def get_all_sessions_for_tracking():
             'session_type': session.session_type,
             'location': session.location or '',
             'status': session.status,
-            'student_name': f"{row['first_name']} {row['last_name']}"
+            'student_name': session.student_name
         })
     
-    return jsonify(sessions)
+    return jsonify({'sessions': sessions, 'next_cursor': page.next_cursor,
+                    'prev_cursor': page.prev_cursor})
 
 @sessions_bp.route('/sessions/<int:session_id>/continue-group', methods=['GET', 'POST'])
 def continue_group_session(session_id):
@@ -1,9 +1,14 @@
 from flask import Blueprint, render_template, request, redirect, url_for
+from datetime import date
 from database import get_db
-from models import Student, Session, Goal, Objective, TrialLog, SOAPNote
+from cache import cache
+from models import Student, Session, Goal, Objective, TrialLog, SOAPNote, ProgressEngine
 
 students_bp = Blueprint('students', __name__)
 
+# Sessions shown on the student page; older ones are paged on /sessions
+RECENT_SESSIONS_DISPLAY = 5
+
 @students_bp.route('/students')
 def list_students():
     """List all students."""
@@ -14,35 +19,38 @@ def list_students():
 @students_bp.route('/students/<int:student_id>')
 def student_detail(student_id):
     """Individual student view with goals and objectives."""
+    # Progress windows are relative to today, so the day is part of the key
+    today = date.today().isoformat()
+    return cache.get_or_set(('page', 'student', student_id, today),
+                            lambda: _render_student_detail(student_id),
+                            tags=[f'student:{student_id}'])
+
+
+def _render_student_detail(student_id):
     db = get_db()
     student = Student.get_by_id(db, student_id)
     if not student:
         return "Student not found", 404
 
     # Get all related data
-    sessions = Session.get_by_student(db, student_id)
+    sessions = Session.get_by_student(db, student_id, limit=RECENT_SESSIONS_DISPLAY)
     goals = Goal.get_by_student(db, student_id)
 
     # Enhanced: Get goals with their objectives and calculate progress
+    progress = ProgressEngine.for_student(db, student_id)
+    objectives_by_goal = {}
+    for objective in Objective.get_by_student(db, student_id):
+        objective.current_progress = progress.objective(objective.id)
+        objectives_by_goal.setdefault(objective.goal_id, []).append(objective)
+
     goals_with_objectives = []
     for goal in goals:
-        objectives = goal.get_objectives(db)
-        for objective in objectives:
-            objective.current_progress = objective.get_current_progress(db)
-        goals_with_objectives.append({'goal': goal,'objectives': objectives,'progress': goal.get_current_progress(db)})
-
-    recent_trials = TrialLog.get_recent_by_student(db, student_id, limit=10)
-    for trial in recent_trials:
-        if trial.objective_id:
-            objective = trial.get_objective(db)
-            trial.objective_description = objective.description if objective else None
-        else:
-            trial.objective_description = None
-
-    soap_notes = SOAPNote.get_by_student(db, student_id)
-    for soap in soap_notes:
-        session = soap.get_session(db)
-        soap.session_date = session.session_date if session else 'Unknown'
+        goals_with_objectives.append({'goal': goal, 'objectives': objectives_by_goal.get(goal.id, []),
+                                      'progress': progress.goal(goal.id)})
+
+    recent_trials = TrialLog.get_recent_by_student(db, student_id, limit=10, with_=('objective',))
+
+    soap_notes = SOAPNote.get_by_student(db, student_id, with_session=True)
 
     # School functionality removed for simplification
     student_schedule = None
@@ -94,6 +102,7 @@ def edit_student(student_id):
               request.form.get('next_triennial_assessment') or None,
               student_id))
         db.commit()
+        cache.invalidate(f'student:{student_id}', 'students', 'dashboard')
         return redirect(url_for('students.student_detail', student_id=student_id))
     
     return render_template('student_form.html', student=student, edit_mode=True)
@@ -171,6 +180,7 @@ def delete_goal(goal_id):
     db.execute('DELETE FROM objectives WHERE goal_id = ?', (goal_id,))
     db.execute('DELETE FROM goals WHERE id = ?', (goal_id,))
     db.commit()
+    cache.invalidate(f'student:{student_id}')
 
     return redirect(url_for('students.student_detail', student_id=student_id))
 
@@ -209,5 +219,6 @@ def delete_objective(objective_id):
     db.execute('DELETE FROM trial_logs WHERE objective_id = ?', (objective_id,))
     db.execute('DELETE FROM objectives WHERE id = ?', (objective_id,))
     db.commit()
+    cache.invalidate(f'student:{student_id}')
 
     return redirect(url_for('students.student_detail', student_id=student_id))
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 V3 Enhancement Setup Script
-Run this to upgrade your existing v3 system with objectives support
+Run this to upgrade your existing v3 system with objectives support.
+Schema changes come from the same migrations the app applies at startup.
 
 Usage:
     python setup_objectives.py
@@ -11,23 +12,32 @@ import os
 import sqlite3
 from datetime import datetime
 
+from database import DATABASE_PATH
+from migrations import migrate
+
 def backup_database():
     """Create a backup of the existing database."""
-    if os.path.exists('data/students.db'):
-        backup_name = f"data/students_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        os.system(f"cp data/students.db {backup_name}")
+    if os.path.exists(DATABASE_PATH):
+        backup_name = os.path.join(os.path.dirname(DATABASE_PATH),
+                                   f"students_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
+        # Backup API so pages still in the WAL file are included
+        source = sqlite3.connect(DATABASE_PATH)
+        target = sqlite3.connect(backup_name)
+        source.backup(target)
+        target.close()
+        source.close()
         print(f"✅ Database backed up to {backup_name}")
         return True
     return False
 
 def check_existing_database():
     """Check if we have an existing v3 database."""
-    if not os.path.exists('data/students.db'):
+    if not os.path.exists(DATABASE_PATH):
         print("❌ No existing database found. This script is for upgrading existing v3 systems.")
         return False
     
     # Check if objectives table already exists
-    conn = sqlite3.connect('data/students.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='objectives'")
     exists = cursor.fetchone() is not None
     conn.close()
@@ -40,42 +50,15 @@ def check_existing_database():
         return True
 
 def upgrade_database():
-    """Add objectives table and update trial_logs table."""
-    conn = sqlite3.connect('data/students.db')
+    """Apply any pending schema migrations (objectives, rollups, indexes)."""
+    conn = sqlite3.connect(DATABASE_PATH)
     
     try:
-        print("🔧 Adding objectives table...")
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS objectives (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal_id INTEGER NOT NULL,
-                description TEXT NOT NULL,
-                target_percentage INTEGER DEFAULT 80,
-                notes TEXT,
-                active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (goal_id) REFERENCES goals (id)
-            )
-        ''')
-        
-        print("🔧 Updating trial_logs table...")
-        # Check if objective_id column exists
-        cursor = conn.execute("PRAGMA table_info(trial_logs)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        if 'objective_id' not in columns:
-            conn.execute('ALTER TABLE trial_logs ADD COLUMN objective_id INTEGER')
-            print("   Added objective_id column to trial_logs")
-        
-        print("🔧 Creating indexes...")
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_objectives_goal ON objectives(goal_id)')
-        conn.execute('CREATE INDEX IF NOT EXISTS idx_trials_objective ON trial_logs(objective_id)')
-        
-        conn.commit()
-        print("✅ Database upgrade completed successfully!")
+        print("🔧 Applying schema migrations...")
+        version = migrate(conn, log=lambda message: print(f"   {message}"))
+        print(f"✅ Database upgrade completed successfully! (schema version {version})")
         
     except Exception as e:
-        conn.rollback()
         print(f"❌ Error upgrading database: {e}")
         return False
     finally:
@@ -85,7 +68,7 @@ def upgrade_database():
 
 def add_sample_objectives():
     """Add sample objectives to existing goals."""
-    conn = sqlite3.connect('data/students.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     
     try:
         # Get existing goals
@@ -146,7 +129,7 @@ def add_sample_objectives():
 
 def verify_upgrade():
     """Verify the upgrade was successful."""
-    conn = sqlite3.connect('data/students.db')
+    conn = sqlite3.connect(DATABASE_PATH)
     
     try:
         # Check objectives table
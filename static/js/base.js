@@ -0,0 +1,41 @@
+// Simple JavaScript utilities
+function confirmDelete(message) {
+  return confirm(message || "Are you sure you want to delete this?");
+}
+
+function submitForm(formId) {
+  document.getElementById(formId).submit();
+}
+
+// Time formatting utility
+function formatTimeToAMPM(timeString) {
+  if (!timeString) return '';
+  const [hours, minutes] = timeString.split(':');
+  const hour = parseInt(hours, 10);
+  const ampm = hour >= 12 ? 'PM' : 'AM';
+  const displayHour = hour === 0 ? 12 : hour > 12 ? hour - 12 : hour;
+  return displayHour + ':' + minutes + ' ' + ampm;
+}
+
+// Format all time elements on page load
+function formatTimesOnPage() {
+  document.querySelectorAll('.time-format').forEach(function(element) {
+    const timeValue = element.textContent.trim();
+    if (timeValue.match(/^\d{2}:\d{2}(:\d{2})?$/)) {
+      element.textContent = formatTimeToAMPM(timeValue);
+    }
+  });
+}
+
+// Auto-focus first input on forms
+document.addEventListener("DOMContentLoaded", function () {
+  const firstInput = document.querySelector(
+    'input:not([type="hidden"]), textarea, select'
+  );
+  if (firstInput) {
+    firstInput.focus();
+  }
+
+  // Format times on page load
+  formatTimesOnPage();
+});
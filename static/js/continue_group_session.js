@@ -0,0 +1,33 @@
+// Auto-focus the student select when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    const selectElement = document.getElementById('student_id');
+    if (selectElement && selectElement.options.length > 1) {
+        selectElement.focus();
+    }
+});
+
+// Track if we're submitting a form to avoid unnecessary warnings
+let isSubmittingForm = false;
+
+// Set flag when forms are submitted
+document.addEventListener('DOMContentLoaded', function() {
+    const forms = document.querySelectorAll('form');
+    forms.forEach(form => {
+        form.addEventListener('submit', function() {
+            isSubmittingForm = true;
+        });
+    });
+});
+
+// Confirm before leaving if there are available students (but not during form submission)
+window.addEventListener('beforeunload', function(e) {
+    if (isSubmittingForm) {
+        return; // Don't show warning during form submission
+    }
+
+    if (availableStudents > 0 && existingStudents > 0) {
+        const message = 'You still have students available to add to this group session. Are you sure you want to leave?';
+        e.returnValue = message;
+        return message;
+    }
+});
@@ -0,0 +1,90 @@
+function changeDate(newDate) {
+    window.location.href = `/planner?date=${newDate}`;
+}
+
+function navigateDay(offset) {
+    const currentDate = new Date(selectedDate);
+    currentDate.setDate(currentDate.getDate() + offset);
+    const newDate = currentDate.toISOString().split('T')[0];
+    changeDate(newDate);
+}
+
+function navigateToToday() {
+    const today = new Date().toISOString().split('T')[0];
+    changeDate(today);
+}
+
+function addSessionSlot() {
+    const template = document.getElementById('sessionSlotTemplate');
+    const sessionSlots = document.getElementById('sessionSlots');
+    const clone = template.content.cloneNode(true);
+    sessionSlots.appendChild(clone);
+}
+
+function removeSessionSlot(button) {
+    const sessionSlot = button.closest('.session-slot');
+    sessionSlot.remove();
+}
+
+function saveAllSessions() {
+    const slots = document.querySelectorAll('.session-slot');
+    const sessionsData = [];
+
+    for (let slot of slots) {
+        const startTime = slot.querySelector('.start-time').value;
+        const endTime = slot.querySelector('.end-time').value;
+        const location = slot.querySelector('.location').value;
+        const notes = slot.querySelector('.session-notes').value;
+
+        const selectedStudents = [];
+        const checkboxes = slot.querySelectorAll('.student-selection input[type="checkbox"]:checked');
+        checkboxes.forEach(cb => selectedStudents.push(parseInt(cb.value)));
+
+        if (startTime && selectedStudents.length > 0) {
+            sessionsData.push({
+                date: selectedDate,
+                start_time: startTime,
+                end_time: endTime || null,
+                location: location,
+                notes: notes,
+                student_ids: selectedStudents
+            });
+        }
+    }
+
+    if (sessionsData.length === 0) {
+        alert('Please add at least one session with a start time and selected students.');
+        return;
+    }
+
+    // Send to server
+    fetch('/planner', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ sessions: sessionsData })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            let message = `Successfully created ${data.sessions_created} sessions!`;
+            if (data.sessions_skipped) {
+                message += ` Skipped ${data.sessions_skipped} already scheduled.`;
+            }
+            alert(message);
+            window.location.reload();
+        } else {
+            alert('Error creating sessions. Please try again.');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error creating sessions. Please try again.');
+    });
+}
+
+// Add first session slot by default
+document.addEventListener('DOMContentLoaded', function() {
+    addSessionSlot();
+});
@@ -0,0 +1,89 @@
+let isCompactView = false;
+
+function toggleView() {
+    isCompactView = !isCompactView;
+    const container = document.getElementById('student-data-container');
+    const button = document.querySelector('button[onclick="toggleView()"]');
+
+    if (isCompactView) {
+        container.classList.add('compact-view');
+        button.textContent = 'Expand View';
+    } else {
+        container.classList.remove('compact-view');
+        button.textContent = 'Toggle Compact View';
+    }
+}
+
+let showFullBreakdown = false;
+
+function togglePercentageView() {
+    showFullBreakdown = !showFullBreakdown;
+    const upToViews = document.querySelectorAll('.up-to-view');
+    const fullViews = document.querySelectorAll('.full-breakdown-view');
+    const button = document.getElementById('percentage-toggle');
+
+    if (showFullBreakdown) {
+        upToViews.forEach(view => view.style.display = 'none');
+        fullViews.forEach(view => view.style.display = 'flex');
+        button.textContent = 'Show Up-To Percentages';
+    } else {
+        upToViews.forEach(view => view.style.display = 'flex');
+        fullViews.forEach(view => view.style.display = 'none');
+        button.textContent = 'Show All Breakdown';
+    }
+}
+
+// Live calculation updates
+function updateLiveStats() {
+    const independent = parseInt(document.getElementById('independent')?.value) || 0;
+    const minimal = parseInt(document.getElementById('minimal_support')?.value) || 0;
+    const moderate = parseInt(document.getElementById('moderate_support')?.value) || 0;
+    const maximal = parseInt(document.getElementById('maximal_support')?.value) || 0;
+    const incorrect = parseInt(document.getElementById('incorrect')?.value) || 0;
+
+    const total = independent + minimal + moderate + maximal + incorrect;
+    const successful = independent + minimal + moderate + maximal;
+
+    const liveStats = document.getElementById('live-stats');
+    if (total > 0) {
+        const accuracy = Math.round((successful / total) * 100);
+        const independence = Math.round((independent / total) * 100);
+        liveStats.innerHTML = `<strong>${total} trials • ${accuracy}% accuracy • ${independence}% independent</strong>`;
+    } else {
+        liveStats.innerHTML = '';
+    }
+}
+
+// Attach event listeners if form exists
+if (document.getElementById('trialForm')) {
+    ['independent', 'minimal_support', 'moderate_support', 'maximal_support', 'incorrect'].forEach(id => {
+        const element = document.getElementById(id);
+        if (element) {
+            element.addEventListener('input', updateLiveStats);
+        }
+    });
+
+    // Form submission
+    document.getElementById('trialForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        const formData = new FormData(this);
+
+        fetch('/trials/new', {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            // Reset form
+            this.reset();
+            updateLiveStats();
+
+            // Reload the page to show new trial data
+            location.reload();
+        })
+        .catch(error => {
+            alert('Error saving trial data: ' + error);
+        });
+    });
+}
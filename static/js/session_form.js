@@ -0,0 +1,17 @@
+// Set today's date as default
+document.getElementById('session_date').value = new Date().toISOString().split('T')[0];
+
+// Auto-calculate end time when start time changes
+document.getElementById('start_time').addEventListener('change', function() {
+    const startTime = this.value;
+    if (startTime) {
+        const [hours, minutes] = startTime.split(':');
+        const endTime = new Date();
+        endTime.setHours(parseInt(hours), parseInt(minutes) + 30); // Default 30-minute session
+
+        const endHours = endTime.getHours().toString().padStart(2, '0');
+        const endMinutes = endTime.getMinutes().toString().padStart(2, '0');
+
+        document.getElementById('end_time').value = `${endHours}:${endMinutes}`;
+    }
+});
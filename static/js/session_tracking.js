@@ -0,0 +1,1399 @@
+class SessionTracker {
+    constructor() {
+        this.students = new Map(); // student_id -> student data
+        this.goals = new Map(); // goal_id -> goal data  
+        this.objectives = new Map(); // objective_id -> objective data
+        this.trialData = new Map(); // objective_id -> trial counts
+        this.compactView = false; // toggle for compact/expanded view
+        this.activeStudentId = null; // currently active student in compact view
+        this.linkedSessionId = null; // optional existing session to link trials to
+        this.allSessions = []; // all available sessions for filtering
+        this.studentGoals = new Map(); // student_id -> goals from /api/tracking/bootstrap
+        this.goalObjectives = new Map(); // goal_id -> objectives from /api/tracking/bootstrap
+
+        this.initializeEventListeners();
+        this.setCurrentDateTime();
+        this.setupKeyboardShortcuts();
+        this.loadAllSessions();
+    }
+
+    initializeEventListeners() {
+        // Add student to session
+        document.getElementById('add-student-btn').addEventListener('click', () => {
+            this.addStudentToSession();
+        });
+
+        // Save session data
+        document.getElementById('save-session-btn').addEventListener('click', () => {
+            this.saveSessionData();
+        });
+
+        // End session and review
+        document.getElementById('end-session-btn').addEventListener('click', () => {
+            this.endSessionAndReview();
+        });
+
+        // Clear all data
+        document.getElementById('clear-session-btn').addEventListener('click', () => {
+            this.clearAllData();
+        });
+
+        // Export data
+        document.getElementById('export-data-btn').addEventListener('click', () => {
+            this.exportSessionData();
+        });
+
+        // Link session selection
+        document.getElementById('link-session-select').addEventListener('change', (e) => {
+            this.linkedSessionId = e.target.value ? parseInt(e.target.value) : null;
+            if (this.linkedSessionId) {
+                this.prefillSessionInfo(this.linkedSessionId);
+            } else {
+                this.clearSessionInfo();
+            }
+        });
+
+        // Student selection change - filter link dropdown
+        document.getElementById('student-select').addEventListener('change', (e) => {
+            this.filterLinkSessionDropdown(e.target.value);
+        });
+
+        // Auto-calculate end time when start time changes
+        document.getElementById('start-time').addEventListener('change', (e) => {
+            if (e.target.value && !document.getElementById('end-time').value) {
+                const [hours, minutes] = e.target.value.split(':');
+                const endTime = new Date();
+                endTime.setHours(parseInt(hours), parseInt(minutes) + 30); // Default 30-minute session
+
+                const endHours = endTime.getHours().toString().padStart(2, '0');
+                const endMinutes = endTime.getMinutes().toString().padStart(2, '0');
+
+                document.getElementById('end-time').value = `${endHours}:${endMinutes}`;
+            }
+        });
+    }
+
+    filterLinkSessionDropdown(selectedStudentId) {
+        const linkSelect = document.getElementById('link-session-select');
+
+        // Reset dropdown
+        linkSelect.innerHTML = '<option value="">Create new session...</option>';
+
+        if (!selectedStudentId) {
+            return;
+        }
+
+        // Filter sessions to show only those for the selected student and not completed
+        const filteredSessions = this.allSessions.filter(session => {
+            return session.student_id == selectedStudentId && session.status !== 'Completed';
+        });
+
+        filteredSessions.forEach(session => {
+            const option = document.createElement('option');
+            option.value = session.id;
+            const timeStr = session.start_time && session.end_time ? 
+                ` (${session.start_time_12h} - ${session.end_time_12h})` : '';
+            option.textContent = `${session.session_date}${timeStr} - ${session.session_type}`;
+            linkSelect.appendChild(option);
+        });
+
+        if (filteredSessions.length === 0) {
+            const option = document.createElement('option');
+            option.value = '';
+            option.textContent = 'No available sessions for this student';
+            option.disabled = true;
+            linkSelect.appendChild(option);
+        }
+    }
+
+    async loadAllSessions() {
+        try {
+            const response = await fetch('/api/sessions/all-for-tracking');
+            if (response.ok) {
+                this.allSessions = (await response.json()).sessions;
+            } else {
+                console.error('Failed to load sessions for filtering');
+                // Fallback to the sessions passed from the template
+                this.allSessions = recentSessions;
+            }
+        } catch (error) {
+            console.error('Error loading sessions:', error);
+            // Fallback to the sessions passed from the template
+            this.allSessions = recentSessions;
+        }
+    }
+
+    setCurrentDateTime() {
+        const now = new Date();
+        document.getElementById('session-date').value = now.toISOString().split('T')[0];
+        document.getElementById('start-time').value = now.toTimeString().split(' ')[0].substring(0, 5);
+    }
+
+    async prefillSessionInfo(sessionId) {
+        try {
+            // Fetch full session details from API
+            const response = await fetch(`/api/sessions/${sessionId}/info`);
+            if (!response.ok) {
+                console.error('Failed to fetch session info');
+                return;
+            }
+
+            const sessionInfo = await response.json();
+
+            // Prefill all the session fields
+            document.getElementById('session-date').value = sessionInfo.session_date || '';
+            document.getElementById('start-time').value = sessionInfo.start_time || '';
+            document.getElementById('end-time').value = sessionInfo.end_time || '';
+            document.getElementById('session-type').value = sessionInfo.session_type || 'Individual';
+            document.getElementById('location').value = sessionInfo.location || '';
+            document.getElementById('session-notes').value = sessionInfo.notes || '';
+
+            // Hide quick templates when linking to existing session
+            document.getElementById('unlinked-templates').style.display = 'none';
+
+        } catch (error) {
+            console.error('Error prefilling session info:', error);
+        }
+    }
+
+    clearSessionInfo() {
+        // Reset to default values when no session is linked
+        this.setCurrentDateTime();
+
+        // Apply 30 min Individual as default for unlinked quick entry
+        this.applyTemplate('individual30');
+
+        // Show quick templates for unlinked sessions
+        document.getElementById('unlinked-templates').style.display = 'block';
+    }
+
+    async addStudentToSession() {
+        const studentSelect = document.getElementById('student-select');
+        const studentId = parseInt(studentSelect.value);
+
+        if (!studentId || this.students.has(studentId)) {
+            if (this.students.has(studentId)) {
+                alert('Student is already in the session!');
+            }
+            return;
+        }
+
+        const studentName = studentSelect.options[studentSelect.selectedIndex].text;
+        const studentData = { id: studentId, name: studentName };
+
+        this.students.set(studentId, studentData);
+        await this.renderStudentCard(studentData);
+
+        // Show session controls if this is the first student
+        if (this.students.size === 1) {
+            document.getElementById('session-controls').style.display = 'block';
+            // Apply default settings for unlinked sessions
+            if (!this.linkedSessionId) {
+                this.clearSessionInfo();
+            }
+        }
+
+        // Update tabs
+        this.updateStudentTabs();
+
+        // Reset select
+        studentSelect.value = '';
+    }
+
+    loadBootstrap(payload) {
+        // Cache goals and objectives so student cards render without further requests
+        if (!payload) return;
+        payload.students.forEach(student => {
+            this.studentGoals.set(student.id, student.goals);
+            student.goals.forEach(goal => {
+                this.goalObjectives.set(goal.id, goal.objectives);
+            });
+        });
+    }
+
+    async fetchBootstrap(studentIds) {
+        const missing = studentIds.filter(id => !this.studentGoals.has(id));
+        if (missing.length === 0) return;
+        try {
+            const response = await fetch(`/api/tracking/bootstrap?student_ids=${missing.join(',')}`);
+            if (response.ok) {
+                this.loadBootstrap(await response.json());
+            }
+        } catch (error) {
+            console.error('Error loading tracking data:', error);
+        }
+    }
+
+    async addPreloadedStudent(studentId, studentName, sessionId) {
+        const studentData = { 
+            id: studentId, 
+            name: studentName,
+            sessionId: sessionId 
+        };
+
+        this.students.set(studentId, studentData);
+        await this.renderStudentCard(studentData);
+
+        // Show session controls if this is the first student
+        if (this.students.size === 1) {
+            document.getElementById('session-controls').style.display = 'block';
+        }
+
+        // Update tabs
+        this.updateStudentTabs();
+    }
+
+    updateStudentTabs() {
+        const tabsContainer = document.querySelector('.tabs-container');
+        const studentTabs = document.getElementById('student-tabs');
+
+        if (this.students.size === 0) {
+            studentTabs.style.display = 'none';
+            return;
+        }
+
+        // Show tabs if we have students
+        studentTabs.style.display = 'block';
+
+        // Clear existing tabs
+        tabsContainer.innerHTML = '';
+
+        // Create tabs for each student
+        for (const [studentId, studentData] of this.students) {
+            const tab = document.createElement('div');
+            tab.className = `student-tab ${studentId === this.activeStudentId ? 'active' : ''}`;
+
+            // Calculate total trials for this student
+            const totalTrials = this.getStudentTotalTrials(studentId);
+
+            // Create tab content with trial count
+            tab.innerHTML = `
+                ${studentData.name}
+                ${totalTrials > 0 ? `<span class="trial-count">${totalTrials}</span>` : ''}
+            `;
+
+            tab.onclick = (event) => this.switchToStudent(studentId, event.currentTarget);
+            tabsContainer.appendChild(tab);
+        }
+
+        // If no active student is set, activate the first one in compact view
+        if (this.compactView && !this.activeStudentId && this.students.size > 0) {
+            const firstStudentId = this.students.keys().next().value;
+            this.switchToStudent(firstStudentId);
+        }
+    }
+
+    getStudentTotalTrials(studentId) {
+        let total = 0;
+        document.querySelectorAll(`[data-student-id="${studentId}"] .objective-tracking`).forEach(objContainer => {
+            const objectiveId = parseInt(objContainer.dataset.objectiveId);
+            const trials = this.trialData.get(objectiveId);
+            if (trials) {
+                total += Object.values(trials).reduce((sum, count) => sum + count, 0);
+            }
+        });
+        return total;
+    }
+
+    switchToStudent(studentId, clickedTab = null) {
+        // Update active student
+        this.activeStudentId = studentId;
+
+        // Update tab appearance
+        document.querySelectorAll('.student-tab').forEach(tab => {
+            tab.classList.remove('active');
+        });
+
+        if (clickedTab) {
+            clickedTab.classList.add('active');
+        } else {
+            // Find the tab for this student and activate it
+            document.querySelectorAll('.student-tab').forEach(tab => {
+                if (tab.textContent === this.students.get(studentId)?.name) {
+                    tab.classList.add('active');
+                }
+            });
+        }
+
+        // In compact view, show only the active student
+        if (this.compactView) {
+            document.querySelectorAll('.student-card').forEach(card => {
+                card.classList.remove('active');
+                if (parseInt(card.dataset.studentId) === studentId) {
+                    card.classList.add('active');
+                }
+            });
+        }
+    }
+
+    toggleStudentView() {
+        this.compactView = !this.compactView;
+        const container = document.getElementById('session-students-container');
+        const toggleBtn = document.querySelector('.tabs-header button');
+
+        if (this.compactView) {
+            container.classList.add('compact-view');
+            toggleBtn.textContent = 'Show All Students';
+
+            // Show compact indicator
+            if (!document.querySelector('.compact-indicator')) {
+                const indicator = document.createElement('div');
+                indicator.className = 'compact-indicator';
+                indicator.textContent = 'Compact View';
+                document.body.appendChild(indicator);
+            }
+
+            // Activate first student if none selected
+            if (!this.activeStudentId && this.students.size > 0) {
+                const firstStudentId = this.students.keys().next().value;
+                this.switchToStudent(firstStudentId);
+            }
+        } else {
+            container.classList.remove('compact-view');
+            toggleBtn.textContent = 'Toggle Compact View';
+
+            // Remove compact indicator
+            const indicator = document.querySelector('.compact-indicator');
+            if (indicator) {
+                indicator.remove();
+            }
+
+            // Show all students
+            document.querySelectorAll('.student-card').forEach(card => {
+                card.classList.remove('active');
+            });
+        }
+    }
+
+    async renderStudentCard(studentData) {
+        const template = document.getElementById('student-card-template');
+        const clone = template.content.cloneNode(true);
+
+        const card = clone.querySelector('.student-card');
+        card.dataset.studentId = studentData.id;
+
+        clone.querySelector('.student-name').textContent = studentData.name;
+
+        // Load goals for this student
+        await this.loadStudentGoals(studentData.id, clone);
+
+        // Add event listeners
+        this.setupStudentCardListeners(clone, studentData.id);
+
+        document.getElementById('session-students-container').appendChild(clone);
+    }
+
+    async loadStudentGoals(studentId, container) {
+        try {
+            await this.fetchBootstrap([studentId]);
+            let goals = this.studentGoals.get(studentId);
+            if (!goals) {
+                const response = await fetch(`/api/students/${studentId}/goals`);
+                goals = await response.json();
+            }
+
+            const goalSelect = container.querySelector('.goal-select');
+            goalSelect.innerHTML = '<option value="">Choose a goal...</option>';
+
+            goals.forEach(goal => {
+                const option = document.createElement('option');
+                option.value = goal.id;
+                option.textContent = goal.description;
+                goalSelect.appendChild(option);
+
+                // Store goal data
+                this.goals.set(goal.id, goal);
+            });
+        } catch (error) {
+            console.error('Error loading goals:', error);
+        }
+    }
+
+    setupStudentCardListeners(container, studentId) {
+        // Remove student button
+        container.querySelector('.remove-student-btn').addEventListener('click', () => {
+            this.removeStudent(studentId);
+        });
+
+        // Add goal button
+        container.querySelector('.add-goal-btn').addEventListener('click', () => {
+            this.addGoalToStudent(studentId);
+        });
+
+        // Status selector change
+        container.querySelector('.student-status').addEventListener('change', (e) => {
+            const linkedSessionGroup = container.querySelector('.linked-session-group');
+            if (e.target.value === 'Completed Makeup Session') {
+                linkedSessionGroup.style.display = 'block';
+                this.loadMissedSessions(studentId, container);
+            } else {
+                linkedSessionGroup.style.display = 'none';
+            }
+        });
+    }
+
+    async loadMissedSessions(studentId, container) {
+        try {
+            // This would need a backend endpoint to fetch missed sessions for this student
+            // For now, we'll use a placeholder
+            const select = container.querySelector('.linked-missed-session');
+            select.innerHTML = '<option value="">Select missed session...</option>';
+            // TODO: Implement API endpoint to get missed sessions for student
+        } catch (error) {
+            console.error('Error loading missed sessions:', error);
+        }
+    }
+
+    removeStudent(studentId) {
+        if (confirm('Are you sure you want to remove this student from the session? All trial data will be lost.')) {
+            this.students.delete(studentId);
+            document.querySelector(`[data-student-id="${studentId}"]`).remove();
+
+            // Update active student if we removed the active one
+            if (this.activeStudentId === studentId) {
+                this.activeStudentId = this.students.size > 0 ? this.students.keys().next().value : null;
+            }
+
+            // Update tabs
+            this.updateStudentTabs();
+
+            // Hide session controls if no students remain
+            if (this.students.size === 0) {
+                document.getElementById('session-controls').style.display = 'none';
+                // Remove compact indicator if it exists
+                const indicator = document.querySelector('.compact-indicator');
+                if (indicator) {
+                    indicator.remove();
+                }
+            }
+        }
+    }
+
+    async addGoalToStudent(studentId) {
+        const studentCard = document.querySelector(`[data-student-id="${studentId}"]`);
+        const goalSelect = studentCard.querySelector('.goal-select');
+        const goalId = parseInt(goalSelect.value);
+
+        if (!goalId) {
+            alert('Please select a goal first!');
+            return;
+        }
+
+        // Check if this goal is already selected for this student
+        const existingGoal = studentCard.querySelector(`[data-goal-id="${goalId}"]`);
+        if (existingGoal) {
+            alert('This goal is already selected for this student!');
+            goalSelect.value = '';
+            return;
+        }
+
+        const goalData = this.goals.get(goalId);
+        await this.renderGoalTracking(studentCard, goalData);
+
+        // Disable the selected option in the dropdown
+        const selectedOption = goalSelect.querySelector(`option[value="${goalId}"]`);
+        if (selectedOption) {
+            selectedOption.disabled = true;
+            selectedOption.textContent += ' (Already Selected)';
+        }
+
+        // Reset select
+        goalSelect.value = '';
+    }
+
+    async renderGoalTracking(studentCard, goalData) {
+        const template = document.getElementById('goal-tracking-template');
+        const clone = template.content.cloneNode(true);
+
+        const goalContainer = clone.querySelector('.goal-tracking');
+        goalContainer.dataset.goalId = goalData.id;
+
+        clone.querySelector('.goal-description').textContent = goalData.description;
+
+        // Load objectives for this goal
+        await this.loadGoalObjectives(goalData.id, clone);
+
+        // Add event listeners
+        this.setupGoalTrackingListeners(clone, goalData.id);
+
+        studentCard.querySelector('.goals-container').appendChild(clone);
+    }
+
+    async loadGoalObjectives(goalId, container) {
+        try {
+            let objectives = this.goalObjectives.get(goalId);
+            if (!objectives) {
+                const response = await fetch(`/api/goals/${goalId}/objectives`);
+                objectives = await response.json();
+            }
+
+            const objectiveSelect = container.querySelector('.objective-select');
+            objectiveSelect.innerHTML = '<option value="">Choose an objective...</option>';
+
+            objectives.forEach(objective => {
+                const option = document.createElement('option');
+                option.value = objective.id;
+                option.textContent = objective.description;
+                objectiveSelect.appendChild(option);
+
+                // Store objective data
+                this.objectives.set(objective.id, objective);
+            });
+        } catch (error) {
+            console.error('Error loading objectives:', error);
+        }
+    }
+
+    setupGoalTrackingListeners(container, goalId) {
+        // Remove goal button
+        container.querySelector('.remove-goal-btn').addEventListener('click', () => {
+            this.removeGoal(goalId);
+        });
+
+        // Add objective button
+        container.querySelector('.add-objective-btn').addEventListener('click', () => {
+            this.addObjectiveToGoal(goalId);
+        });
+    }
+
+    removeGoal(goalId) {
+        if (confirm('Are you sure you want to remove this goal? All trial data will be lost.')) {
+            const goalElement = document.querySelector(`[data-goal-id="${goalId}"]`);
+            const studentCard = goalElement.closest('.student-card');
+            const goalSelect = studentCard.querySelector('.goal-select');
+
+            // Re-enable the option in the dropdown
+            const option = goalSelect.querySelector(`option[value="${goalId}"]`);
+            if (option) {
+                option.disabled = false;
+                option.textContent = option.textContent.replace(' (Already Selected)', '');
+            }
+
+            goalElement.remove();
+        }
+    }
+
+    addObjectiveToGoal(goalId) {
+        const goalContainer = document.querySelector(`[data-goal-id="${goalId}"]`);
+        const objectiveSelect = goalContainer.querySelector('.objective-select');
+        const objectiveId = parseInt(objectiveSelect.value);
+
+        if (!objectiveId) {
+            alert('Please select an objective first!');
+            return;
+        }
+
+        const objectiveData = this.objectives.get(objectiveId);
+        this.renderObjectiveTracking(goalContainer, objectiveData);
+
+        // Reset select
+        objectiveSelect.value = '';
+    }
+
+    renderObjectiveTracking(goalContainer, objectiveData) {
+        const template = document.getElementById('objective-tracking-template');
+        const clone = template.content.cloneNode(true);
+
+        const objectiveContainer = clone.querySelector('.objective-tracking');
+        objectiveContainer.dataset.objectiveId = objectiveData.id;
+
+        clone.querySelector('.objective-description').textContent = objectiveData.description;
+
+        // Initialize trial data
+        this.trialData.set(objectiveData.id, {
+            independent: 0,
+            minimal_support: 0,
+            moderate_support: 0,
+            maximal_support: 0,
+            incorrect: 0
+        });
+
+        // Add event listeners
+        this.setupObjectiveTrackingListeners(clone, objectiveData.id);
+
+        goalContainer.querySelector('.objectives-container').appendChild(clone);
+    }
+
+    setupObjectiveTrackingListeners(container, objectiveId) {
+        // Trial buttons
+        container.querySelectorAll('.trial-btn').forEach(btn => {
+            btn.addEventListener('click', () => {
+                const type = btn.dataset.type;
+                this.recordTrial(objectiveId, type);
+            });
+        });
+
+        // Remove objective button
+        container.querySelector('.remove-objective-btn').addEventListener('click', () => {
+            this.removeObjective(objectiveId);
+        });
+
+        // Reset trials button
+        container.querySelector('.reset-trials-btn').addEventListener('click', () => {
+            this.resetObjectiveTrials(objectiveId);
+        });
+    }
+
+    recordTrial(objectiveId, type) {
+        const trials = this.trialData.get(objectiveId);
+        trials[type]++;
+        this.updateObjectiveDisplay(objectiveId);
+    }
+
+    updateObjectiveDisplay(objectiveId) {
+        const container = document.querySelector(`[data-objective-id="${objectiveId}"]`);
+        const trials = this.trialData.get(objectiveId);
+
+        // Update button counts
+        Object.keys(trials).forEach(type => {
+            const btn = container.querySelector(`[data-type="${type}"]`);
+            btn.querySelector('.btn-count').textContent = trials[type];
+        });
+
+        // Update summary
+        const total = Object.values(trials).reduce((sum, count) => sum + count, 0);
+        const correct = trials.independent + trials.minimal_support + trials.moderate_support + trials.maximal_support;
+        const supportCount = trials.minimal_support + trials.moderate_support + trials.maximal_support;
+        const accuracy = total > 0 ? Math.round((correct / total) * 100) : 0;
+
+        container.querySelector('.total-trials').textContent = `Total Trials: ${total}`;
+        container.querySelector('.accuracy').textContent = `Accuracy: ${accuracy}%`;
+
+        // Update detailed breakdown
+        const independentCount = container.querySelector('.independent-count');
+        const supportCountEl = container.querySelector('.support-count');
+        const incorrectCount = container.querySelector('.incorrect-count');
+
+        if (independentCount) independentCount.textContent = trials.independent;
+        if (supportCountEl) supportCountEl.textContent = supportCount;
+        if (incorrectCount) incorrectCount.textContent = trials.incorrect;
+
+        // Update student progress summary
+        this.updateStudentProgressSummary(container);
+
+        // Update student tabs with trial counts
+        this.updateStudentTabs();
+    }
+
+    updateStudentProgressSummary(objectiveContainer) {
+        const studentCard = objectiveContainer.closest('.student-card');
+        const progressSummary = studentCard.querySelector('.student-progress-summary');
+
+        // Show progress summary
+        progressSummary.style.display = 'block';
+
+        // Count goals and objectives
+        const goalCount = studentCard.querySelectorAll('.goal-tracking').length;
+        const objectiveCount = studentCard.querySelectorAll('.objective-tracking').length;
+
+        // Calculate total trials for this student
+        let totalTrials = 0;
+        studentCard.querySelectorAll('.objective-tracking').forEach(objContainer => {
+            const objectiveId = parseInt(objContainer.dataset.objectiveId);
+            const trials = this.trialData.get(objectiveId);
+            if (trials) {
+                totalTrials += Object.values(trials).reduce((sum, count) => sum + count, 0);
+            }
+        });
+
+        // Update summary display
+        progressSummary.querySelector('.goal-count').textContent = goalCount;
+        progressSummary.querySelector('.objective-count').textContent = objectiveCount;
+        progressSummary.querySelector('.total-trial-count').textContent = totalTrials;
+    }
+
+    removeObjective(objectiveId) {
+        if (confirm('Are you sure you want to remove this objective? All trial data will be lost.')) {
+            this.trialData.delete(objectiveId);
+            document.querySelector(`[data-objective-id="${objectiveId}"]`).remove();
+        }
+    }
+
+    resetObjectiveTrials(objectiveId) {
+        if (confirm('Are you sure you want to reset all trials for this objective?')) {
+            const trials = this.trialData.get(objectiveId);
+            Object.keys(trials).forEach(key => {
+                trials[key] = 0;
+            });
+            this.updateObjectiveDisplay(objectiveId);
+        }
+    }
+
+    async saveSessionData() {
+        if (this.students.size === 0) {
+            alert('Please add at least one student to the session!');
+            return;
+        }
+
+        if (this.trialData.size === 0) {
+            alert('Please record some trial data before saving!');
+            return;
+        }
+
+        const sessionData = {
+            session_date: document.getElementById('session-date').value,
+            start_time: document.getElementById('start-time').value,
+            end_time: document.getElementById('end-time').value,
+            session_type: document.getElementById('session-type').value,
+            location: document.getElementById('location').value,
+            notes: document.getElementById('session-notes').value
+        };
+
+        for (const [studentId, studentData] of this.students) {
+            const trials = [];
+
+            // Get student status and linked session
+            const studentCard = document.querySelector(`[data-student-id="${studentId}"]`);
+            const status = studentCard.querySelector('.student-status').value;
+            const linkedMissedSession = studentCard.querySelector('.linked-missed-session').value;
+
+            // Collect all trial data for this student
+            document.querySelectorAll(`[data-student-id="${studentId}"] .objective-tracking`).forEach(objContainer => {
+                const objectiveId = parseInt(objContainer.dataset.objectiveId);
+                const trialCounts = this.trialData.get(objectiveId);
+                const notes = objContainer.querySelector('.objective-notes').value;
+
+                if (Object.values(trialCounts).some(count => count > 0)) {
+                    const objective = this.objectives.get(objectiveId);
+                    trials.push({
+                        objective_id: objectiveId,
+                        goal_id: objective.goal_id || this.findGoalForObjective(objectiveId),
+                        ...trialCounts,
+                        notes: notes
+                    });
+                }
+            });
+
+            if (trials.length > 0) {
+                let payload;
+                let endpoint;
+
+                if (this.linkedSessionId) {
+                    // Add trials to existing session
+                    payload = {
+                        session_id: this.linkedSessionId,
+                        trials: trials
+                    };
+                    endpoint = '/api/sessions/update-trials';
+                } else {
+                    // Create new session
+                    payload = {
+                        student_id: studentId,
+                        ...sessionData,
+                        status: status,
+                        linked_missed_session: linkedMissedSession || null,
+                        trials: trials
+                    };
+                    endpoint = '/api/sessions/save-trials';
+                }
+
+                try {
+                    const response = await fetch(endpoint, {
+                        method: 'POST',
+                        headers: {
+                            'Content-Type': 'application/json',
+                        },
+                        body: JSON.stringify(payload)
+                    });
+
+                    if (response.ok) {
+                        const result = await response.json();
+                        console.log(`Saved session for ${studentData.name}:`, result);
+                    }
+                } catch (error) {
+                    console.error('Error saving session:', error);
+                    alert('Error saving session data. Please try again.');
+                    return;
+                }
+            }
+        }
+
+        if (this.linkedSessionId) {
+            alert('Trial data added to existing session successfully!');
+        } else {
+            alert('New session(s) created successfully!');
+        }
+        // Don't clear data automatically - let user decide when to end session
+    }
+
+    findGoalForObjective(objectiveId) {
+        // Find which goal container this objective belongs to
+        const objElement = document.querySelector(`[data-objective-id="${objectiveId}"]`);
+        const goalElement = objElement.closest('.goal-tracking');
+        return parseInt(goalElement.dataset.goalId);
+    }
+
+    async endSessionAndReview() {
+        if (this.students.size === 0) {
+            alert('Please add at least one student to the session!');
+            return;
+        }
+
+        if (this.trialData.size === 0) {
+            alert('Please record some trial data before ending the session!');
+            return;
+        }
+
+        // Save the session first
+        await this.saveSessionData();
+
+        // Create and show session summary modal
+        this.showSessionSummary();
+    }
+
+    showSessionSummary() {
+        // Create modal for session summary
+        const modal = document.createElement('div');
+        modal.className = 'session-summary-modal';
+        modal.style.cssText = `
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: rgba(0,0,0,0.5);
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            z-index: 1000;
+        `;
+
+        const modalContent = document.createElement('div');
+        modalContent.style.cssText = `
+            background: white;
+            padding: 30px;
+            border-radius: 8px;
+            max-width: 800px;
+            max-height: 80vh;
+            overflow-y: auto;
+            width: 90%;
+        `;
+
+        let summaryHTML = `
+            <h2 style="margin-top: 0;">Session Summary</h2>
+            <div style="margin-bottom: 20px; padding: 15px; background: #f8f9fa; border-radius: 8px;">
+                <strong>Session Info:</strong><br>
+                Date: ${document.getElementById('session-date').value}<br>
+                Type: ${document.getElementById('session-type').value}<br>
+                Time: ${document.getElementById('start-time').value} - ${document.getElementById('end-time').value}
+            </div>
+        `;
+
+        // Add student summaries
+        for (const [studentId, studentData] of this.students) {
+            const studentCard = document.querySelector(`[data-student-id="${studentId}"]`);
+            const totalTrials = this.getStudentTotalTrials(studentId);
+            const status = studentCard.querySelector('.student-status').value;
+
+            summaryHTML += `
+                <div style="margin-bottom: 20px; padding: 15px; border: 1px solid #ddd; border-radius: 8px;">
+                    <h3 style="margin-top: 0; color: #007bff;">${studentData.name}</h3>
+                    <p><strong>Status:</strong> ${status}</p>
+                    <p><strong>Total Trials:</strong> ${totalTrials}</p>
+
+                    <div style="margin-left: 20px;">
+            `;
+
+            // Add objective summaries with editable counts
+            document.querySelectorAll(`[data-student-id="${studentId}"] .objective-tracking`).forEach(objContainer => {
+                const objectiveId = parseInt(objContainer.dataset.objectiveId);
+                const trials = this.trialData.get(objectiveId);
+                if (trials && Object.values(trials).some(count => count > 0)) {
+                    const objective = this.objectives.get(objectiveId);
+                    const total = Object.values(trials).reduce((sum, count) => sum + count, 0);
+                    const accuracy = total > 0 ? Math.round(((trials.independent + trials.minimal_support + trials.moderate_support + trials.maximal_support) / total) * 100) : 0;
+
+                    summaryHTML += `
+                        <div style="margin-bottom: 15px; padding: 15px; background: #f9f9f9; border-radius: 4px;" data-objective-summary="${objectiveId}">
+                            <strong>${objective.description}</strong><br>
+                            <div style="margin-top: 10px; display: grid; grid-template-columns: repeat(5, 1fr); gap: 10px;">
+                                <div>
+                                    <label style="font-size: 12px; color: #666;">Independent:</label>
+                                    <input type="number" min="0" value="${trials.independent}" data-type="independent" data-objective="${objectiveId}" style="width: 100%; padding: 4px; border: 1px solid #ddd; border-radius: 4px;" onchange="sessionTracker.updateSummaryTrial(${objectiveId}, 'independent', this.value)">
+                                </div>
+                                <div>
+                                    <label style="font-size: 12px; color: #666;">Min Support:</label>
+                                    <input type="number" min="0" value="${trials.minimal_support}" data-type="minimal_support" data-objective="${objectiveId}" style="width: 100%; padding: 4px; border: 1px solid #ddd; border-radius: 4px;" onchange="sessionTracker.updateSummaryTrial(${objectiveId}, 'minimal_support', this.value)">
+                                </div>
+                                <div>
+                                    <label style="font-size: 12px; color: #666;">Mod Support:</label>
+                                    <input type="number" min="0" value="${trials.moderate_support}" data-type="moderate_support" data-objective="${objectiveId}" style="width: 100%; padding: 4px; border: 1px solid #ddd; border-radius: 4px;" onchange="sessionTracker.updateSummaryTrial(${objectiveId}, 'moderate_support', this.value)">
+                                </div>
+                                <div>
+                                    <label style="font-size: 12px; color: #666;">Max Support:</label>
+                                    <input type="number" min="0" value="${trials.maximal_support}" data-type="maximal_support" data-objective="${objectiveId}" style="width: 100%; padding: 4px; border: 1px solid #ddd; border-radius: 4px;" onchange="sessionTracker.updateSummaryTrial(${objectiveId}, 'maximal_support', this.value)">
+                                </div>
+                                <div>
+                                    <label style="font-size: 12px; color: #666;">Incorrect:</label>
+                                    <input type="number" min="0" value="${trials.incorrect}" data-type="incorrect" data-objective="${objectiveId}" style="width: 100%; padding: 4px; border: 1px solid #ddd; border-radius: 4px;" onchange="sessionTracker.updateSummaryTrial(${objectiveId}, 'incorrect', this.value)">
+                                </div>
+                            </div>
+                            <div style="margin-top: 8px; font-size: 12px; color: #666;" id="summary-stats-${objectiveId}">
+                                Total: ${total} | Accuracy: ${accuracy}%
+                            </div>
+                        </div>
+                    `;
+                }
+            });
+
+            summaryHTML += `</div></div>`;
+        }
+
+        summaryHTML += `
+            <div style="text-align: center; margin-top: 30px;">
+                <button onclick="this.parentElement.parentElement.parentElement.remove()" class="btn btn-outline" style="margin-right: 10px;">Close Review</button>
+                <button onclick="sessionTracker.saveFinalSummary(); this.parentElement.parentElement.parentElement.remove();" class="btn btn-success">Save Changes & Finalize</button>
+            </div>
+        `;
+
+        modalContent.innerHTML = summaryHTML;
+        modal.appendChild(modalContent);
+        document.body.appendChild(modal);
+
+        // Close modal when clicking outside
+        modal.addEventListener('click', (e) => {
+            if (e.target === modal) {
+                modal.remove();
+            }
+        });
+    }
+
+    updateSummaryTrial(objectiveId, trialType, newValue) {
+        // Update the trial data with new value
+        const trials = this.trialData.get(objectiveId);
+        if (trials) {
+            trials[trialType] = parseInt(newValue) || 0;
+
+            // Update the displayed stats
+            const total = Object.values(trials).reduce((sum, count) => sum + count, 0);
+            const correct = trials.independent + trials.minimal_support + trials.moderate_support + trials.maximal_support;
+            const accuracy = total > 0 ? Math.round((correct / total) * 100) : 0;
+
+            const statsElement = document.getElementById(`summary-stats-${objectiveId}`);
+            if (statsElement) {
+                statsElement.textContent = `Total: ${total} | Accuracy: ${accuracy}%`;
+            }
+
+            // Also update the main interface display
+            this.updateObjectiveDisplay(objectiveId);
+        }
+    }
+
+    async saveFinalSummary() {
+        // Save any changes made in the summary
+        await this.saveSessionData();
+        this.finalizeAndClear();
+    }
+
+    finalizeAndClear() {
+        // Clear all data for new session
+        this.clearAllData();
+        alert('Session finalized! Ready to start a new session.');
+    }
+
+    clearAllData() {
+        if (confirm('Are you sure you want to clear all session data? This cannot be undone.')) {
+            this.students.clear();
+            this.goals.clear();
+            this.objectives.clear();
+            this.trialData.clear();
+            this.linkedSessionId = null;
+
+            document.getElementById('session-students-container').innerHTML = '';
+            document.getElementById('session-controls').style.display = 'none';
+
+            // Reset form fields
+            document.getElementById('student-select').value = '';
+            document.getElementById('link-session-select').value = '';
+            document.getElementById('session-notes').value = '';
+            document.getElementById('location').value = '';
+            this.setCurrentDateTime();
+
+            // Update tabs
+            this.updateStudentTabs();
+        }
+    }
+
+    applyTemplate(templateType) {
+        const now = new Date();
+        const currentTime = now.toTimeString().split(' ')[0].substring(0, 5);
+
+        switch(templateType) {
+            case 'individual30':
+                document.getElementById('session-type').value = 'Individual';
+                document.getElementById('start-time').value = currentTime;
+                this.setEndTime(30);
+                break;
+
+            case 'group30':
+                document.getElementById('session-type').value = 'Group';
+                document.getElementById('start-time').value = currentTime;
+                this.setEndTime(30);
+                break;
+        }
+    }
+
+    setEndTime(durationMinutes) {
+        const startTimeValue = document.getElementById('start-time').value;
+        if (startTimeValue) {
+            const [hours, minutes] = startTimeValue.split(':');
+            const endTime = new Date();
+            endTime.setHours(parseInt(hours), parseInt(minutes) + durationMinutes);
+
+            const endHours = endTime.getHours().toString().padStart(2, '0');
+            const endMinutes = endTime.getMinutes().toString().padStart(2, '0');
+
+            document.getElementById('end-time').value = `${endHours}:${endMinutes}`;
+        }
+    }
+
+    exportSessionData() {
+        if (this.trialData.size === 0) {
+            alert('No trial data to export!');
+            return;
+        }
+
+        const exportData = {
+            session_info: {
+                date: document.getElementById('session-date').value,
+                start_time: document.getElementById('start-time').value,
+                end_time: document.getElementById('end-time').value,
+                session_type: document.getElementById('session-type').value,
+                location: document.getElementById('location').value,
+                notes: document.getElementById('session-notes').value
+            },
+            students: []
+        };
+
+        // Collect data for each student
+        for (const [studentId, studentData] of this.students) {
+            const studentTrials = [];
+
+            document.querySelectorAll(`[data-student-id="${studentId}"] .objective-tracking`).forEach(objContainer => {
+                const objectiveId = parseInt(objContainer.dataset.objectiveId);
+                const trialCounts = this.trialData.get(objectiveId);
+                const notes = objContainer.querySelector('.objective-notes').value;
+                const objective = this.objectives.get(objectiveId);
+
+                if (Object.values(trialCounts).some(count => count > 0)) {
+                    const total = Object.values(trialCounts).reduce((sum, count) => sum + count, 0);
+                    const correct = trialCounts.independent + trialCounts.minimal_support + trialCounts.moderate_support + trialCounts.maximal_support;
+                    const accuracy = total > 0 ? Math.round((correct / total) * 100) : 0;
+
+                    studentTrials.push({
+                        objective: objective.description,
+                        ...trialCounts,
+                        total_trials: total,
+                        accuracy_percent: accuracy,
+                        notes: notes
+                    });
+                }
+            });
+
+            if (studentTrials.length > 0) {
+                exportData.students.push({
+                    name: studentData.name,
+                    trials: studentTrials
+                });
+            }
+        }
+
+        // Create and download CSV
+        let csvContent = "data:text/csv;charset=utf-8,";
+        csvContent += "Student,Objective,Independent,Minimal Support,Moderate Support,Maximal Support,Incorrect,Total Trials,Accuracy %,Notes\n";
+
+        exportData.students.forEach(student => {
+            student.trials.forEach(trial => {
+                csvContent += `"${student.name}","${trial.objective}",${trial.independent},${trial.minimal_support},${trial.moderate_support},${trial.maximal_support},${trial.incorrect},${trial.total_trials},${trial.accuracy_percent},"${trial.notes}"\n`;
+            });
+        });
+
+        const encodedUri = encodeURI(csvContent);
+        const link = document.createElement("a");
+        link.setAttribute("href", encodedUri);
+        const dateStr = exportData.session_info.date || new Date().toISOString().split('T')[0];
+        link.setAttribute("download", `session_data_${dateStr}.csv`);
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+
+        alert('Session data exported successfully!');
+    }
+
+    setupKeyboardShortcuts() {
+        document.addEventListener('keydown', (e) => {
+            // Only process shortcuts when not typing in input fields
+            if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA' || e.target.tagName === 'SELECT') {
+                return;
+            }
+
+            switch(e.key) {
+                case 's':
+                case 'S':
+                    if (e.ctrlKey || e.metaKey) {
+                        e.preventDefault();
+                        this.saveSessionData();
+                    }
+                    break;
+
+                case 'c':
+                case 'C':
+                    if (e.ctrlKey || e.metaKey) {
+                        e.preventDefault();
+                        this.clearAllData();
+                    }
+                    break;
+
+                case 't':
+                case 'T':
+                    if (this.students.size > 0) {
+                        e.preventDefault();
+                        this.toggleStudentView();
+                    }
+                    break;
+
+                case 'e':
+                case 'E':
+                    if (e.ctrlKey || e.metaKey) {
+                        e.preventDefault();
+                        this.exportSessionData();
+                    }
+                    break;
+
+                case '?':
+                    e.preventDefault();
+                    this.toggleShortcutsHelp();
+                    break;
+            }
+        });
+    }
+
+    toggleShortcutsHelp() {
+        let helpDiv = document.querySelector('.shortcuts-hint');
+
+        if (!helpDiv) {
+            helpDiv = document.createElement('div');
+            helpDiv.className = 'shortcuts-hint';
+            helpDiv.innerHTML = `
+                <strong>Keyboard Shortcuts:</strong><br>
+                Ctrl+S: Save session<br>
+                Ctrl+C: Clear data<br>
+                Ctrl+E: Export data<br>
+                T: Toggle view<br>
+                ?: Show/hide this help
+            `;
+            document.body.appendChild(helpDiv);
+
+            // Auto-hide after 5 seconds
+            setTimeout(() => {
+                if (helpDiv) {
+                    helpDiv.classList.add('hidden');
+                }
+            }, 5000);
+        } else {
+            helpDiv.classList.toggle('hidden');
+        }
+    }
+
+    // Session Completion Modal Methods
+    showCompletionModal() {
+        const modal = document.getElementById('completion-modal');
+
+        // Populate status warnings
+        this.checkSessionStatus();
+
+        // Populate session summary
+        this.generateSessionSummary();
+
+        // Populate editable summary
+        this.generateEditableSummary();
+
+        // Show modal
+        modal.style.display = 'flex';
+    }
+
+    hideCompletionModal() {
+        const modal = document.getElementById('completion-modal');
+        modal.style.display = 'none';
+    }
+
+    checkSessionStatus() {
+        const warnings = [];
+        const warningsContainer = document.getElementById('status-warnings');
+
+        // Check if all students have status set
+        this.students.forEach((student, studentId) => {
+            const statusSelect = document.querySelector(`.student-card[data-student-id="${studentId}"] .student-status`);
+            if (!statusSelect || !statusSelect.value) {
+                warnings.push(`${student.name}: Session status not set`);
+            }
+        });
+
+        // Check if there's any trial data
+        const hasTrials = Array.from(this.trialData.values()).some(data => 
+            data.independent + data.minimal_support + data.moderate_support + data.maximal_support + data.incorrect > 0
+        );
+
+        if (!hasTrials) {
+            warnings.push('No trial data recorded for this session');
+        }
+
+        // Display warnings
+        if (warnings.length > 0) {
+            warningsContainer.innerHTML = warnings.map(warning => 
+                `<div class="warning">⚠️ ${warning}</div>`
+            ).join('');
+        } else {
+            warningsContainer.innerHTML = '<div style="color: #28a745; padding: 10px;">✅ All session requirements completed!</div>';
+        }
+    }
+
+    generateSessionSummary() {
+        const summaryContainer = document.getElementById('completion-summary');
+
+        let totalStudents = this.students.size;
+        let totalGoals = this.goals.size;
+        let totalObjectives = this.objectives.size;
+        let totalTrials = 0;
+
+        this.trialData.forEach(data => {
+            totalTrials += data.independent + data.minimal_support + data.moderate_support + data.maximal_support + data.incorrect;
+        });
+
+        summaryContainer.innerHTML = `
+            <div class="summary-card">
+                <h5 style="margin: 0 0 10px 0; color: #007bff;">${totalStudents}</h5>
+                <div>Students</div>
+            </div>
+            <div class="summary-card">
+                <h5 style="margin: 0 0 10px 0; color: #28a745;">${totalGoals}</h5>
+                <div>Goals Tracked</div>
+            </div>
+            <div class="summary-card">
+                <h5 style="margin: 0 0 10px 0; color: #ffc107;">${totalObjectives}</h5>
+                <div>Objectives</div>
+            </div>
+            <div class="summary-card">
+                <h5 style="margin: 0 0 10px 0; color: #dc3545;">${totalTrials}</h5>
+                <div>Total Trials</div>
+            </div>
+        `;
+    }
+
+    generateEditableSummary() {
+        const editableContainer = document.getElementById('editable-summary');
+        let html = '';
+
+        this.objectives.forEach((objective, objectiveId) => {
+            const trialData = this.trialData.get(objectiveId) || {
+                independent: 0, minimal_support: 0, moderate_support: 0, 
+                maximal_support: 0, incorrect: 0
+            };
+
+            const student = this.students.get(objective.studentId);
+            const goal = this.goals.get(objective.goalId);
+
+            html += `
+                <div class="objective-edit-section" data-objective-id="${objectiveId}" style="margin-bottom: 20px; padding: 15px; border: 1px solid #ddd; border-radius: 6px;">
+                    <h5 style="margin: 0 0 10px 0;">${student?.name} - ${goal?.description}</h5>
+                    <p style="margin: 0 0 15px 0; color: #666; font-size: 0.9rem;">${objective.description}</p>
+
+                    <div class="trial-edit-grid" style="display: grid; grid-template-columns: repeat(5, 1fr); gap: 10px;">
+                        <div class="editable-trial-row">
+                            <label>Independent:</label>
+                            <input type="number" min="0" value="${trialData.independent}" data-type="independent">
+                        </div>
+                        <div class="editable-trial-row">
+                            <label>Min Support:</label>
+                            <input type="number" min="0" value="${trialData.minimal_support}" data-type="minimal_support">
+                        </div>
+                        <div class="editable-trial-row">
+                            <label>Mod Support:</label>
+                            <input type="number" min="0" value="${trialData.moderate_support}" data-type="moderate_support">
+                        </div>
+                        <div class="editable-trial-row">
+                            <label>Max Support:</label>
+                            <input type="number" min="0" value="${trialData.maximal_support}" data-type="maximal_support">
+                        </div>
+                        <div class="editable-trial-row">
+                            <label>Incorrect:</label>
+                            <input type="number" min="0" value="${trialData.incorrect}" data-type="incorrect">
+                        </div>
+                    </div>
+                </div>
+            `;
+        });
+
+        if (html === '') {
+            html = '<p class="text-muted">No objectives tracked in this session.</p>';
+        }
+
+        editableContainer.innerHTML = html;
+
+        // Add event listeners to update trial data when inputs change
+        editableContainer.querySelectorAll('input[type="number"]').forEach(input => {
+            input.addEventListener('change', (e) => {
+                const objectiveId = parseInt(e.target.closest('.objective-edit-section').dataset.objectiveId);
+                const trialType = e.target.dataset.type;
+                const value = parseInt(e.target.value) || 0;
+
+                if (!this.trialData.has(objectiveId)) {
+                    this.trialData.set(objectiveId, {
+                        independent: 0, minimal_support: 0, moderate_support: 0, 
+                        maximal_support: 0, incorrect: 0
+                    });
+                }
+
+                this.trialData.get(objectiveId)[trialType] = value;
+
+                // Update the display in the main tracking interface
+                this.updateObjectiveDisplay(objectiveId);
+            });
+        });
+    }
+
+    async saveAndComplete() {
+        try {
+            await this.saveSessionData(false);
+            alert('Session saved successfully! 🎉');
+            this.hideCompletionModal();
+            // Optionally redirect to sessions list or dashboard
+            window.location.href = '/planner';
+        } catch (error) {
+            alert('Error saving session. Please try again.');
+            console.error('Save error:', error);
+        }
+    }
+
+    async saveAndCreateSOAP() {
+        try {
+            const result = await this.saveSessionData(true);
+            alert('Session saved successfully! Redirecting to SOAP note creation...');
+            this.hideCompletionModal();
+
+            // Redirect to SOAP note creation for the first student's session
+            const firstStudentSession = Array.from(this.students.values())[0];
+            if (firstStudentSession && result.session_ids && result.session_ids.length > 0) {
+                window.location.href = `/soap/${result.session_ids[0]}`;
+            } else {
+                window.location.href = '/planner';
+            }
+        } catch (error) {
+            alert('Error saving session. Please try again.');
+            console.error('Save error:', error);
+        }
+    }
+}
+
+// Initialize the session tracker when page loads
+let sessionTracker;
+document.addEventListener('DOMContentLoaded', () => {
+    sessionTracker = new SessionTracker();
+});
+
+// Global function for toggle button
+function toggleStudentView() {
+    if (sessionTracker) {
+        sessionTracker.toggleStudentView();
+    }
+}
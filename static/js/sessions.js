@@ -0,0 +1,16 @@
+function filterByDate(date) {
+    if (date) {
+        window.location.href = `/sessions?date=${date}`;
+    }
+}
+
+// Set today's date as default in date picker
+document.addEventListener('DOMContentLoaded', function() {
+    const dateFilter = document.getElementById('dateFilter');
+    const urlParams = new URLSearchParams(window.location.search);
+    const dateParam = urlParams.get('date');
+
+    if (dateParam) {
+        dateFilter.value = dateParam;
+    }
+});
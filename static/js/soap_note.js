@@ -0,0 +1,259 @@
+function insertSelectedPercentages(trialIndex) {
+    const trial = trialData[trialIndex];
+    const objectiveTextArea = document.getElementById('objective');
+
+    // Get all selected checkboxes for this trial
+    const selectedCheckboxes = document.querySelectorAll(`input[data-trial="${trialIndex}"]:checked`);
+
+    if (selectedCheckboxes.length === 0) {
+        alert('Please select at least one percentage to insert.');
+        return;
+    }
+
+    // Build the text based on selected percentages
+    let percentageTexts = [];
+    selectedCheckboxes.forEach(checkbox => {
+        const type = checkbox.dataset.type;
+        const percentage = checkbox.dataset.percentage;
+
+        switch(type) {
+            case 'independent_only':
+                percentageTexts.push(`${percentage}% independent`);
+                break;
+            case 'min_support_or_better':
+                percentageTexts.push(`${percentage}% with minimal support or better`);
+                break;
+            case 'mod_support_or_better':
+                percentageTexts.push(`${percentage}% with moderate support or better`);
+                break;
+            case 'max_support_or_better':
+                percentageTexts.push(`${percentage}% with maximal support or better`);
+                break;
+        }
+    });
+
+    // Format the complete text
+    const trialText = `${trial.objective}: Completed ${trial.total_trials} trials. ${percentageTexts.join(', ')}.`;
+
+    // Insert at cursor position
+    const currentValue = objectiveTextArea.value;
+    const cursorPos = objectiveTextArea.selectionStart;
+    const newValue = currentValue.slice(0, cursorPos) + 
+                    (currentValue && cursorPos > 0 ? ' ' : '') + trialText + 
+                    (currentValue.slice(cursorPos) ? ' ' : '') + 
+                    currentValue.slice(cursorPos);
+
+    objectiveTextArea.value = newValue;
+    objectiveTextArea.focus();
+
+    // Position cursor after inserted text
+    const newCursorPos = cursorPos + trialText.length + (currentValue && cursorPos > 0 ? 1 : 0);
+    objectiveTextArea.setSelectionRange(newCursorPos, newCursorPos);
+
+    // Clear selections for this trial
+    selectedCheckboxes.forEach(checkbox => {
+        checkbox.checked = false;
+    });
+}
+
+const templates = {
+    articulation: {
+        subjective: "Student was cooperative and engaged throughout the session. No concerns reported by classroom teacher.",
+        objective: "",
+        assessment: "Student demonstrated improved accuracy with /r/ sound when provided with visual and verbal cues. Progress noted compared to previous session. Student benefits from structured practice and immediate feedback.",
+        plan: "Continue targeting /r/ sound in initial position. Begin introducing /r/ in medial position next session. Provide home practice materials for carryover."
+    },
+    language: {
+        subjective: "Student participated willingly in activities. Teacher reports improved sentence structure in classroom assignments.",
+        objective: "",
+        assessment: "Student shows consistent improvement in expressive language skills. Responds well to visual supports and structured activities. Ready to advance to more complex sentence structures.",
+        plan: "Continue sentence expansion activities. Introduce complex sentences next session. Provide teacher with strategies for classroom carryover."
+    },
+    fluency: {
+        subjective: "Student reports feeling more confident speaking in small groups. Parent notes improved fluency at home during conversations.",
+        objective: "",
+        assessment: "Student demonstrates good understanding and application of fluency strategies. Improvement noted in structured tasks. Generalization to spontaneous speech in progress.",
+        plan: "Continue fluency strategy practice. Focus on generalization to classroom and social situations. Schedule follow-up with teacher regarding classroom strategies."
+    }
+};
+
+function insertTemplate(type) {
+    const template = templates[type];
+    if (template) {
+        document.getElementById('subjective').value = template.subjective;
+        document.getElementById('objective').value = template.objective;
+        document.getElementById('assessment').value = template.assessment;
+        document.getElementById('plan').value = template.plan;
+    }
+}
+
+function generateSOAP() {
+    // This would call your backend to auto-generate based on trial data
+    alert('Auto-generation feature coming soon! Will analyze trial data and create draft SOAP note.');
+}
+
+function previewNote() {
+    const subjective = document.getElementById('subjective').value;
+    const objective = document.getElementById('objective').value;
+    const assessment = document.getElementById('assessment').value;
+    const plan = document.getElementById('plan').value;
+
+    const preview = `
+SUBJECTIVE: ${subjective}
+
+OBJECTIVE: ${objective}
+
+ASSESSMENT: ${assessment}
+
+PLAN: ${plan}
+    `;
+
+    alert(preview);
+}
+
+function previewBeforeSave() {
+    const subjective = document.getElementById('subjective').value;
+    const objective = document.getElementById('objective').value;
+    const assessment = document.getElementById('assessment').value;
+    const plan = document.getElementById('plan').value;
+
+    // Create modal for full SOAP note preview
+    const modal = document.createElement('div');
+    modal.style.cssText = `
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background: rgba(0,0,0,0.5);
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        z-index: 1000;
+    `;
+
+    const modalContent = document.createElement('div');
+    modalContent.style.cssText = `
+        background: white;
+        padding: 30px;
+        border-radius: 8px;
+        max-width: 800px;
+        max-height: 80vh;
+        overflow-y: auto;
+        width: 90%;
+    `;
+
+    modalContent.innerHTML = `
+        <h2 style="margin-top: 0;">SOAP Note Preview</h2>
+        <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0; font-family: monospace; white-space: pre-wrap; line-height: 1.6;">SUBJECTIVE: ${subjective}
+
+OBJECTIVE: ${objective}
+
+ASSESSMENT: ${assessment}
+
+PLAN: ${plan}</div>
+
+        <div style="background: #fff3cd; border: 1px solid #ffeaa7; border-radius: 4px; padding: 15px; margin: 20px 0;">
+            <strong>⚠️ Last chance to edit!</strong><br>
+            You can still edit the SOAP note in this preview. Make any changes below before saving.
+        </div>
+
+        <!-- Editable version for last-minute changes -->
+        <form id="previewEditForm">
+            <input type="hidden" name="session_id" value="${document.querySelector('[name="session_id"]').value}">
+
+            <div class="form-group" style="margin-bottom: 15px;">
+                <label style="display: block; font-weight: bold; margin-bottom: 5px;">Full SOAP Note (Editable):</label>
+                <textarea id="fullSoapText" style="width: 100%; height: 300px; padding: 10px; border: 1px solid #ddd; border-radius: 4px; font-family: monospace;">SUBJECTIVE: ${subjective}
+
+OBJECTIVE: ${objective}
+
+ASSESSMENT: ${assessment}
+
+PLAN: ${plan}</textarea>
+            </div>
+
+            <div style="text-align: center; margin-top: 30px;">
+                <button type="button" onclick="this.closest('.preview-modal').remove()" class="btn btn-outline" style="margin-right: 10px;">Cancel</button>
+                <button type="button" onclick="saveFinalSoapNote()" class="btn btn-success">Confirm & Save SOAP Note</button>
+            </div>
+        </form>
+    `;
+
+    modal.className = 'preview-modal';
+    modal.appendChild(modalContent);
+    document.body.appendChild(modal);
+
+    // Close modal when clicking outside
+    modal.addEventListener('click', (e) => {
+        if (e.target === modal) {
+            modal.remove();
+        }
+    });
+}
+
+function saveFinalSoapNote() {
+    const fullText = document.getElementById('fullSoapText').value;
+    const sessionId = document.querySelector('[name="session_id"]').value;
+
+    // Parse the full text back into SOAP components
+    const sections = fullText.split(/(?=SUBJECTIVE:|OBJECTIVE:|ASSESSMENT:|PLAN:)/i);
+
+    let subjective = '', objective = '', assessment = '', plan = '';
+
+    sections.forEach(section => {
+        const trimmed = section.trim();
+        if (trimmed.startsWith('SUBJECTIVE:')) {
+            subjective = trimmed.replace(/^SUBJECTIVE:\s*/i, '').trim();
+        } else if (trimmed.startsWith('OBJECTIVE:')) {
+            objective = trimmed.replace(/^OBJECTIVE:\s*/i, '').trim();
+        } else if (trimmed.startsWith('ASSESSMENT:')) {
+            assessment = trimmed.replace(/^ASSESSMENT:\s*/i, '').trim();
+        } else if (trimmed.startsWith('PLAN:')) {
+            plan = trimmed.replace(/^PLAN:\s*/i, '').trim();
+        }
+    });
+
+    // Create form data
+    const formData = new FormData();
+    formData.append('session_id', sessionId);
+    formData.append('subjective', subjective);
+    formData.append('objective', objective);
+    formData.append('assessment', assessment);
+    formData.append('plan', plan);
+
+    // Submit the form
+    fetch('/soap/save', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            // Close modal
+            document.querySelector('.preview-modal').remove();
+            alert('SOAP note saved successfully!');
+            // Optionally reload or redirect
+            location.reload();
+        } else {
+            alert('Error saving SOAP note');
+        }
+    })
+    .catch(error => {
+        alert('Error saving SOAP note: ' + error);
+    });
+}
+
+function printSoapNote() {
+    window.print();
+}
+
+// Only attach form listeners if we're in edit mode
+if (document.getElementById('soapForm')) {
+    // Prevent default form submission - we use preview-before-save now
+    document.getElementById('soapForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+        // Redirect to preview instead
+        previewBeforeSave();
+    });
+}
@@ -0,0 +1,49 @@
+function viewObjectiveProgress(objectiveId) {
+  // Simple popup or redirect to view objective progress
+  fetch(`/api/objectives/${objectiveId}/progress`)
+    .then((response) => response.json())
+    .then((data) => {
+      alert(
+        `Current Progress: ${data.current_progress}%\nRecent trials: ${data.recent_trials.length}`
+      );
+      // You could enhance this with a modal or dedicated page
+    })
+    .catch((error) => {
+      console.error("Error:", error);
+      alert("Error loading progress data");
+    });
+}
+
+function deleteGoal(goalId, goalDescription) {
+  const confirmed = confirm(
+    `⚠️ WARNING: This will permanently delete the goal and ALL its objectives!\n\n` +
+      `Goal: "${goalDescription}"\n\n` +
+      `Are you absolutely sure you want to continue?\n\n` +
+      `This action cannot be undone.`
+  );
+
+  if (confirmed) {
+    const form = document.createElement("form");
+    form.method = "POST";
+    form.action = `/goals/${goalId}/delete`; // ✅ This should work
+    document.body.appendChild(form);
+    form.submit();
+  }
+}
+
+function deleteObjective(objectiveId, objectiveDescription) {
+  const confirmed = confirm(
+    `⚠️ Are you sure you want to delete this objective?\n\n` +
+      `Objective: "${objectiveDescription}"\n\n` +
+      `This will also delete all trial data for this objective.\n` +
+      `This action cannot be undone.`
+  );
+
+  if (confirmed) {
+    const form = document.createElement("form");
+    form.method = "POST";
+    form.action = `/objectives/${objectiveId}/delete`; // ✅ This should work
+    document.body.appendChild(form);
+    form.submit();
+  }
+}
@@ -0,0 +1,6 @@
+// Simple JavaScript to show/hide lunch options based on selected school
+document.getElementById('school_id').addEventListener('change', function() {
+    const schoolId = this.value;
+    // You could add AJAX here to get school details and show/hide lunch options
+    // For now, just show lunch options for all schools
+});
@@ -0,0 +1,50 @@
+"""
+Persistent Jinja bytecode cache
+
+Jinja compiles each template to Python code the first time it is
+rendered in a process, and session_tracking.html alone takes a noticeable
+part of the first request after a restart. With a FileSystemBytecodeCache
+the compiled code is stored under data/jinja-cache and reused by later
+processes; Jinja recompiles a template whenever its source changes.
+
+precompile() loads every template once, so the cache can be filled ahead
+of time (e.g. after a deploy) instead of by the first visitor.
+
+Usage:
+    flask --app app admin warm-templates
+    python benchmarks/bench_cold_start.py
+"""
+
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+
+def default_cache_dir(app):
+    return os.path.join(os.path.dirname(app.config['DATABASE_PATH']) or '.', 'jinja-cache')
+
+
+def init_app(app):
+    """Attach the bytecode cache; TEMPLATE_CACHE_DIR = None turns it off."""
+    app.config.setdefault('TEMPLATE_CACHE_DIR', default_cache_dir(app))
+    directory = app.config['TEMPLATE_CACHE_DIR']
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def precompile(app):
+    """Compile every template into the cache. Returns {name: seconds}."""
+    timings = {}
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        start = time.perf_counter()
+        app.jinja_env.get_template(name)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def clear(app):
+    cache = app.jinja_env.bytecode_cache
+    if cache is not None:
+        cache.clear()
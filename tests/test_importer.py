@@ -0,0 +1,40 @@
+import io
+import json
+import sqlite3
+
+import importer
+from migrations import migrate
+
+
+def _db():
+    db = sqlite3.connect(':memory:', isolation_level=None)
+    db.row_factory = sqlite3.Row
+    migrate(db)
+    db.execute("INSERT INTO students (id, first_name, last_name) VALUES (1, 'Alex', 'Johnson')")
+    return db
+
+
+def _ndjson(bad_line):
+    rows = [json.dumps({'session_date': f'2025-01-0{day}', 'student_id': 1, 'independent': day})
+            for day in range(1, 7)]
+    return '\n'.join(rows[:3] + [bad_line] + rows[3:]) + '\n'
+
+
+def _import(db, text):
+    records = importer.iter_records(io.StringIO(text), 'ndjson')
+    return importer.import_trials(db, records, key='trials', batch_size=2)
+
+
+def test_malformed_ndjson_line_is_skipped():
+    for bad_line in ('{not json', '[1, 2]'):
+        db = _db()
+        result = _import(db, _ndjson(bad_line))
+        assert result['finished']
+        assert result['trials_imported'] == 6
+        assert result['skipped'] == 1
+        assert result['errors'][0].startswith('row 4:')
+        assert db.execute('SELECT COUNT(*) FROM trial_logs').fetchone()[0] == 6
+
+        again = _import(db, _ndjson(bad_line))
+        assert again['already_finished']
+        assert db.execute('SELECT COUNT(*) FROM trial_logs').fetchone()[0] == 6
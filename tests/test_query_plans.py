@@ -0,0 +1,7 @@
+from query_plans import check_query_plans
+
+
+def test_model_queries_use_indexes():
+    failures = check_query_plans()
+    assert not failures, '\n'.join(
+        f"{', '.join(scans)}: {' '.join(sql.split())}" for sql, scans in failures)
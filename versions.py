@@ -0,0 +1,67 @@
+"""
+Data versions and conditional GET
+
+Every write to a tracked table bumps that table's counter in
+data_versions (migration 9 installs the triggers). Counters only ever
+go up, so the sum of the counters for the tables an endpoint reads
+changes with every write that could change its response.
+
+JSON endpoints decorated with @conditional(...) send that version as an
+ETag, plus Last-Modified. A request whose If-None-Match still matches
+gets 304 Not Modified after one lookup in data_versions; the view
+itself never runs.
+
+    @api_bp.route('/students')
+    @conditional('students')
+    def api_students(): ...
+"""
+
+from datetime import date, datetime, timezone
+from functools import wraps
+
+from flask import make_response, request
+
+from database import get_db
+from migrations import VERSIONED_TABLES
+
+
+def current(db, tables):
+    """(summed version, time of the latest write) for the tables."""
+    placeholders = ', '.join('?' * len(tables))
+    row = db.execute(f'''
+        SELECT SUM(version), MAX(updated_at) FROM data_versions
+        WHERE table_name IN ({placeholders})
+    ''', tables).fetchone()
+    modified = row[1] and datetime.fromisoformat(row[1]).replace(tzinfo=timezone.utc)
+    return row[0] or 0, modified
+
+
+def conditional(*tables, daily=False):
+    """ETag/Last-Modified for a JSON GET endpoint that reads only ``tables``.
+
+    daily=True is for responses that also depend on today's date (progress
+    windows, today's sessions), so the tag changes at midnight too.
+    """
+    unknown = set(tables) - set(VERSIONED_TABLES)
+    if unknown:
+        raise ValueError(f"Untracked tables: {', '.join(sorted(unknown))}")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, modified = current(get_db(), tables)
+            etag = f'{version}-{date.today().isoformat()}' if daily else str(version)
+            if etag in request.if_none_match:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if modified:
+                response.last_modified = modified
+            # Cacheable, but always revalidated so a write shows up at once
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator